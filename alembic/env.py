@@ -6,11 +6,16 @@ from sqlalchemy import engine_from_config, pool
 from app.core.config import settings
 from app.models import Base
 from app.models.attendance import Attendance  # noqa: F401
+from app.models.attendance_close_out import AttendanceCloseOut  # noqa: F401
+from app.models.attendance_daily_rollup import AttendanceDailyRollup  # noqa: F401
+from app.models.attendance_monthly_summary import AttendanceMonthlySummary  # noqa: F401
 from app.models.branch import Branch  # noqa: F401
 from app.models.business import Business  # noqa: F401
 from app.models.designation import Designation  # noqa: F401
 from app.models.employee_leave_balance import EmployeeLeaveBalance  # noqa: F401
 from app.models.employment_type import EmploymentType  # noqa: F401
+from app.models.export_job import ExportJob  # noqa: F401
+from app.models.leave_ledger_entry import LeaveLedgerEntry  # noqa: F401
 from app.models.leave_request import LeaveRequest  # noqa: F401
 from app.models.leave_type import LeaveType  # noqa: F401
 from app.models.leave_master import LeaveMaster  # noqa: F401
@@ -0,0 +1,99 @@
+"""add binary face embedding to users
+
+Revision ID: 20261017_0023
+Revises: 20260303_0022
+Create Date: 2026-10-17 09:00:00
+"""
+
+from collections.abc import Sequence
+import json
+
+from alembic import op
+import numpy as np
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0023"
+down_revision: str | None = "20260303_0022"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+BACKFILL_CHUNK_SIZE = 500
+EMBEDDING_VERSION = 1
+EMBEDDING_DIMENSIONS = 128
+EMBEDDING_DTYPE = np.dtype("<f4")
+
+
+def _encode(legacy_json: str) -> bytes | None:
+    try:
+        values = json.loads(legacy_json)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(values, list) or len(values) != EMBEDDING_DIMENSIONS:
+        return None
+    try:
+        vector = np.asarray(values, dtype=EMBEDDING_DTYPE)
+    except (TypeError, ValueError):
+        return None
+    return bytes([EMBEDDING_VERSION]) + vector.tobytes()
+
+
+def _decode(embedding: bytes) -> str | None:
+    if len(embedding) != 1 + EMBEDDING_DIMENSIONS * EMBEDDING_DTYPE.itemsize or embedding[0] != EMBEDDING_VERSION:
+        return None
+    vector = np.frombuffer(embedding, dtype=EMBEDDING_DTYPE, offset=1)
+    return json.dumps([float(item) for item in vector.tolist()])
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("face_embedding", sa.LargeBinary(length=513), nullable=True))
+
+    bind = op.get_bind()
+    select_chunk = sa.text(
+        "SELECT id, face_encoding FROM users "
+        "WHERE id > :last_id AND face_encoding IS NOT NULL AND face_embedding IS NULL "
+        "ORDER BY id LIMIT :limit"
+    )
+    update_row = sa.text("UPDATE users SET face_embedding = :embedding WHERE id = :id")
+
+    last_id = 0
+    while True:
+        rows = bind.execute(select_chunk, {"last_id": last_id, "limit": BACKFILL_CHUNK_SIZE}).all()
+        if not rows:
+            break
+        params = [
+            {"id": row.id, "embedding": embedding}
+            for row in rows
+            if (embedding := _encode(row.face_encoding)) is not None
+        ]
+        if params:
+            bind.execute(update_row, params)
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    select_chunk = sa.text(
+        "SELECT id, face_embedding FROM users "
+        "WHERE id > :last_id AND face_embedding IS NOT NULL AND face_encoding IS NULL "
+        "ORDER BY id LIMIT :limit"
+    )
+    update_row = sa.text("UPDATE users SET face_encoding = :encoding WHERE id = :id")
+
+    last_id = 0
+    while True:
+        rows = bind.execute(select_chunk, {"last_id": last_id, "limit": BACKFILL_CHUNK_SIZE}).all()
+        if not rows:
+            break
+        params = [
+            {"id": row.id, "encoding": encoding}
+            for row in rows
+            if (encoding := _decode(row.face_embedding)) is not None
+        ]
+        if params:
+            bind.execute(update_row, params)
+        last_id = rows[-1].id
+
+    op.drop_column("users", "face_embedding")
@@ -0,0 +1,44 @@
+"""create attendance close-out runs
+
+Revision ID: 20261017_0024
+Revises: 20261017_0023
+Create Date: 2026-10-17 10:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0024"
+down_revision: str | None = "20261017_0023"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "attendance_close_outs",
+        sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column("business_id", sa.Integer(), nullable=False),
+        sa.Column("attendance_date", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(length=9), nullable=False),
+        sa.Column("claimed_by", sa.String(length=255), nullable=False),
+        sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("skipped_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.String(length=500), nullable=True),
+        sa.ForeignKeyConstraint(["business_id"], ["businesses.id"], ondelete="CASCADE"),
+        sa.UniqueConstraint("business_id", "attendance_date", name="uq_attendance_close_out_business_date"),
+    )
+    op.create_index("ix_attendance_close_outs_id", "attendance_close_outs", ["id"], unique=False)
+    op.create_index("ix_attendance_close_outs_business_id", "attendance_close_outs", ["business_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_attendance_close_outs_business_id", table_name="attendance_close_outs")
+    op.drop_index("ix_attendance_close_outs_id", table_name="attendance_close_outs")
+    op.drop_table("attendance_close_outs")
@@ -0,0 +1,25 @@
+"""add attendance (attendance_date, id) index for keyset pagination
+
+Revision ID: 20261017_0025
+Revises: 20261017_0024
+Create Date: 2026-10-17 11:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0025"
+down_revision: str | None = "20261017_0024"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_attendance_date_id", "attendance", ["attendance_date", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_attendance_date_id", table_name="attendance")
@@ -0,0 +1,52 @@
+"""create attendance monthly summaries
+
+Revision ID: 20261017_0026
+Revises: 20261017_0025
+Create Date: 2026-10-17 13:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0026"
+down_revision: str | None = "20261017_0025"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "attendance_monthly_summaries",
+        sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("business_id", sa.Integer(), nullable=True),
+        sa.Column("month_start", sa.Date(), nullable=False),
+        sa.Column("present_days", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("absent_days", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("half_days", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("overtime_days", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("leave_days", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("holiday_days", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_minutes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["business_id"], ["businesses.id"], ondelete="CASCADE"),
+        sa.UniqueConstraint("user_id", "month_start", name="uq_attendance_monthly_summary_user_month"),
+    )
+    op.create_index("ix_attendance_monthly_summaries_id", "attendance_monthly_summaries", ["id"], unique=False)
+    op.create_index(
+        "ix_attendance_monthly_summary_business_month_user",
+        "attendance_monthly_summaries",
+        ["business_id", "month_start", "user_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_attendance_monthly_summary_business_month_user", table_name="attendance_monthly_summaries")
+    op.drop_index("ix_attendance_monthly_summaries_id", table_name="attendance_monthly_summaries")
+    op.drop_table("attendance_monthly_summaries")
@@ -0,0 +1,53 @@
+"""create attendance daily branch rollups
+
+Revision ID: 20261017_0027
+Revises: 20261017_0026
+Create Date: 2026-10-17 14:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0027"
+down_revision: str | None = "20261017_0026"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "attendance_daily_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column("business_id", sa.Integer(), nullable=True),
+        sa.Column("branch_id", sa.Integer(), nullable=True),
+        sa.Column("attendance_date", sa.Date(), nullable=False),
+        sa.Column("present_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("absent_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("half_day_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("overtime_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("leave_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("holiday_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("checked_out_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_minutes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["business_id"], ["businesses.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["branch_id"], ["branches.id"], ondelete="CASCADE"),
+        sa.UniqueConstraint("business_id", "branch_id", "attendance_date", name="uq_attendance_daily_rollup_key"),
+    )
+    op.create_index("ix_attendance_daily_rollups_id", "attendance_daily_rollups", ["id"], unique=False)
+    op.create_index(
+        "ix_attendance_daily_rollup_business_date",
+        "attendance_daily_rollups",
+        ["business_id", "attendance_date", "branch_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_attendance_daily_rollup_business_date", table_name="attendance_daily_rollups")
+    op.drop_index("ix_attendance_daily_rollups_id", table_name="attendance_daily_rollups")
+    op.drop_table("attendance_daily_rollups")
@@ -0,0 +1,52 @@
+"""create export jobs
+
+Revision ID: 20261017_0028
+Revises: 20261017_0027
+Create Date: 2026-10-17 15:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0028"
+down_revision: str | None = "20261017_0027"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "export_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column("public_id", sa.String(length=32), nullable=False),
+        sa.Column("requested_by", sa.Integer(), nullable=False),
+        sa.Column("export_format", sa.String(length=10), nullable=False),
+        sa.Column("filters", sa.Text(), nullable=False),
+        sa.Column("cache_key", sa.String(length=64), nullable=False),
+        sa.Column("watermark", sa.String(length=64), nullable=False),
+        sa.Column("status", sa.String(length=9), nullable=False),
+        sa.Column("row_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_rows", sa.Integer(), nullable=True),
+        sa.Column("file_path", sa.String(length=500), nullable=True),
+        sa.Column("filename", sa.String(length=255), nullable=True),
+        sa.Column("error", sa.String(length=500), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["requested_by"], ["users.id"], ondelete="CASCADE"),
+        sa.UniqueConstraint("public_id"),
+    )
+    op.create_index("ix_export_jobs_id", "export_jobs", ["id"], unique=False)
+    op.create_index("ix_export_jobs_requested_by", "export_jobs", ["requested_by"], unique=False)
+    op.create_index("ix_export_jobs_cache_key_watermark", "export_jobs", ["cache_key", "watermark"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_export_jobs_cache_key_watermark", table_name="export_jobs")
+    op.drop_index("ix_export_jobs_requested_by", table_name="export_jobs")
+    op.drop_index("ix_export_jobs_id", table_name="export_jobs")
+    op.drop_table("export_jobs")
@@ -0,0 +1,65 @@
+"""create leave ledger entries
+
+Revision ID: 20261017_0029
+Revises: 20261017_0028
+Create Date: 2026-10-17 16:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0029"
+down_revision: str | None = "20261017_0028"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "leave_ledger_entries",
+        sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("leave_type_id", sa.Integer(), nullable=False),
+        sa.Column("entry_type", sa.String(length=20), nullable=False),
+        sa.Column("days", sa.Integer(), nullable=False),
+        sa.Column("leave_request_id", sa.Integer(), nullable=True),
+        sa.Column("created_by", sa.Integer(), nullable=True),
+        sa.Column("note", sa.String(length=255), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["leave_type_id"], ["leave_types.id"]),
+        sa.ForeignKeyConstraint(["leave_request_id"], ["leave_requests.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"], ondelete="SET NULL"),
+    )
+    op.create_index("ix_leave_ledger_entries_id", "leave_ledger_entries", ["id"], unique=False)
+    op.create_index(
+        "ix_leave_ledger_entries_leave_request_id",
+        "leave_ledger_entries",
+        ["leave_request_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_leave_ledger_entries_user_leave_type",
+        "leave_ledger_entries",
+        ["user_id", "leave_type_id", "id"],
+        unique=False,
+    )
+    # Open the ledger with the balances that already exist so entries always sum to remaining_days.
+    op.execute(
+        """
+        INSERT INTO leave_ledger_entries (user_id, leave_type_id, entry_type, days, note)
+        SELECT user_id, leave_type_id, 'OPENING', remaining_days, 'Balance before ledger'
+        FROM employee_leave_balances
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_leave_ledger_entries_user_leave_type", table_name="leave_ledger_entries")
+    op.drop_index("ix_leave_ledger_entries_leave_request_id", table_name="leave_ledger_entries")
+    op.drop_index("ix_leave_ledger_entries_id", table_name="leave_ledger_entries")
+    op.drop_table("leave_ledger_entries")
@@ -0,0 +1,34 @@
+"""add leave year to balances and carry forward cap to leave masters
+
+Revision ID: 20261017_0030
+Revises: 20261017_0029
+Create Date: 2026-10-17 17:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0030"
+down_revision: str | None = "20261017_0029"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "leave_masters",
+        sa.Column("carry_forward_max_days", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column("employee_leave_balances", sa.Column("leave_year", sa.Integer(), nullable=True))
+    # Existing balances were allocated lazily in the year they were first used.
+    op.execute("UPDATE employee_leave_balances SET leave_year = YEAR(created_at)")
+    op.alter_column("employee_leave_balances", "leave_year", existing_type=sa.Integer(), nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column("employee_leave_balances", "leave_year")
+    op.drop_column("leave_masters", "carry_forward_max_days")
@@ -0,0 +1,92 @@
+"""key attendance daily rollups on non-null business and branch columns
+
+Revision ID: 20261017_0031
+Revises: 20261017_0030
+Create Date: 2026-10-17 18:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0031"
+down_revision: str | None = "20261017_0030"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+COUNT_COLUMNS = (
+    "present_count",
+    "absent_count",
+    "half_day_count",
+    "overtime_count",
+    "leave_count",
+    "holiday_count",
+    "checked_out_count",
+    "total_minutes",
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "attendance_daily_rollups",
+        sa.Column("business_key", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "attendance_daily_rollups",
+        sa.Column("branch_key", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+        UPDATE attendance_daily_rollups
+        SET business_key = COALESCE(business_id, 0), branch_key = COALESCE(branch_id, 0)
+        """
+    )
+
+    # The old key let NULL-branch days insert more than one row; fold them into the lowest id.
+    bind = op.get_bind()
+    duplicates = bind.execute(
+        sa.text(
+            """
+            SELECT business_key, branch_key, attendance_date, MIN(id)
+            FROM attendance_daily_rollups
+            GROUP BY business_key, branch_key, attendance_date
+            HAVING COUNT(*) > 1
+            """
+        )
+    ).all()
+    totals = ", ".join(f"SUM({column})" for column in COUNT_COLUMNS)
+    assignments = ", ".join(f"{column} = :{column}" for column in COUNT_COLUMNS)
+    for business_key, branch_key, attendance_date, keep_id in duplicates:
+        key = {"business_key": business_key, "branch_key": branch_key, "attendance_date": attendance_date}
+        match = "business_key = :business_key AND branch_key = :branch_key AND attendance_date = :attendance_date"
+        summed = bind.execute(sa.text(f"SELECT {totals} FROM attendance_daily_rollups WHERE {match}"), key).one()
+        bind.execute(
+            sa.text(f"UPDATE attendance_daily_rollups SET {assignments} WHERE id = :keep_id"),
+            {**dict(zip(COUNT_COLUMNS, summed)), "keep_id": keep_id},
+        )
+        bind.execute(
+            sa.text(f"DELETE FROM attendance_daily_rollups WHERE {match} AND id <> :keep_id"),
+            {**key, "keep_id": keep_id},
+        )
+
+    op.drop_constraint("uq_attendance_daily_rollup_key", "attendance_daily_rollups", type_="unique")
+    op.create_unique_constraint(
+        "uq_attendance_daily_rollup_key",
+        "attendance_daily_rollups",
+        ["business_key", "branch_key", "attendance_date"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_attendance_daily_rollup_key", "attendance_daily_rollups", type_="unique")
+    op.create_unique_constraint(
+        "uq_attendance_daily_rollup_key",
+        "attendance_daily_rollups",
+        ["business_id", "branch_id", "attendance_date"],
+    )
+    op.drop_column("attendance_daily_rollups", "branch_key")
+    op.drop_column("attendance_daily_rollups", "business_key")
@@ -0,0 +1,26 @@
+"""add heartbeat_at to export jobs
+
+Revision ID: 20261017_0032
+Revises: 20261017_0031
+Create Date: 2026-10-17 19:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0032"
+down_revision: str | None = "20261017_0031"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("export_jobs", sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("export_jobs", "heartbeat_at")
@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from datetime import date
 from io import BytesIO
-from typing import Annotated
+from typing import Annotated, Literal
 
 from fastapi import APIRouter, Depends, Query, Request, status
-from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
@@ -14,16 +15,23 @@ from app.core.exceptions import BadRequestException
 from app.models.user import User
 from app.schemas.attendance import (
     AttendanceActionRequest,
+    AttendanceAnalyticsResponse,
     AttendanceCheckInRequest,
     AttendanceCheckInResponse,
     AttendanceListResponse,
+    AttendanceMonthlySummaryListResponse,
     AttendanceResponse,
     AutoAbsenceRequest,
     AutoAbsenceResponse,
+    ExportJobCreateRequest,
+    ExportJobResponse,
     FaceEnrollRequest,
     FaceEnrollResponse,
+    KioskCheckInRequest,
+    KioskCheckInResponse,
 )
 from app.services.attendance_service import AttendanceService
+from app.services.export_job_service import ExportJobService
 
 
 router = APIRouter(tags=["Attendance"])
@@ -40,6 +48,14 @@ def _extract_image_from_form(form) -> bytes:
     raise BadRequestException("image file is required (use multipart field: image)")
 
 
+def _resolve_client_ip(request: Request, ip_address: str | None) -> str | None:
+    forwarded_ip = request.headers.get("x-forwarded-for")
+    resolved_ip = ip_address or (forwarded_ip.split(",")[0].strip() if forwarded_ip else None)
+    if resolved_ip is None and request.client is not None:
+        resolved_ip = request.client.host
+    return resolved_ip
+
+
 @router.post("/face/enroll", response_model=FaceEnrollResponse, status_code=status.HTTP_200_OK)
 async def enroll_face(
     request: Request,
@@ -52,10 +68,10 @@ async def enroll_face(
         form = await request.form()
         image = _extract_image_from_form(form)
         image_bytes = await image.read()
-        return service.enroll_face(actor=current_user, image_bytes=image_bytes)
+        return await run_in_threadpool(service.enroll_face, actor=current_user, image_bytes=image_bytes)
 
     payload = FaceEnrollRequest.model_validate(await request.json())
-    return service.enroll_face(actor=current_user, image_base64=payload.image_base64)
+    return await run_in_threadpool(service.enroll_face, actor=current_user, image_base64=payload.image_base64)
 
 
 @router.post("/attendance/check-in", response_model=AttendanceCheckInResponse, status_code=status.HTTP_201_CREATED)
@@ -89,17 +105,68 @@ async def check_in(
         longitude = payload.longitude
         ip_address = payload.ip_address
 
-    forwarded_ip = request.headers.get("x-forwarded-for")
-    resolved_ip = ip_address or (forwarded_ip.split(",")[0].strip() if forwarded_ip else None)
-    if resolved_ip is None and request.client is not None:
-        resolved_ip = request.client.host
-    return service.check_in(
+    return await run_in_threadpool(
+        service.check_in,
+        actor=current_user,
+        image_base64=image_base64,
+        image_bytes=image_bytes,
+        latitude=latitude,
+        longitude=longitude,
+        ip_address=_resolve_client_ip(request, ip_address),
+        device_info=request.headers.get("user-agent"),
+    )
+
+
+@router.post(
+    "/attendance/kiosk/check-in",
+    response_model=KioskCheckInResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def kiosk_check_in(
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_permission("KIOSK_CHECK_IN"))],
+    request: Request,
+) -> KioskCheckInResponse:
+    service = AttendanceService(db)
+    content_type = (request.headers.get("content-type") or "").lower()
+    image_base64: str | None = None
+    image_bytes: bytes | None = None
+    latitude: float
+    longitude: float
+    ip_address: str | None = None
+    branch_id: int | None = None
+
+    if "multipart/form-data" in content_type:
+        form = await request.form()
+        image = _extract_image_from_form(form)
+        image_bytes = await image.read()
+        try:
+            latitude = float(form.get("latitude"))
+            longitude = float(form.get("longitude"))
+        except (TypeError, ValueError) as exc:
+            raise BadRequestException("latitude and longitude are required") from exc
+        try:
+            branch_id = int(form["branch_id"]) if form.get("branch_id") else None
+        except (TypeError, ValueError) as exc:
+            raise BadRequestException("branch_id must be an integer") from exc
+        ip_address = form.get("ip_address")
+    else:
+        payload = KioskCheckInRequest.model_validate(await request.json())
+        image_base64 = payload.image_base64
+        latitude = payload.latitude
+        longitude = payload.longitude
+        ip_address = payload.ip_address
+        branch_id = payload.branch_id
+
+    return await run_in_threadpool(
+        service.kiosk_check_in,
         actor=current_user,
+        branch_id=branch_id,
         image_base64=image_base64,
         image_bytes=image_bytes,
         latitude=latitude,
         longitude=longitude,
-        ip_address=resolved_ip,
+        ip_address=_resolve_client_ip(request, ip_address),
         device_info=request.headers.get("user-agent"),
     )
 
@@ -126,6 +193,8 @@ def list_attendance(
     end_date: date | None = Query(default=None),
     page: int = Query(default=1, ge=1),
     size: int = Query(default=10, ge=1, le=100),
+    cursor: str | None = Query(default=None),
+    include_total: bool = Query(default=False),
 ) -> AttendanceListResponse:
     if start_date is not None and end_date is not None and end_date < start_date:
         raise BadRequestException("end_date must be greater than or equal to start_date")
@@ -140,6 +209,46 @@ def list_attendance(
         end_date=end_date,
         page=page,
         size=size,
+        cursor=cursor,
+        include_total=include_total,
+    )
+
+
+@router.get("/attendance/analytics/daily", response_model=AttendanceAnalyticsResponse)
+def attendance_daily_analytics(
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    start_date: date = Query(),
+    end_date: date = Query(),
+    branch_id: int | None = Query(default=None, ge=1),
+) -> AttendanceAnalyticsResponse:
+    service = AttendanceService(db)
+    return service.attendance_analytics(
+        actor=current_user,
+        start_date=start_date,
+        end_date=end_date,
+        branch_id=branch_id,
+    )
+
+
+@router.get("/attendance/summary/monthly", response_model=AttendanceMonthlySummaryListResponse)
+def monthly_attendance_summary(
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    month: str = Query(description="Month formatted as YYYY-MM"),
+    user_id: int | None = Query(default=None, ge=1),
+    branch_id: int | None = Query(default=None, ge=1),
+    size: int = Query(default=100, ge=1, le=1000),
+    cursor: str | None = Query(default=None),
+) -> AttendanceMonthlySummaryListResponse:
+    service = AttendanceService(db)
+    return service.list_monthly_summary(
+        actor=current_user,
+        month=month,
+        user_id=user_id,
+        branch_id=branch_id,
+        size=size,
+        cursor=cursor,
     )
 
 
@@ -157,6 +266,80 @@ def auto_absence(
     )
 
 
+@router.get("/attendance/feed")
+def attendance_feed(
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    feed_format: Literal["ndjson", "csv"] = Query(default="ndjson", alias="format"),
+    user_id: int | None = Query(default=None, ge=1),
+    branch_id: int | None = Query(default=None, ge=1),
+    status: str | None = Query(default=None),
+    search: str | None = Query(default=None),
+    start_date: date | None = Query(default=None),
+    end_date: date | None = Query(default=None),
+) -> StreamingResponse:
+    if start_date is not None and end_date is not None and end_date < start_date:
+        raise BadRequestException("end_date must be greater than or equal to start_date")
+    service = AttendanceService(db)
+    chunks, media_type = service.stream_attendance_feed(
+        actor=current_user,
+        feed_format=feed_format,
+        user_id=user_id,
+        branch_id=branch_id,
+        status=status,
+        search=search,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    return StreamingResponse(chunks, media_type=media_type)
+
+
+@router.post(
+    "/attendance/export/jobs",
+    response_model=ExportJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def create_export_job(
+    payload: ExportJobCreateRequest,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+) -> ExportJobResponse:
+    if payload.start_date is not None and payload.end_date is not None and payload.end_date < payload.start_date:
+        raise BadRequestException("end_date must be greater than or equal to start_date")
+    service = ExportJobService(db)
+    return service.create_job(
+        actor=current_user,
+        export_format=payload.format,
+        user_id=payload.user_id,
+        branch_id=payload.branch_id,
+        status=payload.status,
+        search=payload.search,
+        start_date=payload.start_date,
+        end_date=payload.end_date,
+    )
+
+
+@router.get("/attendance/export/jobs/{job_id}", response_model=ExportJobResponse)
+def get_export_job(
+    job_id: str,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+) -> ExportJobResponse:
+    service = ExportJobService(db)
+    return service.get_job(actor=current_user, public_id=job_id)
+
+
+@router.get("/attendance/export/jobs/{job_id}/download")
+def download_export_job(
+    job_id: str,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+) -> FileResponse:
+    service = ExportJobService(db)
+    export = service.download(actor=current_user, public_id=job_id)
+    return FileResponse(path=str(export.path), media_type=export.media_type, filename=export.filename)
+
+
 @router.get("/attendance/export/excel")
 def export_attendance_excel(
     db: Annotated[Session, Depends(get_db)],
@@ -171,7 +354,7 @@ def export_attendance_excel(
     if start_date is not None and end_date is not None and end_date < start_date:
         raise BadRequestException("end_date must be greater than or equal to start_date")
     service = AttendanceService(db)
-    content, filename = service.export_attendance_excel(
+    chunks, filename = service.export_attendance_excel(
         actor=current_user,
         user_id=user_id,
         branch_id=branch_id,
@@ -181,7 +364,7 @@ def export_attendance_excel(
         end_date=end_date,
     )
     return StreamingResponse(
-        BytesIO(content),
+        chunks,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
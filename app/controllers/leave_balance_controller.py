@@ -0,0 +1,55 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.dependencies import require_roles
+from app.models.role import RoleEnum
+from app.models.user import User
+from app.schemas.leave_balance import (
+    LeaveBalanceGridResponse,
+    LeaveBalanceMaterializeRequest,
+    LeaveBalanceMaterializeResponse,
+)
+from app.services.leave_balance_service import LeaveBalanceService
+
+
+router = APIRouter(tags=["Leave Balances"])
+
+
+@router.get("/leave-balances", response_model=LeaveBalanceGridResponse)
+def list_leave_balances(
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[
+        User,
+        Depends(require_roles(RoleEnum.MASTER_ADMIN, RoleEnum.BUSINESS_OWNER, RoleEnum.BUSINESS_ADMIN)),
+    ],
+    business_id: int | None = Query(default=None, ge=1),
+    branch_id: int | None = Query(default=None, ge=1),
+    leave_type_id: int | None = Query(default=None, ge=1),
+    size: int = Query(default=100, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+) -> LeaveBalanceGridResponse:
+    service = LeaveBalanceService(db)
+    return service.list_grid(
+        actor=current_user,
+        business_id=business_id,
+        branch_id=branch_id,
+        leave_type_id=leave_type_id,
+        size=size,
+        cursor=cursor,
+    )
+
+
+@router.post("/leave-balances/materialize", response_model=LeaveBalanceMaterializeResponse)
+def materialize_leave_balances(
+    payload: LeaveBalanceMaterializeRequest,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[
+        User,
+        Depends(require_roles(RoleEnum.MASTER_ADMIN, RoleEnum.BUSINESS_OWNER, RoleEnum.BUSINESS_ADMIN)),
+    ],
+) -> LeaveBalanceMaterializeResponse:
+    service = LeaveBalanceService(db)
+    return service.materialize(actor=current_user, payload=payload)
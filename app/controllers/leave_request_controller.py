@@ -1,13 +1,21 @@
+from datetime import date
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.models.leave_request import LeaveRequestStatus
 from app.models.user import User
-from app.schemas.leave_request import LeaveRequestApplyRequest, LeaveRequestRejectRequest, LeaveRequestResponse
+from app.schemas.leave_request import (
+    LeaveRequestApplyRequest,
+    LeaveRequestBulkDecisionRequest,
+    LeaveRequestBulkDecisionResponse,
+    LeaveRequestRejectRequest,
+    LeaveRequestResponse,
+    TeamLeaveCalendarResponse,
+)
 from app.services.leave_request_service import LeaveRequestService
 
 
@@ -43,6 +51,33 @@ def list_team_leave_requests(
     return service.list_team_requests(current_user=current_user, status=status)
 
 
+@router.get("/leave-requests/team-calendar", response_model=TeamLeaveCalendarResponse)
+def team_leave_calendar(
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    start_date: date = Query(),
+    end_date: date = Query(),
+    min_overlap: int = Query(default=2, ge=2),
+) -> TeamLeaveCalendarResponse:
+    service = LeaveRequestService(db)
+    return service.team_calendar(
+        current_user=current_user,
+        start_date=start_date,
+        end_date=end_date,
+        min_overlap=min_overlap,
+    )
+
+
+@router.post("/leave-requests/bulk-decision", response_model=LeaveRequestBulkDecisionResponse)
+def bulk_decide_leave_requests(
+    payload: LeaveRequestBulkDecisionRequest,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+) -> LeaveRequestBulkDecisionResponse:
+    service = LeaveRequestService(db)
+    return service.bulk_decide(current_user=current_user, payload=payload)
+
+
 @router.put("/leave-requests/{leave_request_id}/approve", response_model=LeaveRequestResponse)
 def approve_leave_request(
     leave_request_id: int,
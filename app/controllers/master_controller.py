@@ -40,7 +40,10 @@ from app.schemas.weekend_policy import (
     SessionCreateRequest,
     SessionResponse,
     SessionUpdateRequest,
+    WeekendCalendarBatchRequest,
+    WeekendCalendarBatchResponse,
     WeekendCheckResponse,
+    WeekendDatesResponse,
     WeekendPolicyCreateRequest,
     WeekendPolicyResponse,
     WeekendPolicyUpdateRequest,
@@ -640,6 +643,48 @@ def list_weekend_policies(
     return service.list_policies(actor=current_user, branch_id=branch_id)
 
 
+@router.get("/weekend-policies/check", response_model=WeekendCheckResponse)
+def check_weekend_policy(
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_roles(RoleEnum.MASTER_ADMIN))],
+    branch_id: int | None = Query(default=None, ge=1),
+    date_value: date = Query(alias="date"),
+) -> WeekendCheckResponse:
+    service = WeekendPolicyService(db)
+    return service.is_weekend(
+        actor=current_user,
+        branch_id=branch_id,
+        target_date=date_value,
+    )
+
+
+@router.get("/weekend-policies/weekend-dates", response_model=WeekendDatesResponse)
+def list_weekend_dates(
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_roles(RoleEnum.MASTER_ADMIN))],
+    start_date: date = Query(),
+    end_date: date = Query(),
+    branch_id: int | None = Query(default=None, ge=1),
+) -> WeekendDatesResponse:
+    service = WeekendPolicyService(db)
+    return service.weekend_dates(
+        actor=current_user,
+        branch_id=branch_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+
+@router.post("/weekend-policies/calendar", response_model=WeekendCalendarBatchResponse)
+def weekend_calendar_batch(
+    payload: WeekendCalendarBatchRequest,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_roles(RoleEnum.MASTER_ADMIN))],
+) -> WeekendCalendarBatchResponse:
+    service = WeekendPolicyService(db)
+    return service.calendar_batch(actor=current_user, payload=payload)
+
+
 @router.get("/weekend-policies/{policy_id}", response_model=WeekendPolicyResponse)
 def get_weekend_policy(
     policy_id: int,
@@ -670,18 +715,3 @@ def delete_weekend_policy(
     service = WeekendPolicyService(db)
     service.delete_policy(actor=current_user, policy_id=policy_id)
     return {"detail": "Weekend policy deleted successfully"}
-
-
-@router.get("/weekend-policies/check", response_model=WeekendCheckResponse)
-def check_weekend_policy(
-    db: Annotated[Session, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_roles(RoleEnum.MASTER_ADMIN))],
-    branch_id: int | None = Query(default=None, ge=1),
-    date_value: date = Query(alias="date"),
-) -> WeekendCheckResponse:
-    service = WeekendPolicyService(db)
-    return service.is_weekend(
-        actor=current_user,
-        branch_id=branch_id,
-        target_date=date_value,
-    )
@@ -115,6 +115,9 @@ def list_users_paginated(
     first_name: str | None = Query(default=None),
     mobile_number: str | None = Query(default=None),
     branch_id: int | None = Query(default=None, ge=1),
+    cursor: str | None = Query(default=None),
+    include: str | None = Query(default=None),
+    include_total: bool = Query(default=False),
 ) -> UserListResponse:
     service = UserService(db)
     return service.list_users_paginated(
@@ -124,6 +127,9 @@ def list_users_paginated(
         first_name=first_name,
         mobile_number=mobile_number,
         branch_id=branch_id,
+        cursor=cursor,
+        include=include,
+        include_total=include_total,
     )
 
 
@@ -21,6 +21,40 @@ class Settings(BaseModel):
     attendance_face_distance_threshold: float = 0.6
     attendance_check_in_rate_limit: int = 10
     attendance_check_in_rate_window_seconds: int = 60
+    attendance_kiosk_rate_limit: int = 120
+    attendance_kiosk_rate_window_seconds: int = 60
+    face_worker_processes: int = 2
+    face_worker_max_queue: int = 16
+    face_worker_timeout_seconds: float = 15.0
+    attendance_face_ambiguity_margin: float = 0.06
+    face_index_ttl_seconds: int = 300
+    principal_cache_ttl_seconds: int = 60
+    principal_cache_max_entries: int = 10000
+    role_permission_cache_ttl_seconds: int = 60
+    revoked_token_refresh_seconds: int = 10
+    revoked_token_purge_interval_seconds: int = 3600
+    revoked_token_purge_chunk_size: int = 1000
+    attendance_close_out_workers: int = 4
+    attendance_close_out_stale_after_seconds: int = 3600
+    export_fetch_chunk_size: int = 1000
+    export_spool_max_bytes: int = 8 * 1024 * 1024
+    attendance_feed_flush_rows: int = 500
+    attendance_feed_flush_seconds: float = 1.0
+    attendance_analytics_cache_ttl_seconds: int = 60
+    attendance_analytics_cache_max_entries: int = 1000
+    attendance_analytics_max_days: int = 400
+    export_job_workers: int = 2
+    export_job_result_ttl_seconds: int = 3600
+    export_job_stale_after_seconds: int = 3600
+    export_job_progress_every_rows: int = 1000
+    export_job_retention_seconds: int = 86400
+    export_job_purge_interval_seconds: int = 3600
+    weekend_calendar_ttl_seconds: int = 300
+    # Writes only evict the calendars of the worker that handled them; other workers may serve a
+    # calendar up to this many seconds old.
+    team_leave_calendar_cache_ttl_seconds: int = 60
+    team_leave_calendar_cache_max_entries: int = 1000
+    team_leave_calendar_max_days: int = 366
 
 
 @lru_cache
@@ -64,6 +98,40 @@ def get_settings() -> Settings:
         attendance_check_in_rate_window_seconds=int(
             os.getenv("ATTENDANCE_CHECK_IN_RATE_WINDOW_SECONDS", "60")
         ),
+        attendance_kiosk_rate_limit=int(os.getenv("ATTENDANCE_KIOSK_RATE_LIMIT", "120")),
+        attendance_kiosk_rate_window_seconds=int(os.getenv("ATTENDANCE_KIOSK_RATE_WINDOW_SECONDS", "60")),
+        face_worker_processes=int(os.getenv("FACE_WORKER_PROCESSES", "2")),
+        face_worker_max_queue=int(os.getenv("FACE_WORKER_MAX_QUEUE", "16")),
+        face_worker_timeout_seconds=float(os.getenv("FACE_WORKER_TIMEOUT_SECONDS", "15")),
+        attendance_face_ambiguity_margin=float(os.getenv("ATTENDANCE_FACE_AMBIGUITY_MARGIN", "0.06")),
+        face_index_ttl_seconds=int(os.getenv("FACE_INDEX_TTL_SECONDS", "300")),
+        principal_cache_ttl_seconds=int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60")),
+        principal_cache_max_entries=int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000")),
+        role_permission_cache_ttl_seconds=int(os.getenv("ROLE_PERMISSION_CACHE_TTL_SECONDS", "60")),
+        revoked_token_refresh_seconds=int(os.getenv("REVOKED_TOKEN_REFRESH_SECONDS", "10")),
+        revoked_token_purge_interval_seconds=int(os.getenv("REVOKED_TOKEN_PURGE_INTERVAL_SECONDS", "3600")),
+        revoked_token_purge_chunk_size=int(os.getenv("REVOKED_TOKEN_PURGE_CHUNK_SIZE", "1000")),
+        attendance_close_out_workers=int(os.getenv("ATTENDANCE_CLOSE_OUT_WORKERS", "4")),
+        attendance_close_out_stale_after_seconds=int(
+            os.getenv("ATTENDANCE_CLOSE_OUT_STALE_AFTER_SECONDS", "3600")
+        ),
+        export_fetch_chunk_size=int(os.getenv("EXPORT_FETCH_CHUNK_SIZE", "1000")),
+        export_spool_max_bytes=int(os.getenv("EXPORT_SPOOL_MAX_BYTES", str(8 * 1024 * 1024))),
+        attendance_feed_flush_rows=int(os.getenv("ATTENDANCE_FEED_FLUSH_ROWS", "500")),
+        attendance_feed_flush_seconds=float(os.getenv("ATTENDANCE_FEED_FLUSH_SECONDS", "1")),
+        attendance_analytics_cache_ttl_seconds=int(os.getenv("ATTENDANCE_ANALYTICS_CACHE_TTL_SECONDS", "60")),
+        attendance_analytics_cache_max_entries=int(os.getenv("ATTENDANCE_ANALYTICS_CACHE_MAX_ENTRIES", "1000")),
+        attendance_analytics_max_days=int(os.getenv("ATTENDANCE_ANALYTICS_MAX_DAYS", "400")),
+        export_job_workers=int(os.getenv("EXPORT_JOB_WORKERS", "2")),
+        export_job_result_ttl_seconds=int(os.getenv("EXPORT_JOB_RESULT_TTL_SECONDS", "3600")),
+        export_job_stale_after_seconds=int(os.getenv("EXPORT_JOB_STALE_AFTER_SECONDS", "3600")),
+        export_job_progress_every_rows=int(os.getenv("EXPORT_JOB_PROGRESS_EVERY_ROWS", "1000")),
+        export_job_retention_seconds=int(os.getenv("EXPORT_JOB_RETENTION_SECONDS", "86400")),
+        export_job_purge_interval_seconds=int(os.getenv("EXPORT_JOB_PURGE_INTERVAL_SECONDS", "3600")),
+        weekend_calendar_ttl_seconds=int(os.getenv("WEEKEND_CALENDAR_TTL_SECONDS", "300")),
+        team_leave_calendar_cache_ttl_seconds=int(os.getenv("TEAM_LEAVE_CALENDAR_CACHE_TTL_SECONDS", "60")),
+        team_leave_calendar_cache_max_entries=int(os.getenv("TEAM_LEAVE_CALENDAR_CACHE_MAX_ENTRIES", "1000")),
+        team_leave_calendar_max_days=int(os.getenv("TEAM_LEAVE_CALENDAR_MAX_DAYS", "366")),
     )
 
 
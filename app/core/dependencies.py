@@ -7,10 +7,11 @@ from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.exceptions import ForbiddenException, UnauthorizedException
+from app.core.principal import PRINCIPAL_CACHE, PRINCIPAL_COLUMNS, Principal
+from app.core.revocation import REVOKED_TOKENS
+from app.core.role_permissions import role_has_permission
 from app.core.security import decode_access_token
 from app.models.role import RoleEnum
-from app.repository.role_permission_repository import RolePermissionRepository
-from app.repository.revoked_token_repository import RevokedTokenRepository
 from app.models.user import User
 from app.repository.user_repository import UserRepository
 
@@ -51,17 +52,21 @@ def get_current_user(
         raise UnauthorizedException("Invalid token payload")
     if jti is None or not isinstance(jti, str):
         raise UnauthorizedException("Invalid token payload")
-    if RevokedTokenRepository(db).exists_by_jti(jti):
+    if REVOKED_TOKENS.is_revoked(db, jti):
         raise UnauthorizedException("Token has been logged out")
     try:
         parsed_user_id = int(user_id)
     except (TypeError, ValueError) as exc:
         raise UnauthorizedException("Invalid token subject") from exc
 
-    user = UserRepository(db).get_by_id(parsed_user_id)
-    if user is None:
-        raise UnauthorizedException("User from token does not exist")
-    return user
+    principal = PRINCIPAL_CACHE.get(parsed_user_id)
+    if principal is None:
+        user = UserRepository(db).get_principal_by_id(parsed_user_id, PRINCIPAL_COLUMNS)
+        if user is None:
+            raise UnauthorizedException("User from token does not exist")
+        principal = Principal.from_user(user)
+        PRINCIPAL_CACHE.set(parsed_user_id, principal)
+    return principal.to_user()
 
 
 def require_roles(*roles: RoleEnum) -> Callable[[User], User]:
@@ -82,11 +87,7 @@ def require_permission(permission_name: str) -> Callable[[User, Session], User]:
         if current_user.role_id is None:
             raise ForbiddenException("You do not have permission: role is not assigned")
 
-        has_permission = RolePermissionRepository(db).has_permission_for_role(
-            role_id=current_user.role_id,
-            permission_name=normalized_permission,
-        )
-        if not has_permission:
+        if not role_has_permission(db, current_user.role_id, normalized_permission):
             raise ForbiddenException(f"You do not have permission: {normalized_permission}")
         return current_user
 
@@ -45,6 +45,11 @@ class TooManyRequestsException(AppException):
         super().__init__(status_code=429, detail=detail)
 
 
+class ServiceUnavailableException(AppException):
+    def __init__(self, detail: str = "Service temporarily unavailable") -> None:
+        super().__init__(status_code=503, detail=detail)
+
+
 def register_exception_handlers(app: FastAPI) -> None:
     @app.exception_handler(AppException)
     async def app_exception_handler(_: Request, exc: AppException) -> JSONResponse:
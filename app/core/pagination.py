@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any
+
+from app.core.exceptions import BadRequestException
+
+
+def encode_cursor(values: dict[str, Any]) -> str:
+    payload = json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, *, keys: tuple[str, ...]) -> dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise BadRequestException("Invalid cursor") from exc
+    if not isinstance(values, dict) or set(values) != set(keys):
+        raise BadRequestException("Invalid cursor")
+    return values
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.role import RoleEnum
+from app.models.user import User
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Authorization-relevant columns of a user, safe to share across requests."""
+
+    id: int
+    username: str
+    email: str
+    first_name: str
+    middle_name: str | None
+    last_name: str
+    name: str | None
+    role: RoleEnum
+    role_id: int | None
+    business_id: int | None
+    branch_id: int | None
+    employment_type_id: int | None
+    designation_id: int | None
+    reporting_manager_id: int | None
+    status: str | None
+
+    @classmethod
+    def from_user(cls, user: User) -> Principal:
+        return cls(**{item.name: getattr(user, item.name) for item in fields(cls)})
+
+    def to_user(self) -> User:
+        # A transient (session-less) User so controllers and services keep their User type hints.
+        return User(**{item.name: getattr(self, item.name) for item in fields(self)})
+
+
+PRINCIPAL_COLUMNS: tuple[str, ...] = tuple(item.name for item in fields(Principal))
+
+PRINCIPAL_CACHE: TTLCache[int, Principal] = TTLCache(
+    max_entries=settings.principal_cache_max_entries,
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+)
+
+
+def invalidate_principal(user_id: int) -> None:
+    PRINCIPAL_CACHE.pop(user_id)
+
+
+def invalidate_principals_for_role(role_id: int) -> None:
+    PRINCIPAL_CACHE.discard_where(lambda principal: principal.role_id == role_id)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from threading import Lock
+from time import monotonic
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.repository.revoked_token_repository import RevokedTokenRepository
+
+
+class RevokedTokenSet:
+    """In-memory snapshot of the unexpired revoked ``jti`` values.
+
+    Revocations only live until the token would have expired anyway, so the set stays small and is
+    kept exact rather than probabilistic: a hit is authoritative and a miss needs no lookup. The
+    snapshot is reloaded at most every ``refresh_seconds``, which is the longest a logout on another
+    worker can stay invisible here; logouts from this process are visible immediately.
+    """
+
+    def __init__(self, *, refresh_seconds: float) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._lock = Lock()
+        self._jtis: frozenset[str] = frozenset()
+        self._loaded_at: float | None = None
+
+    def is_revoked(self, db: Session, jti: str) -> bool:
+        if self.refresh_seconds <= 0:
+            return RevokedTokenRepository(db).exists_by_jti(jti)
+        self._refresh_if_stale(db)
+        return jti in self._jtis
+
+    def add(self, jti: str) -> None:
+        with self._lock:
+            self._jtis = self._jtis | {jti}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._jtis = frozenset()
+            self._loaded_at = None
+
+    def _refresh_if_stale(self, db: Session) -> None:
+        loaded_at = self._loaded_at
+        if loaded_at is not None and monotonic() - loaded_at < self.refresh_seconds:
+            return
+        # The first load must block; later ones are done by a single thread while the others keep
+        # answering from the previous snapshot.
+        if not self._lock.acquire(blocking=loaded_at is None):
+            return
+        try:
+            if self._loaded_at is not None and monotonic() - self._loaded_at < self.refresh_seconds:
+                return
+            started = monotonic()
+            # add() waits on the lock, so a logout committed after this query started is merged
+            # into the new snapshot rather than lost.
+            self._jtis = frozenset(RevokedTokenRepository(db).list_active_jtis(datetime.now(timezone.utc)))
+            self._loaded_at = started
+        finally:
+            self._lock.release()
+
+
+REVOKED_TOKENS = RevokedTokenSet(refresh_seconds=settings.revoked_token_refresh_seconds)
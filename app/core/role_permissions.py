@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from threading import Lock
+from time import monotonic
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.repository.role_permission_repository import RolePermissionRepository
+
+
+class RolePermissionCache:
+    """Per-process map of role id to its full set of permission names.
+
+    Every write to role permissions or permission names bumps ``version`` and drops all sets. A
+    set loaded while a bump happened is returned to its caller but never stored, so a reader can
+    not re-cache the pre-change permissions. The TTL bounds staleness for changes made by other
+    workers.
+    """
+
+    def __init__(self, *, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = Lock()
+        self._version = 0
+        self._entries: dict[int, tuple[int, float, frozenset[str]]] = {}
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, role_id: int, loader: Callable[[], Iterable[str]]) -> frozenset[str]:
+        version = self._version
+        entry = self._entries.get(role_id)
+        if entry is not None and entry[0] == version and monotonic() < entry[1]:
+            return entry[2]
+
+        permissions = frozenset(loader())
+        if self.ttl_seconds > 0:
+            with self._lock:
+                if self._version == version:
+                    self._entries[role_id] = (version, monotonic() + self.ttl_seconds, permissions)
+        return permissions
+
+    def bump(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+
+ROLE_PERMISSION_CACHE = RolePermissionCache(ttl_seconds=settings.role_permission_cache_ttl_seconds)
+
+
+def get_role_permissions(db: Session, role_id: int) -> frozenset[str]:
+    return ROLE_PERMISSION_CACHE.get(
+        role_id,
+        lambda: RolePermissionRepository(db).list_permission_names_for_role(role_id),
+    )
+
+
+def role_has_permission(db: Session, role_id: int | None, permission_name: str) -> bool:
+    if role_id is None:
+        return False
+    return permission_name in get_role_permissions(db, role_id)
+
+
+def invalidate_role_permissions() -> None:
+    ROLE_PERMISSION_CACHE.bump()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from collections.abc import Collection, Iterable
+from threading import Lock
+
+from sqlalchemy import column, exists, inspect, literal, or_, select, table
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+
+class SchemaCapabilities:
+    """Column names per table of the connected database, keyed by the Alembic revision.
+
+    Usage checks probe optional tables owned by other modules (payroll, leave ledgers, ...).
+    Reflecting them on every call costs several information_schema round trips, so the
+    snapshot is taken at startup (or on first use) and only re-reflected when the
+    ``alembic_version`` row changes, i.e. after a migration has run against the live database.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._columns: dict[str, frozenset[str]] | None = None
+        self._version: str | None = None
+
+    def refresh(self, bind: Engine | Connection) -> None:
+        if isinstance(bind, Engine):
+            with bind.connect() as connection:
+                self.refresh(connection)
+            return
+        inspector = inspect(bind)
+        columns = {
+            table_name: frozenset(item["name"] for item in inspector.get_columns(table_name))
+            for table_name in inspector.get_table_names()
+        }
+        version = _read_version(bind) if _VERSION_TABLE in columns else None
+        with self._lock:
+            self._columns = columns
+            self._version = version
+
+    def tables_with_column(
+        self,
+        bind: Connection,
+        column_name: str,
+        candidate_tables: Iterable[str],
+    ) -> tuple[str, ...]:
+        if self._columns is None or (
+            _VERSION_TABLE in self._columns and _read_version(bind) != self._version
+        ):
+            self.refresh(bind)
+        columns = self._columns or {}
+        return tuple(name for name in candidate_tables if column_name in columns.get(name, ()))
+
+
+_VERSION_TABLE = "alembic_version"
+
+
+def _read_version(connection: Connection) -> str | None:
+    return connection.execute(select(column("version_num")).select_from(table(_VERSION_TABLE))).scalar()
+
+
+SCHEMA_CAPABILITIES = SchemaCapabilities()
+
+
+def references_exist(
+    db: Session,
+    *,
+    column_name: str,
+    candidate_tables: Iterable[str],
+    values: Collection[int],
+) -> bool:
+    """Whether any of ``candidate_tables`` has a row whose ``column_name`` is one of ``values``.
+
+    Runs as a single ``SELECT EXISTS (...) OR EXISTS (...)`` over the tables that actually have
+    the column, so the database can stop at the first match.
+    """
+    if not values:
+        return False
+    tables = SCHEMA_CAPABILITIES.tables_with_column(db.connection(), column_name, candidate_tables)
+    if not tables:
+        return False
+    probes = [
+        exists(select(literal(1)).select_from(table(name)).where(column(column_name).in_(list(values))))
+        for name in tables
+    ]
+    return bool(db.execute(select(or_(*probes))).scalar())
@@ -0,0 +1,110 @@
+"""Daily attendance close-out for every business.
+
+Run from cron (or any scheduler) shortly after midnight:
+
+    python -m app.jobs.attendance_close_out
+    python -m app.jobs.attendance_close_out --from 2026-10-01 --to 2026-10-05
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import socket
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.repository.business_repository import BusinessRepository
+from app.services.attendance_close_out_service import (
+    AttendanceCloseOutService,
+    CloseOutOutcome,
+    CloseOutResult,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def run_close_out(
+    *,
+    start_date: date,
+    end_date: date,
+    business_ids: Sequence[int] | None = None,
+    workers: int | None = None,
+) -> list[CloseOutResult]:
+    if business_ids is None:
+        db = SessionLocal()
+        try:
+            business_ids = BusinessRepository(db).list_ids()
+        finally:
+            db.close()
+
+    node_id = f"{socket.gethostname()}:{os.getpid()}"
+    jobs = [(business_id, day) for day in _date_range(start_date, end_date) for business_id in business_ids]
+    max_workers = max(1, workers if workers is not None else settings.attendance_close_out_workers)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="close-out") as executor:
+        return list(executor.map(lambda job: _close_out_business(job[0], job[1], node_id=node_id), jobs))
+
+
+def _close_out_business(business_id: int, attendance_date: date, *, node_id: str) -> CloseOutResult:
+    db = SessionLocal()
+    try:
+        return AttendanceCloseOutService(db, node_id=node_id).close_out(
+            business_id=business_id,
+            attendance_date=attendance_date,
+        )
+    finally:
+        db.close()
+
+
+def _date_range(start_date: date, end_date: date) -> Iterator[date]:
+    day = start_date
+    while day <= end_date:
+        yield day
+        day += timedelta(days=1)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Mark absences for employees without attendance.")
+    parser.add_argument("--date", type=date.fromisoformat, help="single day to close out (default: yesterday)")
+    parser.add_argument("--from", dest="start_date", type=date.fromisoformat, help="first day of a backfill")
+    parser.add_argument("--to", dest="end_date", type=date.fromisoformat, help="last day of a backfill")
+    parser.add_argument("--business-id", dest="business_ids", type=int, action="append")
+    parser.add_argument("--workers", type=int, default=settings.attendance_close_out_workers)
+    args = parser.parse_args(argv)
+
+    today = date.today()
+    if args.date is not None and (args.start_date is not None or args.end_date is not None):
+        parser.error("--date cannot be combined with --from/--to")
+    start_date = args.date or args.start_date or today - timedelta(days=1)
+    end_date = args.date or args.end_date or today - timedelta(days=1)
+    if end_date < start_date:
+        parser.error("--to must be on or after --from")
+    if end_date >= today:
+        parser.error("only past days can be closed out")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    results = run_close_out(
+        start_date=start_date,
+        end_date=end_date,
+        business_ids=args.business_ids,
+        workers=args.workers,
+    )
+    for result in results:
+        logger.info(
+            "close-out business=%s date=%s outcome=%s created=%d skipped=%d",
+            result.business_id,
+            result.attendance_date,
+            result.outcome.value,
+            result.created_count,
+            result.skipped_count,
+        )
+    return 1 if any(result.outcome == CloseOutOutcome.FAILED for result in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
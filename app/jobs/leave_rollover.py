@@ -0,0 +1,53 @@
+"""Allocate a leave year's balances for every employee, carrying forward within each cap.
+
+Run it once at the start of each leave year; re-running is safe and only touches
+employees whose balances are still in an earlier year:
+
+    python -m app.jobs.leave_rollover --year 2027
+    python -m app.jobs.leave_rollover --year 2027 --business-id 3 --chunk-size 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from collections.abc import Sequence
+
+from app.core.database import SessionLocal
+from app.services.leave_accrual_service import DEFAULT_ROLLOVER_CHUNK_SIZE, LeaveAccrualService
+
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Allocate and roll over leave balances for a leave year.")
+    parser.add_argument("--year", type=int, required=True, help="leave year to allocate (e.g. 2027)")
+    parser.add_argument("--business-id", type=int)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_ROLLOVER_CHUNK_SIZE, help="users per transaction")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    db = SessionLocal()
+    try:
+        result = LeaveAccrualService(db).roll_over(
+            leave_year=args.year,
+            business_id=args.business_id,
+            chunk_size=args.chunk_size,
+        )
+    finally:
+        db.close()
+    logger.info(
+        "leave rollover year=%d chunks=%d rolled_over=%d created=%d",
+        result.leave_year,
+        result.chunks,
+        result.rolled_over,
+        result.created,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,58 @@
+"""Rebuild the monthly per-user summaries and daily per-branch rollups from the attendance table.
+
+Both are kept up to date by check-in, check-out and auto-absence; run this after a
+deploy, a data fix or a bulk import to recompute any month range:
+
+    python -m app.jobs.rebuild_attendance_summaries --from 2026-01 --to 2026-10
+    python -m app.jobs.rebuild_attendance_summaries --from 2026-10 --business-id 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from collections.abc import Sequence
+from datetime import date, datetime
+
+from app.core.database import SessionLocal
+from app.services.attendance_summary_service import AttendanceSummaryService
+
+
+logger = logging.getLogger(__name__)
+
+
+def _month(value: str) -> date:
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError("expected YYYY-MM") from exc
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild attendance summaries and rollups.")
+    parser.add_argument("--from", dest="start_month", type=_month, required=True, help="first month (YYYY-MM)")
+    parser.add_argument("--to", dest="end_month", type=_month, help="last month (YYYY-MM, default: --from)")
+    parser.add_argument("--business-id", type=int)
+    args = parser.parse_args(argv)
+
+    end_month = args.end_month or args.start_month
+    if end_month < args.start_month:
+        parser.error("--to must be on or after --from")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    db = SessionLocal()
+    try:
+        results = AttendanceSummaryService(db).rebuild(
+            start_month=args.start_month,
+            end_month=end_month,
+            business_id=args.business_id,
+        )
+    finally:
+        db.close()
+    for result in results:
+        logger.info("summary month=%s rows=%d", result.month_start.strftime("%Y-%m"), result.row_count)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,10 +1,15 @@
 from app.models.base import Base
 from app.models.attendance import Attendance, AttendanceStatus
+from app.models.attendance_close_out import AttendanceCloseOut, AttendanceCloseOutStatus
+from app.models.attendance_daily_rollup import AttendanceDailyRollup
+from app.models.attendance_monthly_summary import AttendanceMonthlySummary
 from app.models.business import Business
 from app.models.branch import Branch
 from app.models.designation import Designation
 from app.models.employee_leave_balance import EmployeeLeaveBalance
 from app.models.employment_type import EmploymentType
+from app.models.export_job import ExportJob, ExportJobStatus
+from app.models.leave_ledger_entry import LeaveLedgerEntry, LeaveLedgerEntryType
 from app.models.leave_request import LeaveRequest, LeaveRequestStatus
 from app.models.leave_type import LeaveType
 from app.models.leave_master import LeaveMaster
@@ -24,11 +29,19 @@ __all__ = [
     "Base",
     "Attendance",
     "AttendanceStatus",
+    "AttendanceCloseOut",
+    "AttendanceCloseOutStatus",
+    "AttendanceDailyRollup",
+    "AttendanceMonthlySummary",
     "Branch",
     "Designation",
     "EmployeeLeaveBalance",
     "Business",
     "EmploymentType",
+    "ExportJob",
+    "ExportJobStatus",
+    "LeaveLedgerEntry",
+    "LeaveLedgerEntryType",
     "LeaveRequest",
     "LeaveRequestStatus",
     "LeaveType",
@@ -24,6 +24,7 @@ class Attendance(Base):
     __table_args__ = (
         UniqueConstraint("user_id", "attendance_date", name="uq_attendance_user_date"),
         Index("ix_attendance_user_date", "user_id", "attendance_date"),
+        Index("ix_attendance_date_id", "attendance_date", "id"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from enum import StrEnum
+
+from sqlalchemy import Date, DateTime, Enum, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class AttendanceCloseOutStatus(StrEnum):
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+class AttendanceCloseOut(Base):
+    __tablename__ = "attendance_close_outs"
+    __table_args__ = (
+        UniqueConstraint("business_id", "attendance_date", name="uq_attendance_close_out_business_date"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    business_id: Mapped[int] = mapped_column(ForeignKey("businesses.id", ondelete="CASCADE"), nullable=False, index=True)
+    attendance_date: Mapped[date] = mapped_column(Date, nullable=False)
+    status: Mapped[AttendanceCloseOutStatus] = mapped_column(
+        Enum(AttendanceCloseOutStatus, name="attendance_close_out_status_enum", native_enum=False),
+        nullable=False,
+    )
+    claimed_by: Mapped[str] = mapped_column(String(255), nullable=False)
+    claimed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    skipped_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    error: Mapped[str | None] = mapped_column(String(500), nullable=True)
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Integer, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class AttendanceDailyRollup(Base):
+    """Per business, branch and day attendance counts.
+
+    ``business_key`` and ``branch_key`` mirror the nullable foreign keys with 0 for "none": unique
+    indexes treat NULLs as distinct, so the key columns must be non-null for upserts to find the row.
+    """
+
+    __tablename__ = "attendance_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint("business_key", "branch_key", "attendance_date", name="uq_attendance_daily_rollup_key"),
+        Index("ix_attendance_daily_rollup_business_date", "business_id", "attendance_date", "branch_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    business_id: Mapped[int | None] = mapped_column(ForeignKey("businesses.id", ondelete="CASCADE"), nullable=True)
+    branch_id: Mapped[int | None] = mapped_column(ForeignKey("branches.id", ondelete="CASCADE"), nullable=True)
+    business_key: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    branch_key: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    attendance_date: Mapped[date] = mapped_column(Date, nullable=False)
+    present_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    absent_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    half_day_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    overtime_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    leave_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    holiday_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    checked_out_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    total_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Integer, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class AttendanceMonthlySummary(Base):
+    __tablename__ = "attendance_monthly_summaries"
+    __table_args__ = (
+        UniqueConstraint("user_id", "month_start", name="uq_attendance_monthly_summary_user_month"),
+        Index("ix_attendance_monthly_summary_business_month_user", "business_id", "month_start", "user_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    business_id: Mapped[int | None] = mapped_column(ForeignKey("businesses.id", ondelete="CASCADE"), nullable=True)
+    month_start: Mapped[date] = mapped_column(Date, nullable=False)
+    present_days: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    absent_days: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    half_days: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    overtime_days: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    leave_days: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    holiday_days: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    total_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
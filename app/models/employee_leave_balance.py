@@ -18,6 +18,7 @@ class EmployeeLeaveBalance(Base):
     allocated_days: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     used_days: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     remaining_days: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    leave_year: Mapped[int] = mapped_column(Integer, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from datetime import datetime
+from enum import StrEnum
+
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ExportJobStatus(StrEnum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+class ExportJob(Base):
+    __tablename__ = "export_jobs"
+    __table_args__ = (Index("ix_export_jobs_cache_key_watermark", "cache_key", "watermark"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    public_id: Mapped[str] = mapped_column(String(32), nullable=False, unique=True)
+    requested_by: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    export_format: Mapped[str] = mapped_column(String(10), nullable=False)
+    filters: Mapped[str] = mapped_column(Text, nullable=False)
+    cache_key: Mapped[str] = mapped_column(String(64), nullable=False)
+    watermark: Mapped[str] = mapped_column(String(64), nullable=False)
+    status: Mapped[ExportJobStatus] = mapped_column(
+        Enum(ExportJobStatus, name="export_job_status_enum", native_enum=False),
+        nullable=False,
+        default=ExportJobStatus.PENDING,
+    )
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    total_rows: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    file_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    filename: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    error: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
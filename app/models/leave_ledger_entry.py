@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from datetime import datetime
+from enum import StrEnum
+
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class LeaveLedgerEntryType(StrEnum):
+    OPENING = "OPENING"
+    DEBIT = "DEBIT"
+    ACCRUAL = "ACCRUAL"
+    EXPIRY = "EXPIRY"
+
+
+class LeaveLedgerEntry(Base):
+    """Append-only record of every change to an employee leave balance.
+
+    ``days`` is signed: allocations are positive and approved leave is negative, so the sum of a
+    user's entries for a leave type equals the remaining days on their balance row.
+    """
+
+    __tablename__ = "leave_ledger_entries"
+    __table_args__ = (Index("ix_leave_ledger_entries_user_leave_type", "user_id", "leave_type_id", "id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    leave_type_id: Mapped[int] = mapped_column(ForeignKey("leave_types.id"), nullable=False)
+    entry_type: Mapped[LeaveLedgerEntryType] = mapped_column(
+        Enum(LeaveLedgerEntryType, name="leave_ledger_entry_type_enum", native_enum=False, length=20),
+        nullable=False,
+    )
+    days: Mapped[int] = mapped_column(Integer, nullable=False)
+    leave_request_id: Mapped[int | None] = mapped_column(
+        ForeignKey("leave_requests.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+    created_by: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    note: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
@@ -28,6 +28,7 @@ class LeaveMaster(Base):
         index=True,
     )
     total_leave_days: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    carry_forward_max_days: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     proof_required: Mapped[bool] = mapped_column(
         Boolean,
         nullable=False,
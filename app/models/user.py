@@ -2,7 +2,7 @@ from datetime import datetime
 
 from decimal import Decimal
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, Numeric, String, Text, func
+from sqlalchemy import DateTime, Enum, ForeignKey, Integer, LargeBinary, Numeric, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -45,7 +45,14 @@ class User(Base):
     salary: Mapped[Decimal | None] = mapped_column(Numeric(12, 2), nullable=True)
     leave_balance: Mapped[int | None] = mapped_column(Integer, nullable=True)
     status: Mapped[str | None] = mapped_column(String(50), nullable=True)
-    face_encoding: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Legacy JSON encoding, only read as a fallback until every row has a binary face_embedding.
+    face_encoding: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True, deferred_group="face")
+    face_embedding: Mapped[bytes | None] = mapped_column(
+        LargeBinary(length=513),
+        nullable=True,
+        deferred=True,
+        deferred_group="face",
+    )
     current_address: Mapped[str | None] = mapped_column(String(500), nullable=True)
     home_address: Mapped[str | None] = mapped_column(String(500), nullable=True)
     pan: Mapped[str | None] = mapped_column(String(20), nullable=True, unique=True)
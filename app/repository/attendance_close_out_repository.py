@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from sqlalchemy import and_, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.attendance_close_out import AttendanceCloseOut, AttendanceCloseOutStatus
+
+
+class AttendanceCloseOutRepository:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def get(self, business_id: int, attendance_date: date) -> AttendanceCloseOut | None:
+        return (
+            self.db.query(AttendanceCloseOut)
+            .filter(
+                AttendanceCloseOut.business_id == business_id,
+                AttendanceCloseOut.attendance_date == attendance_date,
+            )
+            .first()
+        )
+
+    def claim(
+        self,
+        *,
+        business_id: int,
+        attendance_date: date,
+        claimed_by: str,
+        now: datetime,
+        stale_before: datetime,
+    ) -> bool:
+        try:
+            with self.db.begin_nested():
+                self.db.add(
+                    AttendanceCloseOut(
+                        business_id=business_id,
+                        attendance_date=attendance_date,
+                        status=AttendanceCloseOutStatus.RUNNING,
+                        claimed_by=claimed_by,
+                        claimed_at=now,
+                    )
+                )
+            return True
+        except IntegrityError:
+            pass
+
+        # The row already exists: take it over only if the previous run failed or its node died.
+        result = self.db.execute(
+            update(AttendanceCloseOut)
+            .where(
+                AttendanceCloseOut.business_id == business_id,
+                AttendanceCloseOut.attendance_date == attendance_date,
+                or_(
+                    AttendanceCloseOut.status == AttendanceCloseOutStatus.FAILED,
+                    and_(
+                        AttendanceCloseOut.status == AttendanceCloseOutStatus.RUNNING,
+                        AttendanceCloseOut.claimed_at < stale_before,
+                    ),
+                ),
+            )
+            .values(
+                status=AttendanceCloseOutStatus.RUNNING,
+                claimed_by=claimed_by,
+                claimed_at=now,
+                finished_at=None,
+                error=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    def finish(
+        self,
+        *,
+        business_id: int,
+        attendance_date: date,
+        claimed_by: str,
+        status: AttendanceCloseOutStatus,
+        now: datetime,
+        created_count: int = 0,
+        skipped_count: int = 0,
+        error: str | None = None,
+    ) -> None:
+        self.db.execute(
+            update(AttendanceCloseOut)
+            .where(
+                AttendanceCloseOut.business_id == business_id,
+                AttendanceCloseOut.attendance_date == attendance_date,
+                AttendanceCloseOut.claimed_by == claimed_by,
+            )
+            .values(
+                status=status,
+                finished_at=now,
+                created_count=created_count,
+                skipped_count=skipped_count,
+                error=error[:500] if error else None,
+            )
+            .execution_options(synchronize_session=False)
+        )
@@ -1,14 +1,41 @@
 from __future__ import annotations
 
-from datetime import date
+from collections.abc import Collection, Iterator
+from datetime import date, datetime
 
-from sqlalchemy import or_
-from sqlalchemy.orm import Session
+from sqlalchemy import ColumnElement, Select, and_, case, exists, false, func, insert, literal, or_, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Query, Session
 
-from app.models.attendance import Attendance
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.leave_request import LeaveRequest, LeaveRequestStatus
+from app.models.role import RoleEnum
 from app.models.user import User
 
 
+EXPORT_COLUMNS = (
+    Attendance.id,
+    Attendance.user_id,
+    User.username,
+    User.name,
+    User.first_name,
+    User.middle_name,
+    User.last_name,
+    User.email,
+    User.business_id,
+    Attendance.branch_id,
+    Attendance.attendance_date,
+    Attendance.check_in,
+    Attendance.check_out,
+    Attendance.total_minutes,
+    Attendance.status,
+    Attendance.ip_address,
+    Attendance.device_info,
+    Attendance.created_at,
+    Attendance.updated_at,
+)
+
+
 class AttendanceRepository:
     def __init__(self, db: Session) -> None:
         self.db = db
@@ -31,15 +58,110 @@ class AttendanceRepository:
             .first()
         )
 
-    def list_existing_user_ids_for_date(self, user_ids: list[int], attendance_date: date) -> set[int]:
-        if not user_ids:
-            return set()
-        rows = (
-            self.db.query(Attendance.user_id)
-            .filter(Attendance.attendance_date == attendance_date, Attendance.user_id.in_(user_ids))
-            .all()
+    def close_out_counts(
+        self,
+        *,
+        business_id: int | None,
+        attendance_date: date,
+        excluded_branch_ids: Collection[int] = (),
+        exclude_unassigned: bool = False,
+    ) -> Row:
+        """Employees in scope and, in order of precedence, those skipped because they already have
+        attendance, are on approved leave, or are on a non-working day of their branch."""
+        has_attendance, on_approved_leave, non_working = self._close_out_conditions(
+            attendance_date=attendance_date,
+            excluded_branch_ids=excluded_branch_ids,
+            exclude_unassigned=exclude_unassigned,
+        )
+        query = select(
+            func.count(User.id).label("employee_count"),
+            func.coalesce(func.sum(case((has_attendance, 1), else_=0)), 0).label("existing_count"),
+            func.coalesce(func.sum(case((and_(~has_attendance, on_approved_leave), 1), else_=0)), 0).label(
+                "on_leave_count"
+            ),
+            func.coalesce(
+                func.sum(case((and_(~has_attendance, ~on_approved_leave, non_working), 1), else_=0)),
+                0,
+            ).label("non_working_count"),
+        ).where(User.role == RoleEnum.BUSINESS_EMPLOYEE)
+        if business_id is not None:
+            query = query.where(User.business_id == business_id)
+        return self.db.execute(query).one()
+
+    def list_employee_branch_ids(self, business_id: int | None) -> list[int | None]:
+        query = self.db.query(User.branch_id).filter(User.role == RoleEnum.BUSINESS_EMPLOYEE).distinct()
+        if business_id is not None:
+            query = query.filter(User.business_id == business_id)
+        return [row[0] for row in query.all()]
+
+    def missing_employees_query(
+        self,
+        *,
+        business_id: int | None,
+        attendance_date: date,
+        excluded_branch_ids: Collection[int] = (),
+        exclude_unassigned: bool = False,
+    ) -> Select:
+        """Employees with neither an attendance row nor approved leave on ``attendance_date``.
+
+        Employees of ``excluded_branch_ids``, and unassigned ones when ``exclude_unassigned`` is set,
+        are left out as well: ``attendance_date`` is not a working day for them.
+        """
+        has_attendance, on_approved_leave, non_working = self._close_out_conditions(
+            attendance_date=attendance_date,
+            excluded_branch_ids=excluded_branch_ids,
+            exclude_unassigned=exclude_unassigned,
+        )
+        missing_employees = select(User.id, User.branch_id).where(
+            User.role == RoleEnum.BUSINESS_EMPLOYEE,
+            ~has_attendance,
+            ~on_approved_leave,
+            ~non_working,
+        )
+        if business_id is not None:
+            missing_employees = missing_employees.where(User.business_id == business_id)
+        return missing_employees
+
+    @staticmethod
+    def _close_out_conditions(
+        *,
+        attendance_date: date,
+        excluded_branch_ids: Collection[int],
+        exclude_unassigned: bool,
+    ) -> tuple[ColumnElement[bool], ColumnElement[bool], ColumnElement[bool]]:
+        has_attendance = exists().where(
+            Attendance.user_id == User.id,
+            Attendance.attendance_date == attendance_date,
+        )
+        on_approved_leave = exists().where(
+            LeaveRequest.user_id == User.id,
+            LeaveRequest.status == LeaveRequestStatus.APPROVED,
+            LeaveRequest.start_date <= attendance_date,
+            LeaveRequest.end_date >= attendance_date,
+        )
+        non_working_conditions = []
+        if excluded_branch_ids:
+            # Guarded by IS NOT NULL so the negation still keeps unassigned users (NOT NULL IN ... is NULL).
+            non_working_conditions.append(
+                and_(User.branch_id.is_not(None), User.branch_id.in_(list(excluded_branch_ids)))
+            )
+        if exclude_unassigned:
+            non_working_conditions.append(User.branch_id.is_(None))
+        non_working = or_(*non_working_conditions) if non_working_conditions else false()
+        return has_attendance, on_approved_leave, non_working
+
+    def insert_absences(self, missing_employees: Select, *, attendance_date: date) -> int:
+        result = self.db.execute(
+            insert(Attendance).from_select(
+                ["user_id", "branch_id", "attendance_date", "total_minutes", "status"],
+                missing_employees.add_columns(
+                    literal(attendance_date, Attendance.attendance_date.type),
+                    literal(0, Attendance.total_minutes.type),
+                    literal(AttendanceStatus.ABSENT, Attendance.status.type),
+                ),
+            )
         )
-        return {int(item[0]) for item in rows}
+        return int(result.rowcount or 0)
 
     def list_by_user(
         self,
@@ -69,30 +191,16 @@ class AttendanceRepository:
         size: int,
     ) -> tuple[list[Attendance], int]:
         query = self.db.query(Attendance).join(User, Attendance.user_id == User.id)
-
-        if business_id is not None:
-            query = query.filter(User.business_id == business_id)
-        if user_id is not None:
-            query = query.filter(Attendance.user_id == user_id)
-        if branch_id is not None:
-            query = query.filter(Attendance.branch_id == branch_id)
-        if status is not None:
-            query = query.filter(Attendance.status == status)
-        if start_date is not None:
-            query = query.filter(Attendance.attendance_date >= start_date)
-        if end_date is not None:
-            query = query.filter(Attendance.attendance_date <= end_date)
-        if search:
-            token = f"%{search.strip()}%"
-            query = query.filter(
-                or_(
-                    User.name.ilike(token),
-                    User.email.ilike(token),
-                    User.first_name.ilike(token),
-                    User.last_name.ilike(token),
-                    User.username.ilike(token),
-                )
-            )
+        query = self._apply_filters(
+            query,
+            business_id=business_id,
+            user_id=user_id,
+            branch_id=branch_id,
+            status=status,
+            start_date=start_date,
+            end_date=end_date,
+            search=search,
+        )
 
         total = query.count()
         items = (
@@ -103,7 +211,45 @@ class AttendanceRepository:
         )
         return items, total
 
-    def list_for_export(
+    def list_keyset(
+        self,
+        *,
+        business_id: int | None,
+        user_id: int | None,
+        branch_id: int | None,
+        status: str | None,
+        start_date: date | None,
+        end_date: date | None,
+        search: str | None,
+        after: tuple[date, int] | None,
+        size: int,
+        with_total: bool,
+    ) -> tuple[list[Attendance], bool, int | None]:
+        query = self.db.query(Attendance).join(User, Attendance.user_id == User.id)
+        query = self._apply_filters(
+            query,
+            business_id=business_id,
+            user_id=user_id,
+            branch_id=branch_id,
+            status=status,
+            start_date=start_date,
+            end_date=end_date,
+            search=search,
+        )
+        total = query.count() if with_total else None
+
+        if after is not None:
+            after_date, after_id = after
+            query = query.filter(
+                or_(
+                    Attendance.attendance_date < after_date,
+                    and_(Attendance.attendance_date == after_date, Attendance.id < after_id),
+                )
+            )
+        rows = query.order_by(Attendance.attendance_date.desc(), Attendance.id.desc()).limit(size + 1).all()
+        return rows[:size], len(rows) > size, total
+
+    def export_watermark(
         self,
         *,
         business_id: int | None,
@@ -113,9 +259,64 @@ class AttendanceRepository:
         start_date: date | None,
         end_date: date | None,
         search: str | None,
-    ) -> list[tuple[Attendance, User]]:
-        query = self.db.query(Attendance, User).join(User, Attendance.user_id == User.id)
+    ) -> tuple[int, datetime | None]:
+        """Row count and latest ``updated_at`` of the export; any insert, update or delete moves it."""
+        query = self.db.query(func.count(Attendance.id), func.max(Attendance.updated_at)).join(
+            User, Attendance.user_id == User.id
+        )
+        query = self._apply_filters(
+            query,
+            business_id=business_id,
+            user_id=user_id,
+            branch_id=branch_id,
+            status=status,
+            start_date=start_date,
+            end_date=end_date,
+            search=search,
+        )
+        row_count, last_updated_at = query.one()
+        return int(row_count or 0), last_updated_at
 
+    def iter_export_rows(
+        self,
+        *,
+        business_id: int | None,
+        user_id: int | None,
+        branch_id: int | None,
+        status: str | None,
+        start_date: date | None,
+        end_date: date | None,
+        search: str | None,
+        chunk_size: int,
+    ) -> Iterator[Row]:
+        query = self.db.query(*EXPORT_COLUMNS).join(User, Attendance.user_id == User.id)
+        query = self._apply_filters(
+            query,
+            business_id=business_id,
+            user_id=user_id,
+            branch_id=branch_id,
+            status=status,
+            start_date=start_date,
+            end_date=end_date,
+            search=search,
+        )
+        # yield_per streams from a server-side cursor instead of buffering the whole result set.
+        return iter(
+            query.order_by(Attendance.attendance_date.desc(), Attendance.id.desc()).yield_per(chunk_size)
+        )
+
+    @staticmethod
+    def _apply_filters(
+        query: Query,
+        *,
+        business_id: int | None,
+        user_id: int | None,
+        branch_id: int | None,
+        status: str | None,
+        start_date: date | None,
+        end_date: date | None,
+        search: str | None,
+    ) -> Query:
         if business_id is not None:
             query = query.filter(User.business_id == business_id)
         if user_id is not None:
@@ -139,5 +340,4 @@ class AttendanceRepository:
                     User.username.ilike(token),
                 )
             )
-
-        return query.order_by(Attendance.attendance_date.desc(), Attendance.id.desc()).all()
+        return query
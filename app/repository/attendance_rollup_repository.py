@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import date
+
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.attendance_daily_rollup import AttendanceDailyRollup
+from app.models.user import User
+
+
+STATUS_COLUMNS: dict[AttendanceStatus, str] = {
+    AttendanceStatus.PRESENT: "present_count",
+    AttendanceStatus.ABSENT: "absent_count",
+    AttendanceStatus.HALF_DAY: "half_day_count",
+    AttendanceStatus.OVERTIME: "overtime_count",
+    AttendanceStatus.LEAVE: "leave_count",
+    AttendanceStatus.HOLIDAY: "holiday_count",
+}
+
+
+class AttendanceRollupRepository:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def apply_delta(
+        self,
+        *,
+        business_id: int | None,
+        branch_id: int | None,
+        attendance_date: date,
+        status_deltas: Mapping[AttendanceStatus, int],
+        minutes_delta: int = 0,
+        checked_out_delta: int = 0,
+    ) -> None:
+        values = {}
+        for status, delta in status_deltas.items():
+            if delta:
+                values[STATUS_COLUMNS[status]] = getattr(AttendanceDailyRollup, STATUS_COLUMNS[status]) + delta
+        if minutes_delta:
+            values["total_minutes"] = AttendanceDailyRollup.total_minutes + minutes_delta
+        if checked_out_delta:
+            values["checked_out_count"] = AttendanceDailyRollup.checked_out_count + checked_out_delta
+        if not values:
+            return
+        key = (business_id, branch_id, attendance_date)
+        if self._update_existing(key, values):
+            return
+        try:
+            with self.db.begin_nested():
+                self.db.execute(
+                    insert(AttendanceDailyRollup).values(
+                        business_id=business_id,
+                        branch_id=branch_id,
+                        business_key=business_id or 0,
+                        branch_key=branch_id or 0,
+                        attendance_date=attendance_date,
+                        **{STATUS_COLUMNS[status]: delta for status, delta in status_deltas.items()},
+                        total_minutes=minutes_delta,
+                        checked_out_count=checked_out_delta,
+                    )
+                )
+        except IntegrityError:
+            self._update_existing(key, values)
+
+    def rebuild_range(self, *, start_date: date, end_date: date, business_id: int | None = None) -> int:
+        """Replace the rollups of ``start_date``..``end_date`` with a fresh aggregate of attendance."""
+        stale = delete(AttendanceDailyRollup).where(
+            AttendanceDailyRollup.attendance_date >= start_date,
+            AttendanceDailyRollup.attendance_date <= end_date,
+        )
+        if business_id is not None:
+            stale = stale.where(AttendanceDailyRollup.business_id == business_id)
+        self.db.execute(stale.execution_options(synchronize_session=False))
+
+        counts = [
+            func.coalesce(func.sum(case((Attendance.status == status, 1), else_=0)), 0)
+            for status in STATUS_COLUMNS
+        ]
+        aggregate = (
+            select(
+                User.business_id,
+                Attendance.branch_id,
+                func.coalesce(User.business_id, 0),
+                func.coalesce(Attendance.branch_id, 0),
+                Attendance.attendance_date,
+                *counts,
+                func.count(Attendance.check_out),
+                func.coalesce(func.sum(Attendance.total_minutes), 0),
+            )
+            .join(User, Attendance.user_id == User.id)
+            .where(Attendance.attendance_date >= start_date, Attendance.attendance_date <= end_date)
+            .group_by(User.business_id, Attendance.branch_id, Attendance.attendance_date)
+        )
+        if business_id is not None:
+            aggregate = aggregate.where(User.business_id == business_id)
+        result = self.db.execute(
+            insert(AttendanceDailyRollup).from_select(
+                [
+                    "business_id",
+                    "branch_id",
+                    "business_key",
+                    "branch_key",
+                    "attendance_date",
+                    *STATUS_COLUMNS.values(),
+                    "checked_out_count",
+                    "total_minutes",
+                ],
+                aggregate,
+            )
+        )
+        return int(result.rowcount or 0)
+
+    def list_range(
+        self,
+        *,
+        business_id: int | None,
+        branch_id: int | None,
+        start_date: date,
+        end_date: date,
+    ) -> list[AttendanceDailyRollup]:
+        query = self.db.query(AttendanceDailyRollup).filter(
+            AttendanceDailyRollup.attendance_date >= start_date,
+            AttendanceDailyRollup.attendance_date <= end_date,
+        )
+        if business_id is not None:
+            query = query.filter(AttendanceDailyRollup.business_id == business_id)
+        if branch_id is not None:
+            query = query.filter(AttendanceDailyRollup.branch_id == branch_id)
+        return query.order_by(
+            AttendanceDailyRollup.attendance_date.asc(),
+            AttendanceDailyRollup.business_id.asc(),
+            AttendanceDailyRollup.branch_id.asc(),
+        ).all()
+
+    def _update_existing(self, key: tuple[int | None, int | None, date], values: dict) -> bool:
+        business_id, branch_id, attendance_date = key
+        # Unassigned users roll up into the row keyed 0, matched through the non-null key columns.
+        result = self.db.execute(
+            update(AttendanceDailyRollup)
+            .where(
+                AttendanceDailyRollup.business_key == (business_id or 0),
+                AttendanceDailyRollup.branch_key == (branch_id or 0),
+                AttendanceDailyRollup.attendance_date == attendance_date,
+            )
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount >= 1
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import date
+
+from sqlalchemy import Select, case, delete, exists, func, insert, literal, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.attendance_monthly_summary import AttendanceMonthlySummary
+from app.models.user import User
+
+
+STATUS_COLUMNS: dict[AttendanceStatus, str] = {
+    AttendanceStatus.PRESENT: "present_days",
+    AttendanceStatus.ABSENT: "absent_days",
+    AttendanceStatus.HALF_DAY: "half_days",
+    AttendanceStatus.OVERTIME: "overtime_days",
+    AttendanceStatus.LEAVE: "leave_days",
+    AttendanceStatus.HOLIDAY: "holiday_days",
+}
+
+
+class AttendanceSummaryRepository:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def apply_delta(
+        self,
+        *,
+        user_id: int,
+        business_id: int | None,
+        month_start: date,
+        status_deltas: Mapping[AttendanceStatus, int],
+        minutes_delta: int = 0,
+    ) -> None:
+        values = self._delta_values(status_deltas, minutes_delta)
+        if not values:
+            return
+        if self._update_existing(user_id, month_start, values):
+            return
+        # First write for this user and month; another request may create the row concurrently.
+        try:
+            with self.db.begin_nested():
+                self.db.execute(
+                    insert(AttendanceMonthlySummary).values(
+                        user_id=user_id,
+                        business_id=business_id,
+                        month_start=month_start,
+                        **{STATUS_COLUMNS[status]: delta for status, delta in status_deltas.items()},
+                        total_minutes=minutes_delta,
+                    )
+                )
+        except IntegrityError:
+            self._update_existing(user_id, month_start, values)
+
+    def add_absences(self, user_ids: Select, *, month_start: date) -> None:
+        """Count one absence for each user selected by ``user_ids`` in a single pair of statements."""
+        has_summary = exists().where(
+            AttendanceMonthlySummary.user_id == User.id,
+            AttendanceMonthlySummary.month_start == month_start,
+        )
+        self.db.execute(
+            insert(AttendanceMonthlySummary).from_select(
+                ["user_id", "business_id", "month_start"],
+                select(User.id, User.business_id, literal(month_start, AttendanceMonthlySummary.month_start.type))
+                .where(User.id.in_(user_ids), ~has_summary),
+            )
+        )
+        self.db.execute(
+            update(AttendanceMonthlySummary)
+            .where(
+                AttendanceMonthlySummary.month_start == month_start,
+                AttendanceMonthlySummary.user_id.in_(user_ids),
+            )
+            .values(absent_days=AttendanceMonthlySummary.absent_days + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    def rebuild_month(self, *, month_start: date, month_end: date, business_id: int | None = None) -> int:
+        """Replace the summaries of one month with a fresh aggregate of its attendance rows."""
+        stale = delete(AttendanceMonthlySummary).where(AttendanceMonthlySummary.month_start == month_start)
+        if business_id is not None:
+            stale = stale.where(AttendanceMonthlySummary.business_id == business_id)
+        self.db.execute(stale.execution_options(synchronize_session=False))
+
+        counts = [
+            func.coalesce(func.sum(case((Attendance.status == status, 1), else_=0)), 0)
+            for status in STATUS_COLUMNS
+        ]
+        aggregate = (
+            select(
+                Attendance.user_id,
+                User.business_id,
+                literal(month_start, AttendanceMonthlySummary.month_start.type),
+                *counts,
+                func.coalesce(func.sum(Attendance.total_minutes), 0),
+            )
+            .join(User, Attendance.user_id == User.id)
+            .where(Attendance.attendance_date >= month_start, Attendance.attendance_date <= month_end)
+            .group_by(Attendance.user_id, User.business_id)
+        )
+        if business_id is not None:
+            aggregate = aggregate.where(User.business_id == business_id)
+        result = self.db.execute(
+            insert(AttendanceMonthlySummary).from_select(
+                ["user_id", "business_id", "month_start", *STATUS_COLUMNS.values(), "total_minutes"],
+                aggregate,
+            )
+        )
+        return int(result.rowcount or 0)
+
+    def list_for_month(
+        self,
+        *,
+        month_start: date,
+        business_id: int | None,
+        user_id: int | None,
+        branch_id: int | None,
+        after_user_id: int | None,
+        size: int,
+    ) -> tuple[list[AttendanceMonthlySummary], bool]:
+        query = self.db.query(AttendanceMonthlySummary).filter(AttendanceMonthlySummary.month_start == month_start)
+        if business_id is not None:
+            query = query.filter(AttendanceMonthlySummary.business_id == business_id)
+        if user_id is not None:
+            query = query.filter(AttendanceMonthlySummary.user_id == user_id)
+        if branch_id is not None:
+            query = query.join(User, AttendanceMonthlySummary.user_id == User.id).filter(User.branch_id == branch_id)
+        if after_user_id is not None:
+            query = query.filter(AttendanceMonthlySummary.user_id > after_user_id)
+        rows = query.order_by(AttendanceMonthlySummary.user_id.asc()).limit(size + 1).all()
+        return rows[:size], len(rows) > size
+
+    def _update_existing(self, user_id: int, month_start: date, values: dict) -> bool:
+        result = self.db.execute(
+            update(AttendanceMonthlySummary)
+            .where(
+                AttendanceMonthlySummary.user_id == user_id,
+                AttendanceMonthlySummary.month_start == month_start,
+            )
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    @staticmethod
+    def _delta_values(status_deltas: Mapping[AttendanceStatus, int], minutes_delta: int) -> dict:
+        values = {}
+        for status, delta in status_deltas.items():
+            if delta:
+                column = getattr(AttendanceMonthlySummary, STATUS_COLUMNS[status])
+                values[STATUS_COLUMNS[status]] = column + delta
+        if minutes_delta:
+            values["total_minutes"] = AttendanceMonthlySummary.total_minutes + minutes_delta
+        return values
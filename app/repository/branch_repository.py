@@ -1,3 +1,4 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models.branch import Branch
@@ -37,6 +38,11 @@ class BranchRepository:
     def get_by_id(self, branch_id: int) -> Branch | None:
         return self.db.query(Branch).filter(Branch.id == branch_id).first()
 
+    def existing_ids(self, branch_ids: list[int]) -> set[int]:
+        if not branch_ids:
+            return set()
+        return set(self.db.scalars(select(Branch.id).where(Branch.id.in_(branch_ids))))
+
     def list_all(self) -> list[Branch]:
         return self.db.query(Branch).order_by(Branch.id.asc()).all()
 
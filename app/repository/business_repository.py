@@ -16,3 +16,6 @@ class BusinessRepository:
 
     def get_by_id(self, business_id: int) -> Business | None:
         return self.db.query(Business).filter(Business.id == business_id).first()
+
+    def list_ids(self) -> list[int]:
+        return [row[0] for row in self.db.query(Business.id).order_by(Business.id.asc()).all()]
@@ -1,6 +1,23 @@
+from dataclasses import dataclass
+
+from sqlalchemy import Row, and_, case, exists, func, insert, literal, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.models.employee_leave_balance import EmployeeLeaveBalance
+from app.models.leave_ledger_entry import LeaveLedgerEntry, LeaveLedgerEntryType
+from app.models.leave_master import LeaveMaster
+from app.models.leave_type import LeaveType
+from app.models.user import User
+
+
+LEDGER_COLUMNS = ["user_id", "leave_type_id", "entry_type", "days", "note"]
+
+
+@dataclass(frozen=True)
+class RolloverCounts:
+    rolled_over: int
+    created: int
 
 
 class EmployeeLeaveBalanceRepository:
@@ -17,28 +34,312 @@ class EmployeeLeaveBalanceRepository:
             .first()
         )
 
-    def create(
+    def list_for_pairs(self, pairs: set[tuple[int, int]]) -> dict[tuple[int, int], EmployeeLeaveBalance]:
+        if not pairs:
+            return {}
+        user_ids = {user_id for user_id, _ in pairs}
+        leave_type_ids = {leave_type_id for _, leave_type_id in pairs}
+        items = (
+            self.db.query(EmployeeLeaveBalance)
+            .filter(
+                EmployeeLeaveBalance.user_id.in_(user_ids),
+                EmployeeLeaveBalance.leave_type_id.in_(leave_type_ids),
+            )
+            .all()
+        )
+        return {
+            (item.user_id, item.leave_type_id): item
+            for item in items
+            if (item.user_id, item.leave_type_id) in pairs
+        }
+
+    def create_if_missing(
         self,
         *,
         user_id: int,
         leave_type_id: int,
         allocated_days: int,
-        used_days: int,
-        remaining_days: int,
-    ) -> EmployeeLeaveBalance:
-        item = EmployeeLeaveBalance(
-            user_id=user_id,
-            leave_type_id=leave_type_id,
-            allocated_days=allocated_days,
-            used_days=used_days,
-            remaining_days=remaining_days,
-        )
-        self.db.add(item)
-        self.db.flush()
-        self.db.refresh(item)
-        return item
-
-    def update(self, item: EmployeeLeaveBalance) -> EmployeeLeaveBalance:
-        self.db.flush()
-        self.db.refresh(item)
-        return item
+        leave_year: int,
+    ) -> tuple[EmployeeLeaveBalance, bool]:
+        """Return the balance row and whether this call created it; concurrent creators share one row."""
+        try:
+            with self.db.begin_nested():
+                item = EmployeeLeaveBalance(
+                    user_id=user_id,
+                    leave_type_id=leave_type_id,
+                    allocated_days=allocated_days,
+                    used_days=0,
+                    remaining_days=allocated_days,
+                    leave_year=leave_year,
+                )
+                self.db.add(item)
+                self.db.flush()
+            return item, True
+        except IntegrityError:
+            existing = self.get_by_user_and_leave_type(user_id=user_id, leave_type_id=leave_type_id)
+            if existing is None:
+                raise
+            return existing, False
+
+    def deduct(self, *, user_id: int, leave_type_id: int, days: int) -> bool:
+        """Move ``days`` from remaining to used only if enough remain; the row count is the verdict."""
+        result = self.db.execute(
+            update(EmployeeLeaveBalance)
+            .where(
+                EmployeeLeaveBalance.user_id == user_id,
+                EmployeeLeaveBalance.leave_type_id == leave_type_id,
+                EmployeeLeaveBalance.remaining_days >= days,
+            )
+            .values(
+                used_days=EmployeeLeaveBalance.used_days + days,
+                remaining_days=EmployeeLeaveBalance.remaining_days - days,
+                updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    def next_rollover_chunk(
+        self,
+        *,
+        after_user_id: int,
+        limit: int,
+        business_id: int | None = None,
+    ) -> tuple[int, int] | None:
+        """First and last id of the next ``limit`` users with an employment type, keyset on id."""
+        query = (
+            select(User.id)
+            .where(User.id > after_user_id, User.employment_type_id.is_not(None))
+            .order_by(User.id.asc())
+            .limit(limit)
+        )
+        if business_id is not None:
+            query = query.where(User.business_id == business_id)
+        user_ids = list(self.db.scalars(query))
+        if not user_ids:
+            return None
+        return user_ids[0], user_ids[-1]
+
+    def roll_over_chunk(
+        self,
+        *,
+        first_user_id: int,
+        last_user_id: int,
+        leave_year: int,
+        business_id: int | None = None,
+    ) -> RolloverCounts:
+        """Allocate ``leave_year`` for the users in ``first_user_id``..``last_user_id``, set-based.
+
+        Balances of an earlier year restart at the leave master's days plus what remained, capped
+        at ``carry_forward_max_days``; missing balances are created. Balances already in
+        ``leave_year`` are left alone, so a chunk can be re-run. The ledger is written from the
+        same rows before they change, so entries keep summing to ``remaining_days``.
+        """
+        in_chunk = [
+            User.id >= first_user_id,
+            User.id <= last_user_id,
+            User.employment_type_id.is_not(None),
+        ]
+        if business_id is not None:
+            in_chunk.append(User.business_id == business_id)
+        balance = EmployeeLeaveBalance
+        # Concurrent approvals wait here instead of changing a balance between the ledger and the update.
+        self.db.execute(
+            select(balance.id)
+            .where(balance.user_id >= first_user_id, balance.user_id <= last_user_id)
+            .with_for_update()
+        ).all()
+
+        governing = and_(
+            User.id == balance.user_id,
+            LeaveMaster.employment_type_id == User.employment_type_id,
+            LeaveMaster.leave_type_id == balance.leave_type_id,
+            *in_chunk,
+        )
+        stale = balance.leave_year < leave_year
+        carried = case(
+            (balance.remaining_days <= 0, 0),
+            (balance.remaining_days > LeaveMaster.carry_forward_max_days, LeaveMaster.carry_forward_max_days),
+            else_=balance.remaining_days,
+        )
+        self._append_ledger(
+            select(
+                balance.user_id,
+                balance.leave_type_id,
+                literal(LeaveLedgerEntryType.EXPIRY.value),
+                carried - balance.remaining_days,
+                literal(f"Expired at {leave_year} rollover"),
+            ).where(governing, stale, balance.remaining_days > carried)
+        )
+        self._append_ledger(
+            select(
+                balance.user_id,
+                balance.leave_type_id,
+                literal(LeaveLedgerEntryType.ACCRUAL.value),
+                LeaveMaster.total_leave_days,
+                literal(f"Leave year {leave_year} allocation"),
+            ).where(governing, stale, LeaveMaster.total_leave_days > 0)
+        )
+
+        # Correlated per-row lookups keep this a single-table UPDATE, whose SET clauses read the
+        # pre-update remaining_days on every backend (allocated_days is assigned first).
+        def master_value(column):
+            return (
+                select(column)
+                .where(governing)
+                .correlate(balance)
+                .scalar_subquery()
+            )
+
+        total = master_value(LeaveMaster.total_leave_days)
+        cap = master_value(LeaveMaster.carry_forward_max_days)
+        new_remaining = total + case(
+            (balance.remaining_days <= 0, 0),
+            (balance.remaining_days > cap, cap),
+            else_=balance.remaining_days,
+        )
+        rolled = self.db.execute(
+            update(balance)
+            .where(
+                balance.user_id >= first_user_id,
+                balance.user_id <= last_user_id,
+                stale,
+                exists(select(LeaveMaster.id).where(governing).correlate(balance)),
+            )
+            .ordered_values(
+                (balance.allocated_days, new_remaining),
+                (balance.used_days, 0),
+                (balance.remaining_days, new_remaining),
+                (balance.leave_year, leave_year),
+                (balance.updated_at, func.now()),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        created = self._insert_missing(
+            in_chunk,
+            leave_year=leave_year,
+            entry_type=LeaveLedgerEntryType.ACCRUAL,
+            note=f"Leave year {leave_year} allocation",
+        )
+        return RolloverCounts(rolled_over=int(rolled.rowcount or 0), created=created)
+
+    def materialize_missing(
+        self,
+        *,
+        business_id: int | None,
+        branch_id: int | None = None,
+        leave_year: int,
+    ) -> int:
+        """Create every balance the leave masters imply but that was never initialized, in bulk."""
+        user_scope = [User.employment_type_id.is_not(None)]
+        if business_id is not None:
+            user_scope.append(User.business_id == business_id)
+        if branch_id is not None:
+            user_scope.append(User.branch_id == branch_id)
+        return self._insert_missing(
+            user_scope,
+            leave_year=leave_year,
+            entry_type=LeaveLedgerEntryType.OPENING,
+            note="Allocated from leave master",
+        )
+
+    def list_grid(
+        self,
+        *,
+        business_id: int | None,
+        branch_id: int | None,
+        leave_type_id: int | None,
+        after_user_id: int | None,
+        size: int,
+    ) -> tuple[list[Row], bool]:
+        """One row per (user, leave type their master defines) for a page of users, keyset on user id.
+
+        Balances are outer-joined, so a combination nobody initialized yet comes back with NULL
+        balance columns and the master's days for the caller to present as a virtual balance.
+        """
+        has_master = exists().where(LeaveMaster.employment_type_id == User.employment_type_id)
+        if leave_type_id is not None:
+            has_master = has_master.where(LeaveMaster.leave_type_id == leave_type_id)
+        page_users = select(User.id).where(User.employment_type_id.is_not(None), has_master)
+        if business_id is not None:
+            page_users = page_users.where(User.business_id == business_id)
+        if branch_id is not None:
+            page_users = page_users.where(User.branch_id == branch_id)
+        if after_user_id is not None:
+            page_users = page_users.where(User.id > after_user_id)
+        # A derived table rather than IN (...): MySQL does not allow LIMIT inside IN subqueries.
+        page = page_users.order_by(User.id.asc()).limit(size + 1).subquery()
+
+        balance = EmployeeLeaveBalance
+        query = (
+            select(
+                User.id.label("user_id"),
+                User.name.label("user_name"),
+                User.branch_id,
+                LeaveMaster.leave_type_id,
+                LeaveType.name.label("leave_type_name"),
+                LeaveMaster.total_leave_days,
+                balance.id.label("balance_id"),
+                balance.allocated_days,
+                balance.used_days,
+                balance.remaining_days,
+                balance.leave_year,
+            )
+            .join(page, page.c.id == User.id)
+            .join(LeaveMaster, LeaveMaster.employment_type_id == User.employment_type_id)
+            .join(LeaveType, LeaveType.id == LeaveMaster.leave_type_id)
+            .outerjoin(
+                balance,
+                and_(balance.user_id == User.id, balance.leave_type_id == LeaveMaster.leave_type_id),
+            )
+            .order_by(User.id.asc(), LeaveMaster.leave_type_id.asc())
+        )
+        if leave_type_id is not None:
+            query = query.where(LeaveMaster.leave_type_id == leave_type_id)
+        rows = self.db.execute(query).all()
+        user_ids = list(dict.fromkeys(row.user_id for row in rows))
+        if len(user_ids) <= size:
+            return rows, False
+        last_user_id = user_ids[size - 1]
+        return [row for row in rows if row.user_id <= last_user_id], True
+
+    def _insert_missing(
+        self,
+        user_scope: list,
+        *,
+        leave_year: int,
+        entry_type: LeaveLedgerEntryType,
+        note: str,
+    ) -> int:
+        balance = EmployeeLeaveBalance
+        missing = and_(
+            LeaveMaster.employment_type_id == User.employment_type_id,
+            *user_scope,
+            ~exists().where(balance.user_id == User.id, balance.leave_type_id == LeaveMaster.leave_type_id),
+        )
+        self._append_ledger(
+            select(
+                User.id,
+                LeaveMaster.leave_type_id,
+                literal(entry_type.value),
+                LeaveMaster.total_leave_days,
+                literal(note),
+            ).where(missing, LeaveMaster.total_leave_days > 0)
+        )
+        created = self.db.execute(
+            insert(balance).from_select(
+                ["user_id", "leave_type_id", "allocated_days", "used_days", "remaining_days", "leave_year"],
+                select(
+                    User.id,
+                    LeaveMaster.leave_type_id,
+                    LeaveMaster.total_leave_days,
+                    literal(0),
+                    LeaveMaster.total_leave_days,
+                    literal(leave_year),
+                ).where(missing),
+            )
+        )
+        return int(created.rowcount or 0)
+
+    def _append_ledger(self, rows) -> None:
+        self.db.execute(insert(LeaveLedgerEntry).from_select(LEDGER_COLUMNS, rows))
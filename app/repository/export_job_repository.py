@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from collections.abc import Collection
+from datetime import datetime
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.export_job import ExportJob, ExportJobStatus
+
+
+ACTIVE_STATUSES = (ExportJobStatus.PENDING, ExportJobStatus.RUNNING)
+
+
+class ExportJobRepository:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def create(self, job: ExportJob) -> ExportJob:
+        self.db.add(job)
+        self.db.flush()
+        self.db.refresh(job)
+        return job
+
+    def get_by_public_id(self, public_id: str) -> ExportJob | None:
+        return self.db.query(ExportJob).filter(ExportJob.public_id == public_id).first()
+
+    def find_reusable(
+        self,
+        *,
+        cache_key: str,
+        watermark: str,
+        completed_after: datetime,
+        active_after: datetime,
+    ) -> list[ExportJob]:
+        """Newest first: fresh completed results and live jobs rendering the same data."""
+        return (
+            self.db.query(ExportJob)
+            .filter(
+                ExportJob.cache_key == cache_key,
+                ExportJob.watermark == watermark,
+                (
+                    (ExportJob.status == ExportJobStatus.COMPLETED) & (ExportJob.finished_at >= completed_after)
+                )
+                | (
+                    ExportJob.status.in_(ACTIVE_STATUSES)
+                    & (func.coalesce(ExportJob.heartbeat_at, ExportJob.created_at) >= active_after)
+                ),
+            )
+            .order_by(ExportJob.id.desc())
+            .limit(10)
+            .all()
+        )
+
+    def list_expired_chunk(self, finished_before: datetime, *, limit: int) -> list[tuple[int, str | None]]:
+        """Ids and file paths of finished jobs older than ``finished_before``, oldest first."""
+        rows = self.db.execute(
+            select(ExportJob.id, ExportJob.file_path)
+            .where(
+                ExportJob.status.in_([ExportJobStatus.COMPLETED, ExportJobStatus.FAILED]),
+                ExportJob.finished_at < finished_before,
+            )
+            .order_by(ExportJob.id)
+            .limit(limit)
+        )
+        return [(job_id, file_path) for job_id, file_path in rows]
+
+    def delete_by_ids(self, job_ids: Collection[int]) -> None:
+        if not job_ids:
+            return
+        self.db.execute(delete(ExportJob).where(ExportJob.id.in_(list(job_ids))))
+        self.db.flush()
+
+    def paths_in_use(self, file_paths: Collection[str]) -> set[str]:
+        """The subset of ``file_paths`` still referenced by a job; reused results share one file."""
+        if not file_paths:
+            return set()
+        return set(self.db.scalars(select(ExportJob.file_path).where(ExportJob.file_path.in_(list(file_paths)))))
+
+    def fail_active(self, job_ids: Collection[int], *, now: datetime, error: str) -> int:
+        if not job_ids:
+            return 0
+        result = self.db.execute(
+            update(ExportJob)
+            .where(ExportJob.id.in_(list(job_ids)), ExportJob.status.in_(ACTIVE_STATUSES))
+            .values(status=ExportJobStatus.FAILED, finished_at=now, error=error)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    def claim(self, job_id: int, *, now: datetime) -> bool:
+        result = self.db.execute(
+            update(ExportJob)
+            .where(ExportJob.id == job_id, ExportJob.status == ExportJobStatus.PENDING)
+            .values(status=ExportJobStatus.RUNNING, started_at=now, heartbeat_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    def set_progress(self, job_id: int, row_count: int, *, now: datetime) -> None:
+        self.db.execute(
+            update(ExportJob)
+            .where(ExportJob.id == job_id, ExportJob.status == ExportJobStatus.RUNNING)
+            .values(row_count=row_count, heartbeat_at=now)
+            .execution_options(synchronize_session=False)
+        )
+
+    def finish(
+        self,
+        job_id: int,
+        *,
+        status: ExportJobStatus,
+        now: datetime,
+        row_count: int | None = None,
+        file_path: str | None = None,
+        filename: str | None = None,
+        error: str | None = None,
+    ) -> bool:
+        """Move an active job to ``status``; False when it was already finished by someone else."""
+        values: dict[str, object] = {"status": status, "finished_at": now, "error": error[:500] if error else None}
+        if row_count is not None:
+            values["row_count"] = row_count
+        if file_path is not None:
+            values["file_path"] = file_path
+            values["filename"] = filename
+        result = self.db.execute(
+            update(ExportJob)
+            .where(ExportJob.id == job_id, ExportJob.status.in_(ACTIVE_STATUSES))
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
@@ -0,0 +1,46 @@
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.leave_ledger_entry import LeaveLedgerEntry, LeaveLedgerEntryType
+
+
+class LeaveLedgerRepository:
+    """Insert-only: ledger rows are never updated or deleted once written."""
+
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def append(
+        self,
+        *,
+        user_id: int,
+        leave_type_id: int,
+        entry_type: LeaveLedgerEntryType,
+        days: int,
+        leave_request_id: int | None = None,
+        created_by: int | None = None,
+        note: str | None = None,
+    ) -> None:
+        self.db.execute(
+            insert(LeaveLedgerEntry).values(
+                user_id=user_id,
+                leave_type_id=leave_type_id,
+                entry_type=entry_type,
+                days=days,
+                leave_request_id=leave_request_id,
+                created_by=created_by,
+                note=note,
+            )
+        )
+
+    def append_many(self, entries: list[dict]) -> None:
+        """Entries are dicts of ``append``'s keyword arguments; written in one executemany."""
+        if not entries:
+            return
+        self.db.execute(
+            insert(LeaveLedgerEntry),
+            [
+                {"leave_request_id": None, "created_by": None, "note": None, **entry}
+                for entry in entries
+            ],
+        )
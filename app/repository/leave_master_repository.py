@@ -1,9 +1,19 @@
-from sqlalchemy import inspect, text
+from collections.abc import Collection
+
 from sqlalchemy.orm import Session, joinedload
 
+from app.core.schema_capabilities import references_exist
 from app.models.leave_master import LeaveMaster
 
 
+LEAVE_MASTER_REFERENCE_TABLES = (
+    "leave_requests",
+    "leave_transactions",
+    "leave_allocations",
+    "user_leave_balances",
+)
+
+
 class LeaveMasterRepository:
     def __init__(self, db: Session) -> None:
         self.db = db
@@ -15,12 +25,14 @@ class LeaveMasterRepository:
         leave_type_id: int,
         total_leave_days: int,
         proof_required: bool,
+        carry_forward_max_days: int = 0,
     ) -> LeaveMaster:
         leave_master = LeaveMaster(
             employment_type_id=employment_type_id,
             leave_type_id=leave_type_id,
             total_leave_days=total_leave_days,
             proof_required=proof_required,
+            carry_forward_max_days=carry_forward_max_days,
         )
         self.db.add(leave_master)
         self.db.flush()
@@ -76,8 +88,27 @@ class LeaveMasterRepository:
             .all()
         )
 
-    def update_total_days(self, leave_master: LeaveMaster, *, total_leave_days: int) -> LeaveMaster:
+    def list_by_employment_type_ids(self, employment_type_ids: Collection[int]) -> list[LeaveMaster]:
+        if not employment_type_ids:
+            return []
+        return (
+            self.db.query(LeaveMaster)
+            .options(joinedload(LeaveMaster.leave_type))
+            .filter(LeaveMaster.employment_type_id.in_(list(employment_type_ids)))
+            .order_by(LeaveMaster.id.asc())
+            .all()
+        )
+
+    def update_total_days(
+        self,
+        leave_master: LeaveMaster,
+        *,
+        total_leave_days: int,
+        carry_forward_max_days: int | None = None,
+    ) -> LeaveMaster:
         leave_master.total_leave_days = total_leave_days
+        if carry_forward_max_days is not None:
+            leave_master.carry_forward_max_days = carry_forward_max_days
         self.db.flush()
         self.db.refresh(leave_master)
         return leave_master
@@ -88,9 +119,12 @@ class LeaveMasterRepository:
         *,
         total_leave_days: int,
         proof_required: bool,
+        carry_forward_max_days: int | None = None,
     ) -> LeaveMaster:
         leave_master.total_leave_days = total_leave_days
         leave_master.proof_required = proof_required
+        if carry_forward_max_days is not None:
+            leave_master.carry_forward_max_days = carry_forward_max_days
         self.db.flush()
         self.db.refresh(leave_master)
         return leave_master
@@ -100,27 +134,9 @@ class LeaveMasterRepository:
         self.db.flush()
 
     def is_used(self, leave_master_id: int) -> bool:
-        bind = self.db.get_bind()
-        inspector = inspect(bind)
-        candidate_tables = (
-            "leave_requests",
-            "leave_transactions",
-            "leave_allocations",
-            "user_leave_balances",
+        return references_exist(
+            self.db,
+            column_name="leave_master_id",
+            candidate_tables=LEAVE_MASTER_REFERENCE_TABLES,
+            values=[leave_master_id],
         )
-
-        for table_name in candidate_tables:
-            if not inspector.has_table(table_name):
-                continue
-            column_names = {column["name"] for column in inspector.get_columns(table_name)}
-            if "leave_master_id" not in column_names:
-                continue
-
-            result = self.db.execute(
-                text(f"SELECT COUNT(*) FROM {table_name} WHERE leave_master_id = :leave_master_id"),
-                {"leave_master_id": leave_master_id},
-            ).scalar()
-            if int(result or 0) > 0:
-                return True
-
-        return False
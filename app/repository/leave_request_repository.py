@@ -1,8 +1,11 @@
-from datetime import date
+from datetime import date, datetime
 
+from sqlalchemy import Row, select, update
 from sqlalchemy.orm import Session, joinedload
 
 from app.models.leave_request import LeaveRequest, LeaveRequestStatus
+from app.models.leave_type import LeaveType
+from app.models.user import User
 
 
 class LeaveRequestRepository:
@@ -78,6 +81,42 @@ class LeaveRequestRepository:
             query = query.filter(LeaveRequest.status == status)
         return query.order_by(LeaveRequest.id.desc()).all()
 
+    def list_team_intervals(
+        self,
+        *,
+        manager_id: int,
+        manager_business_id: int | None,
+        include_admin_scope: bool,
+        start_date: date,
+        end_date: date,
+    ) -> list[Row]:
+        """Pending and approved requests of the team overlapping the range, as plain columns."""
+        query = (
+            select(
+                LeaveRequest.id,
+                LeaveRequest.user_id,
+                User.name.label("user_name"),
+                LeaveRequest.leave_type_id,
+                LeaveType.name.label("leave_type_name"),
+                LeaveRequest.start_date,
+                LeaveRequest.end_date,
+                LeaveRequest.status,
+            )
+            .join(User, User.id == LeaveRequest.user_id)
+            .join(LeaveType, LeaveType.id == LeaveRequest.leave_type_id)
+            .where(
+                LeaveRequest.status.in_([LeaveRequestStatus.PENDING, LeaveRequestStatus.APPROVED]),
+                LeaveRequest.start_date <= end_date,
+                LeaveRequest.end_date >= start_date,
+            )
+        )
+        if include_admin_scope:
+            if manager_business_id is not None:
+                query = query.where(User.business_id == manager_business_id)
+        else:
+            query = query.where(User.reporting_manager_id == manager_id)
+        return list(self.db.execute(query))
+
     def exists_overlap_for_user(
         self,
         *,
@@ -97,7 +136,60 @@ class LeaveRequestRepository:
             is not None
         )
 
-    def update(self, item: LeaveRequest) -> LeaveRequest:
-        self.db.flush()
-        self.db.refresh(item)
-        return item
+    def lock_for_decision(self, leave_request_ids: list[int]) -> list[LeaveRequest]:
+        """Requests with their employee, row-locked so the batch decides on statuses nobody else changes."""
+        return (
+            self.db.query(LeaveRequest)
+            .options(joinedload(LeaveRequest.user))
+            .filter(LeaveRequest.id.in_(leave_request_ids))
+            .order_by(LeaveRequest.id.asc())
+            .with_for_update(of=LeaveRequest)
+            .all()
+        )
+
+    def decide_many(
+        self,
+        leave_request_ids: list[int],
+        *,
+        status: LeaveRequestStatus,
+        decided_by: int,
+        decided_at: datetime,
+        rejection_reason: str | None = None,
+    ) -> int:
+        if not leave_request_ids:
+            return 0
+        result = self.db.execute(
+            update(LeaveRequest)
+            .where(LeaveRequest.id.in_(leave_request_ids), LeaveRequest.status == LeaveRequestStatus.PENDING)
+            .values(
+                status=status,
+                approved_by=decided_by,
+                approved_at=decided_at,
+                rejection_reason=rejection_reason,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return int(result.rowcount or 0)
+
+    def decide(
+        self,
+        leave_request_id: int,
+        *,
+        status: LeaveRequestStatus,
+        decided_by: int,
+        decided_at: datetime,
+        rejection_reason: str | None = None,
+    ) -> bool:
+        """Move a pending request to ``status``; False when someone else already decided it."""
+        result = self.db.execute(
+            update(LeaveRequest)
+            .where(LeaveRequest.id == leave_request_id, LeaveRequest.status == LeaveRequestStatus.PENDING)
+            .values(
+                status=status,
+                approved_by=decided_by,
+                approved_at=decided_at,
+                rejection_reason=rejection_reason,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
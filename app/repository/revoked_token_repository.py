@@ -1,5 +1,6 @@
 from datetime import datetime
 
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
 from app.models.revoked_token import RevokedToken
@@ -18,3 +19,21 @@ class RevokedTokenRepository:
 
     def exists_by_jti(self, jti: str) -> bool:
         return self.db.query(RevokedToken).filter(RevokedToken.jti == jti).first() is not None
+
+    def list_active_jtis(self, now: datetime) -> list[str]:
+        return list(self.db.scalars(select(RevokedToken.jti).where(RevokedToken.expires_at > now)))
+
+    def delete_expired_chunk(self, now: datetime, *, limit: int) -> int:
+        expired_ids = list(
+            self.db.scalars(
+                select(RevokedToken.id)
+                .where(RevokedToken.expires_at <= now)
+                .order_by(RevokedToken.id)
+                .limit(limit)
+            )
+        )
+        if not expired_ids:
+            return 0
+        self.db.execute(delete(RevokedToken).where(RevokedToken.id.in_(expired_ids)))
+        self.db.flush()
+        return len(expired_ids)
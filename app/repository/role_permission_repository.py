@@ -91,14 +91,11 @@ class RolePermissionRepository:
         )
         return items, total
 
-    def has_permission_for_role(self, *, role_id: int, permission_name: str) -> bool:
-        return (
-            self.db.query(RolePermission)
-            .join(Permission, Permission.id == RolePermission.permission_id)
-            .filter(
-                RolePermission.role_id == role_id,
-                Permission.permission_name == permission_name,
-            )
-            .first()
-            is not None
+    def list_permission_names_for_role(self, role_id: int) -> list[str]:
+        rows = (
+            self.db.query(Permission.permission_name)
+            .join(RolePermission, RolePermission.permission_id == Permission.id)
+            .filter(RolePermission.role_id == role_id)
+            .all()
         )
+        return [row.permission_name for row in rows]
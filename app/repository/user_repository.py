@@ -1,7 +1,8 @@
+from collections.abc import Collection
 from typing import Any
 
-from sqlalchemy import or_
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Query, Session, load_only, selectinload
 
 from app.models.role import RoleEnum
 from app.models.user_education import UserEducation
@@ -9,6 +10,37 @@ from app.models.user_previous_company import UserPreviousCompany
 from app.models.user import User
 
 
+USER_LIST_COLUMNS = (
+    "id",
+    "username",
+    "email",
+    "first_name",
+    "middle_name",
+    "last_name",
+    "role",
+    "business_id",
+    "name",
+    "branch_id",
+    "employment_type_id",
+    "designation_id",
+    "reporting_manager_id",
+    "role_id",
+    "salary_type",
+    "salary",
+    "leave_balance",
+    "status",
+    "current_address",
+    "home_address",
+    "pan",
+    "aadhaar",
+    "mobile",
+    "number",
+    "father_name",
+    "mother_name",
+    "created_at",
+)
+
+
 class UserRepository:
     def __init__(self, db: Session) -> None:
         self.db = db
@@ -36,6 +68,14 @@ class UserRepository:
             .first()
         )
 
+    def get_principal_by_id(self, user_id: int, columns: tuple[str, ...]) -> User | None:
+        return (
+            self.db.query(User)
+            .options(load_only(*(getattr(User, name) for name in columns), raiseload=True))
+            .filter(User.id == user_id)
+            .first()
+        )
+
     def get_by_username(self, username: str) -> User | None:
         return self.db.query(User).filter(User.username == username).first()
 
@@ -54,6 +94,19 @@ class UserRepository:
     def get_by_username_or_email(self, login: str) -> User | None:
         return self.db.query(User).filter(or_(User.username == login, User.email == login)).first()
 
+    def list_face_embeddings_for_branch(self, branch_id: int) -> list[tuple[int, bytes | None, str | None]]:
+        rows = (
+            self.db.query(User.id, User.face_embedding, User.face_encoding)
+            .filter(
+                User.branch_id == branch_id,
+                func.upper(func.trim(User.status)) == "ACTIVE",
+                or_(User.face_embedding.is_not(None), User.face_encoding.is_not(None)),
+            )
+            .order_by(User.id.asc())
+            .all()
+        )
+        return [(int(user_id), embedding, encoding) for user_id, embedding, encoding in rows]
+
     def count_by_designation_id(self, designation_id: int) -> int:
         return self.db.query(User).filter(User.designation_id == designation_id).count()
 
@@ -94,8 +147,66 @@ class UserRepository:
         first_name: str | None = None,
         mobile_number: str | None = None,
         branch_id: int | None = None,
+        sections: Collection[str] | None = None,
     ) -> tuple[list[User], int]:
-        query = self.db.query(User).options(*self._default_load_options())
+        query = self._list_query_for_actor(
+            actor,
+            first_name=first_name,
+            mobile_number=mobile_number,
+            branch_id=branch_id,
+            sections=sections,
+        )
+
+        total = query.count()
+        items = (
+            query.order_by(User.id.asc())
+            .offset((page - 1) * size)
+            .limit(size)
+            .all()
+        )
+        return items, total
+
+    def list_keyset_for_actor(
+        self,
+        actor: User,
+        *,
+        after_id: int | None,
+        size: int,
+        first_name: str | None = None,
+        mobile_number: str | None = None,
+        branch_id: int | None = None,
+        sections: Collection[str] = (),
+        with_total: bool = False,
+    ) -> tuple[list[User], bool, int | None]:
+        query = self._list_query_for_actor(
+            actor,
+            first_name=first_name,
+            mobile_number=mobile_number,
+            branch_id=branch_id,
+            sections=sections,
+        )
+        total = query.count() if with_total else None
+        if after_id is not None:
+            query = query.filter(User.id > after_id)
+        rows = query.order_by(User.id.asc()).limit(size + 1).all()
+        return rows[:size], len(rows) > size, total
+
+    def _list_query_for_actor(
+        self,
+        actor: User,
+        *,
+        first_name: str | None,
+        mobile_number: str | None,
+        branch_id: int | None,
+        sections: Collection[str] | None,
+    ) -> Query:
+        if sections is None:
+            query = self.db.query(User).options(*self._default_load_options())
+        else:
+            query = self.db.query(User).options(
+                load_only(*(getattr(User, column) for column in USER_LIST_COLUMNS)),
+                *self._section_load_options(sections),
+            )
 
         if actor.role == RoleEnum.BUSINESS_OWNER or actor.role == RoleEnum.BUSINESS_ADMIN:
             query = query.filter(User.business_id == actor.business_id)
@@ -108,15 +219,20 @@ class UserRepository:
             query = query.filter(User.mobile.ilike(f"%{mobile_number.strip()}%"))
         if branch_id is not None:
             query = query.filter(User.branch_id == branch_id)
+        return query
 
-        total = query.count()
-        items = (
-            query.order_by(User.id.asc())
-            .offset((page - 1) * size)
-            .limit(size)
-            .all()
-        )
-        return items, total
+    @staticmethod
+    def _section_load_options(sections: Collection[str]) -> list[Any]:
+        options: list[Any] = []
+        if "educations" in sections:
+            options.append(selectinload(User.educations).selectinload(UserEducation.documents))
+        if "previous_companies" in sections:
+            options.append(selectinload(User.previous_companies).selectinload(UserPreviousCompany.documents))
+        if "bank_account" in sections:
+            options.append(selectinload(User.bank_account))
+        if "documents" in sections:
+            options.append(selectinload(User.documents))
+        return options
 
     def update(self, user: User) -> User:
         self.db.flush()
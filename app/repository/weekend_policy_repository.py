@@ -1,11 +1,16 @@
+from collections.abc import Collection
 from datetime import date
 
-from sqlalchemy import and_, case, inspect, or_, text
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, joinedload, selectinload
 
+from app.core.schema_capabilities import references_exist
 from app.models.weekend_policy import WeekendPolicy, WeekendPolicyRule, WeekendSession
 
 
+POLICY_REFERENCE_TABLES = ("payroll_entries", "salary_slips", "attendance", "leave_requests")
+
+
 class WeekendPolicyRepository:
     def __init__(self, db: Session) -> None:
         self.db = db
@@ -25,29 +30,6 @@ class WeekendPolicyRepository:
             query = query.filter(WeekendSession.branch_id == branch_id)
         return query.order_by(WeekendSession.start_date.desc(), WeekendSession.id.desc()).all()
 
-    def get_active_session_for_date(self, *, branch_id: int | None, target_date: date) -> WeekendSession | None:
-        query = (
-            self.db.query(WeekendSession)
-            .filter(
-                WeekendSession.is_active.is_(True),
-                WeekendSession.start_date <= target_date,
-                WeekendSession.end_date >= target_date,
-            )
-        )
-        if branch_id is not None:
-            query = query.filter(or_(WeekendSession.branch_id == branch_id, WeekendSession.branch_id.is_(None)))
-            query = query.order_by(
-                case((WeekendSession.branch_id == branch_id, 0), else_=1),
-                WeekendSession.start_date.desc(),
-                WeekendSession.id.desc(),
-            )
-        else:
-            query = query.filter(WeekendSession.branch_id.is_(None)).order_by(
-                WeekendSession.start_date.desc(),
-                WeekendSession.id.desc(),
-            )
-        return query.first()
-
     def create_policy(self, policy: WeekendPolicy) -> WeekendPolicy:
         self.db.add(policy)
         self.db.flush()
@@ -118,52 +100,39 @@ class WeekendPolicyRepository:
             )
         self.db.flush()
 
-    def get_active_policy_for_date(
+    def list_calendar_sources(
         self,
-        *,
-        session_id: int,
-        branch_id: int | None,
-        target_date: date,
-    ) -> WeekendPolicy | None:
-        query = (
+        branch_ids: Collection[int | None],
+    ) -> tuple[list[WeekendSession], list[WeekendPolicy]]:
+        """Every active session and policy (with rules) that can govern a day of any of ``branch_ids``."""
+        specific_ids = [branch_id for branch_id in branch_ids if branch_id is not None]
+        session_scope = WeekendSession.branch_id.is_(None)
+        policy_scope = WeekendPolicy.branch_id.is_(None)
+        if specific_ids:
+            session_scope = or_(session_scope, WeekendSession.branch_id.in_(specific_ids))
+            policy_scope = or_(policy_scope, WeekendPolicy.branch_id.in_(specific_ids))
+        sessions = self.db.query(WeekendSession).filter(WeekendSession.is_active.is_(True), session_scope).all()
+        if not sessions:
+            return [], []
+        policies = (
             self.db.query(WeekendPolicy)
-            .options(joinedload(WeekendPolicy.rules), joinedload(WeekendPolicy.session))
+            .options(selectinload(WeekendPolicy.rules))
             .filter(
-                WeekendPolicy.session_id == session_id,
                 WeekendPolicy.is_active.is_(True),
-                WeekendPolicy.effective_from <= target_date,
-                or_(WeekendPolicy.effective_to.is_(None), WeekendPolicy.effective_to >= target_date),
+                WeekendPolicy.session_id.in_([session.id for session in sessions]),
+                policy_scope,
             )
+            .all()
         )
-        if branch_id is not None:
-            query = query.filter(or_(WeekendPolicy.branch_id == branch_id, WeekendPolicy.branch_id.is_(None)))
-            query = query.order_by(
-                case((WeekendPolicy.branch_id == branch_id, 0), else_=1),
-                WeekendPolicy.effective_from.desc(),
-                WeekendPolicy.id.desc(),
-            )
-        else:
-            query = query.filter(WeekendPolicy.branch_id.is_(None)).order_by(
-                WeekendPolicy.effective_from.desc(),
-                WeekendPolicy.id.desc(),
-            )
-        return query.first()
+        return sessions, policies
 
     def is_policy_used(self, policy_id: int) -> bool:
-        bind = self.db.get_bind()
-        inspector = inspect(bind)
-        candidate_tables = ("payroll_entries", "salary_slips", "attendance", "leave_requests")
-
-        for table_name in candidate_tables:
-            if not inspector.has_table(table_name):
-                continue
-            columns = {column["name"] for column in inspector.get_columns(table_name)}
-            if "weekend_policy_id" not in columns:
-                continue
-            result = self.db.execute(
-                text(f"SELECT COUNT(*) FROM {table_name} WHERE weekend_policy_id = :policy_id"),
-                {"policy_id": policy_id},
-            ).scalar()
-            if int(result or 0) > 0:
-                return True
-        return False
+        return self.is_any_policy_used([policy_id])
+
+    def is_any_policy_used(self, policy_ids: Collection[int]) -> bool:
+        return references_exist(
+            self.db,
+            column_name="weekend_policy_id",
+            candidate_tables=POLICY_REFERENCE_TABLES,
+            values=policy_ids,
+        )
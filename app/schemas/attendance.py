@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from datetime import date, datetime
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 
 from app.models.attendance import AttendanceStatus
+from app.models.export_job import ExportJobStatus
 
 
 class FaceEnrollRequest(BaseModel):
@@ -28,6 +30,22 @@ class AttendanceCheckInResponse(BaseModel):
     location_verified: bool
 
 
+class KioskCheckInRequest(BaseModel):
+    image_base64: str
+    latitude: float = Field(ge=-90, le=90)
+    longitude: float = Field(ge=-180, le=180)
+    ip_address: str | None = None
+    branch_id: int | None = Field(default=None, ge=1)
+
+
+class KioskCheckInResponse(BaseModel):
+    message: str
+    user_id: int
+    user_name: str
+    confidence: float
+    location_verified: bool
+
+
 class AttendanceActionRequest(BaseModel):
     user_id: int | None = Field(default=None, ge=1)
 
@@ -54,10 +72,55 @@ class AttendanceResponse(BaseModel):
 
 class AttendanceListResponse(BaseModel):
     items: list[AttendanceResponse]
-    page: int
+    page: int | None
     size: int
-    total: int
-    total_pages: int
+    total: int | None
+    total_pages: int | None
+    next_cursor: str | None = None
+
+
+class AttendanceMonthlySummaryResponse(BaseModel):
+    user_id: int
+    business_id: int | None
+    month_start: date
+    present_days: int
+    absent_days: int
+    half_days: int
+    overtime_days: int
+    leave_days: int
+    holiday_days: int
+    total_minutes: int
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AttendanceMonthlySummaryListResponse(BaseModel):
+    month: str
+    items: list[AttendanceMonthlySummaryResponse]
+    size: int
+    next_cursor: str | None = None
+
+
+class AttendanceDailyRollupResponse(BaseModel):
+    business_id: int | None
+    branch_id: int | None
+    attendance_date: date
+    present_count: int
+    absent_count: int
+    half_day_count: int
+    overtime_count: int
+    leave_count: int
+    holiday_count: int
+    checked_out_count: int
+    total_minutes: int
+    average_minutes: float | None
+
+
+class AttendanceAnalyticsResponse(BaseModel):
+    start_date: date
+    end_date: date
+    items: list[AttendanceDailyRollupResponse]
 
 
 class AutoAbsenceRequest(BaseModel):
@@ -69,3 +132,28 @@ class AutoAbsenceResponse(BaseModel):
     attendance_date: date
     created_count: int
     skipped_existing_count: int
+    skipped_leave_count: int
+    skipped_non_working_count: int
+
+
+class ExportJobCreateRequest(BaseModel):
+    format: Literal["excel", "pdf"]
+    user_id: int | None = Field(default=None, ge=1)
+    branch_id: int | None = Field(default=None, ge=1)
+    status: str | None = None
+    search: str | None = None
+    start_date: date | None = None
+    end_date: date | None = None
+
+
+class ExportJobResponse(BaseModel):
+    job_id: str
+    format: str
+    status: ExportJobStatus
+    row_count: int
+    total_rows: int | None
+    progress: float
+    download_url: str | None
+    error: str | None
+    created_at: datetime
+    finished_at: datetime | None
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+
+
+class LeaveBalanceCell(BaseModel):
+    leave_type_id: int
+    leave_type_name: str
+    allocated_days: int
+    used_days: int
+    remaining_days: int
+    leave_year: int | None
+    materialized: bool
+
+
+class LeaveBalanceGridItem(BaseModel):
+    user_id: int
+    user_name: str | None
+    branch_id: int | None
+    balances: list[LeaveBalanceCell]
+
+
+class LeaveBalanceGridResponse(BaseModel):
+    items: list[LeaveBalanceGridItem]
+    size: int
+    next_cursor: str | None = None
+
+
+class LeaveBalanceMaterializeRequest(BaseModel):
+    business_id: int | None = Field(default=None, ge=1)
+    branch_id: int | None = Field(default=None, ge=1)
+
+
+class LeaveBalanceMaterializeResponse(BaseModel):
+    created: int
@@ -6,6 +6,7 @@ from pydantic import BaseModel, Field
 class LeaveMasterCreateItemRequest(BaseModel):
     leave_type_id: int = Field(ge=1)
     total_leave_days: int = Field(ge=0)
+    carry_forward_max_days: int | None = Field(default=None, ge=0)
 
 
 class LeaveMasterCreateRequest(BaseModel):
@@ -20,6 +21,7 @@ class LeaveMasterBulkUpdateRequest(BaseModel):
 
 class LeaveMasterUpdateRequest(BaseModel):
     total_leave_days: int = Field(ge=0)
+    carry_forward_max_days: int | None = Field(default=None, ge=0)
 
 
 class LeaveMasterResponse(BaseModel):
@@ -30,6 +32,7 @@ class LeaveMasterResponse(BaseModel):
     leave_type_name: str
     proof_required: bool
     total_leave_days: int
+    carry_forward_max_days: int
     created_at: datetime
     updated_at: datetime
 
@@ -40,6 +43,7 @@ class LeaveMasterGroupedLeaveItemResponse(BaseModel):
     leave_type_name: str
     proof_required: bool
     total_leave_days: int
+    carry_forward_max_days: int
 
 
 class LeaveMasterGroupedResponse(BaseModel):
@@ -1,4 +1,5 @@
 from datetime import date, datetime
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
@@ -34,3 +35,50 @@ class LeaveRequestResponse(BaseModel):
     approved_by_name: str | None
     approved_at: datetime | None
     rejection_reason: str | None
+
+
+class LeaveRequestBulkDecisionRequest(BaseModel):
+    leave_request_ids: list[int] = Field(min_length=1, max_length=200)
+    action: Literal["APPROVE", "REJECT"]
+    rejection_reason: str | None = Field(default=None, min_length=2, max_length=2000)
+
+
+class LeaveRequestDecisionOutcome(BaseModel):
+    leave_request_id: int
+    succeeded: bool
+    status: LeaveRequestStatus | None
+    detail: str | None = None
+
+
+class LeaveRequestBulkDecisionResponse(BaseModel):
+    succeeded_count: int
+    failed_count: int
+    results: list[LeaveRequestDecisionOutcome]
+
+
+class TeamLeaveAbsentee(BaseModel):
+    leave_request_id: int
+    user_id: int
+    user_name: str | None
+    leave_type_id: int
+    leave_type_name: str
+    status: LeaveRequestStatus
+
+
+class TeamLeaveCalendarDay(BaseModel):
+    date: date
+    absentees: list[TeamLeaveAbsentee]
+
+
+class TeamLeaveConflict(BaseModel):
+    start_date: date
+    end_date: date
+    user_ids: list[int]
+    leave_request_ids: list[int]
+
+
+class TeamLeaveCalendarResponse(BaseModel):
+    start_date: date
+    end_date: date
+    days: list[TeamLeaveCalendarDay]
+    conflicts: list[TeamLeaveConflict]
@@ -219,7 +219,8 @@ class UserResponse(BaseModel):
 
 class UserListResponse(BaseModel):
     items: list[UserResponse]
-    page: int
+    page: int | None
     size: int
-    total: int
-    total_pages: int
+    total: int | None
+    total_pages: int | None
+    next_cursor: str | None = None
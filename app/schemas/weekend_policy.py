@@ -72,3 +72,37 @@ class WeekendCheckResponse(BaseModel):
     is_weekend: bool
     session_id: int | None
     policy_id: int | None
+
+
+class WeekendDatesResponse(BaseModel):
+    branch_id: int | None
+    start_date: date
+    end_date: date
+    dates: list[date]
+
+
+class WeekendCalendarBatchRequest(BaseModel):
+    branch_ids: list[int | None] = Field(min_length=1, max_length=100)
+    start_date: date
+    end_date: date
+
+
+class WeekendCalendarSegment(BaseModel):
+    start_date: date
+    end_date: date
+    session_id: int | None
+    policy_id: int | None
+
+
+class WeekendCalendarBranchResponse(BaseModel):
+    branch_id: int | None
+    # Includes the Saturday/Sunday default where no policy applies, unlike WeekendDatesResponse.dates.
+    non_working_dates: list[date]
+    working_day_count: int
+    segments: list[WeekendCalendarSegment]
+
+
+class WeekendCalendarBatchResponse(BaseModel):
+    start_date: date
+    end_date: date
+    branches: list[WeekendCalendarBranchResponse]
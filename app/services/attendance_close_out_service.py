@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from enum import StrEnum
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.attendance_close_out import AttendanceCloseOutStatus
+from app.repository.attendance_close_out_repository import AttendanceCloseOutRepository
+from app.services.attendance_service import AttendanceService
+
+
+logger = logging.getLogger(__name__)
+
+
+class CloseOutOutcome(StrEnum):
+    COMPLETED = "COMPLETED"
+    ALREADY_CLOSED = "ALREADY_CLOSED"
+    LOCKED = "LOCKED"
+    FAILED = "FAILED"
+
+
+@dataclass(frozen=True)
+class CloseOutResult:
+    business_id: int
+    attendance_date: date
+    outcome: CloseOutOutcome
+    created_count: int = 0
+    skipped_count: int = 0
+
+
+class AttendanceCloseOutService:
+    def __init__(self, db: Session, *, node_id: str) -> None:
+        self.db = db
+        self.node_id = node_id
+        self.close_out_repository = AttendanceCloseOutRepository(db)
+
+    def close_out(self, *, business_id: int, attendance_date: date) -> CloseOutResult:
+        now = datetime.now(timezone.utc)
+        claimed = self.close_out_repository.claim(
+            business_id=business_id,
+            attendance_date=attendance_date,
+            claimed_by=self.node_id,
+            now=now,
+            stale_before=now - timedelta(seconds=settings.attendance_close_out_stale_after_seconds),
+        )
+        self.db.commit()
+        if not claimed:
+            existing = self.close_out_repository.get(business_id, attendance_date)
+            if existing is not None and existing.status == AttendanceCloseOutStatus.COMPLETED:
+                outcome = CloseOutOutcome.ALREADY_CLOSED
+            else:
+                outcome = CloseOutOutcome.LOCKED
+            return CloseOutResult(business_id=business_id, attendance_date=attendance_date, outcome=outcome)
+
+        try:
+            summary = AttendanceService(self.db).close_out_day(
+                business_id=business_id,
+                attendance_date=attendance_date,
+            )
+        except Exception as exc:
+            self.db.rollback()
+            logger.exception("attendance close-out failed business=%s date=%s", business_id, attendance_date)
+            self.close_out_repository.finish(
+                business_id=business_id,
+                attendance_date=attendance_date,
+                claimed_by=self.node_id,
+                status=AttendanceCloseOutStatus.FAILED,
+                now=datetime.now(timezone.utc),
+                error=str(exc) or exc.__class__.__name__,
+            )
+            self.db.commit()
+            return CloseOutResult(
+                business_id=business_id,
+                attendance_date=attendance_date,
+                outcome=CloseOutOutcome.FAILED,
+            )
+
+        skipped_count = (
+            summary.skipped_existing_count + summary.skipped_leave_count + summary.skipped_non_working_count
+        )
+        self.close_out_repository.finish(
+            business_id=business_id,
+            attendance_date=attendance_date,
+            claimed_by=self.node_id,
+            status=AttendanceCloseOutStatus.COMPLETED,
+            now=datetime.now(timezone.utc),
+            created_count=summary.created_count,
+            skipped_count=skipped_count,
+        )
+        self.db.commit()
+        return CloseOutResult(
+            business_id=business_id,
+            attendance_date=attendance_date,
+            outcome=CloseOutOutcome.COMPLETED,
+            created_count=summary.created_count,
+            skipped_count=skipped_count,
+        )
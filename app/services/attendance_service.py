@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import csv
 import io
+import json
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, fields
 from datetime import date, datetime, timezone
 from math import asin, cos, radians, sin, sqrt
+from tempfile import SpooledTemporaryFile
+from time import monotonic
+from typing import IO
 
+import numpy as np
+from sqlalchemy.engine import Row
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
@@ -17,28 +26,109 @@ from app.core.exceptions import (
     TooManyRequestsException,
     UnauthorizedException,
 )
+from app.core.cache import TTLCache
+from app.core.pagination import decode_cursor, encode_cursor
 from app.core.rate_limiter import InMemoryRateLimiter
+from app.core.role_permissions import role_has_permission
 from app.models.attendance import Attendance, AttendanceStatus
 from app.models.role import RoleEnum
 from app.models.user import User
 from app.repository.attendance_repository import AttendanceRepository
+from app.repository.attendance_rollup_repository import AttendanceRollupRepository
+from app.repository.attendance_summary_repository import AttendanceSummaryRepository
 from app.repository.branch_repository import BranchRepository
-from app.repository.role_permission_repository import RolePermissionRepository
 from app.repository.user_repository import UserRepository
 from app.schemas.attendance import (
+    AttendanceAnalyticsResponse,
     AttendanceCheckInResponse,
+    AttendanceDailyRollupResponse,
     AttendanceListResponse,
+    AttendanceMonthlySummaryListResponse,
+    AttendanceMonthlySummaryResponse,
     AttendanceResponse,
     AutoAbsenceResponse,
     FaceEnrollResponse,
+    KioskCheckInResponse,
 )
+from app.services.branch_face_index import BRANCH_FACE_INDEX
 from app.services.face_verification_service import FaceVerificationService
+from app.services.face_worker_pool import FACE_WORKER_POOL
+from app.services.pdf_table_renderer import render_table_pdf
+from app.services.weekend_policy_service import WeekendPolicyService
+
+
+EXPORT_STREAM_CHUNK_SIZE = 64 * 1024
+# Fixed widths (points) keep the per-page PDF tables aligned; they fill a landscape letter page.
+PDF_COLUMN_WIDTHS = (50, 45, 165, 45, 65, 115, 115, 50, 70)
+PDF_NAME_MAX_CHARS = 38
+FEED_COLUMNS = (
+    "id",
+    "user_id",
+    "username",
+    "name",
+    "email",
+    "business_id",
+    "branch_id",
+    "attendance_date",
+    "check_in",
+    "check_out",
+    "total_minutes",
+    "status",
+    "ip_address",
+    "device_info",
+    "created_at",
+    "updated_at",
+)
+
+
+@dataclass(frozen=True)
+class ExportFilters:
+    """Export filters after permission scoping; safe to persist and replay without the actor."""
+
+    business_id: int | None
+    user_id: int | None
+    branch_id: int | None
+    status: str | None
+    start_date: date | None
+    end_date: date | None
+    search: str | None
+
+    def as_kwargs(self) -> dict[str, object]:
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+    def to_json(self) -> str:
+        values = self.as_kwargs()
+        for key in ("start_date", "end_date"):
+            if values[key] is not None:
+                values[key] = values[key].isoformat()
+        return json.dumps(values, sort_keys=True, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, raw: str) -> ExportFilters:
+        values = json.loads(raw)
+        for key in ("start_date", "end_date"):
+            if values.get(key) is not None:
+                values[key] = date.fromisoformat(values[key])
+        return cls(**values)
 
 
 CHECK_IN_RATE_LIMITER = InMemoryRateLimiter(
     max_requests=settings.attendance_check_in_rate_limit,
     window_seconds=settings.attendance_check_in_rate_window_seconds,
 )
+# One kiosk serves a whole branch, so it gets a larger budget; it is checked before any face work.
+KIOSK_RATE_LIMITER = InMemoryRateLimiter(
+    max_requests=settings.attendance_kiosk_rate_limit,
+    window_seconds=settings.attendance_kiosk_rate_window_seconds,
+)
+# Everything a kiosk check-in reads from the matched user.
+KIOSK_USER_COLUMNS = ("id", "business_id", "branch_id", "status", "name", "first_name", "middle_name", "last_name")
+# Keyed by (business_id, branch_id, start_date, end_date); entries covering a day are dropped when this
+# process writes attendance for it, and the TTL bounds staleness from other workers.
+ATTENDANCE_ANALYTICS_CACHE: TTLCache[tuple, AttendanceAnalyticsResponse] = TTLCache(
+    max_entries=settings.attendance_analytics_cache_max_entries,
+    ttl_seconds=settings.attendance_analytics_cache_ttl_seconds,
+)
 
 
 class AttendanceService:
@@ -51,9 +141,10 @@ class AttendanceService:
     def __init__(self, db: Session) -> None:
         self.db = db
         self.attendance_repository = AttendanceRepository(db)
+        self.attendance_summary_repository = AttendanceSummaryRepository(db)
+        self.attendance_rollup_repository = AttendanceRollupRepository(db)
         self.user_repository = UserRepository(db)
         self.branch_repository = BranchRepository(db)
-        self.role_permission_repository = RolePermissionRepository(db)
         self.face_verification_service = FaceVerificationService()
 
     def enroll_face(
@@ -68,15 +159,25 @@ class AttendanceService:
         if not self._is_active_user(target_user):
             raise ForbiddenException("Inactive users cannot enroll face")
         encoding = self._extract_encoding(image_base64=image_base64, image_bytes=image_bytes)
-        target_user.face_encoding = self.face_verification_service.serialize_encoding(encoding)
+        embedding = self.face_verification_service.serialize_encoding(encoding)
+        target_user_id, target_branch_id = target_user.id, target_user.branch_id
+        target_user.face_embedding = embedding
+        target_user.face_encoding = None
         try:
             self.db.flush()
             self.db.commit()
-            return FaceEnrollResponse(message="Face enrollment successful")
         except SQLAlchemyError as exc:
             self.db.rollback()
             raise BadRequestException("Unable to save face enrollment") from exc
 
+        if target_branch_id is not None:
+            BRANCH_FACE_INDEX.upsert_user(
+                target_branch_id,
+                target_user_id,
+                self.face_verification_service.deserialize_encoding(embedding),
+            )
+        return FaceEnrollResponse(message="Face enrollment successful")
+
     def check_in(
         self,
         actor: User,
@@ -94,20 +195,14 @@ class AttendanceService:
             raise ForbiddenException("Inactive users are not allowed to check in")
         if not CHECK_IN_RATE_LIMITER.allow(f"attendance-check-in:{target_user.id}"):
             raise TooManyRequestsException("Too many check-in attempts, please retry later")
-        if not target_user.face_encoding:
+        stored_encoding = self._stored_face_encoding(target_user)
+        if stored_encoding is None:
             raise BadRequestException("Face enrollment is required before check-in")
 
         now = datetime.now(timezone.utc)
-        attendance_date = now.date()
-        try:
-            existing = self.attendance_repository.get_by_user_and_date(target_user.id, attendance_date)
-        except SQLAlchemyError as exc:
-            raise BadRequestException("Unable to read attendance data") from exc
-        if existing is not None:
-            raise ConflictException("Attendance already exists for this user on this date")
+        self._ensure_not_checked_in(target_user.id, now.date())
 
         live_encoding = self._extract_encoding(image_base64=image_base64, image_bytes=image_bytes)
-        stored_encoding = self.face_verification_service.deserialize_encoding(target_user.face_encoding)
         distance, confidence = self.face_verification_service.compare_face_encodings(
             stored=stored_encoding,
             live=live_encoding,
@@ -115,6 +210,103 @@ class AttendanceService:
         if distance >= settings.attendance_face_distance_threshold:
             raise UnauthorizedException("Face mismatch")
 
+        self._record_check_in(
+            target_user,
+            now=now,
+            confidence=confidence,
+            latitude=latitude,
+            longitude=longitude,
+            ip_address=ip_address,
+            device_info=device_info,
+        )
+        return AttendanceCheckInResponse(
+            message="Check-in successful",
+            confidence=round(confidence, 4),
+            location_verified=True,
+        )
+
+    def kiosk_check_in(
+        self,
+        actor: User,
+        *,
+        branch_id: int | None = None,
+        image_base64: str | None = None,
+        image_bytes: bytes | None = None,
+        latitude: float,
+        longitude: float,
+        ip_address: str | None = None,
+        device_info: str | None = None,
+    ) -> KioskCheckInResponse:
+        kiosk_branch_id = branch_id if branch_id is not None else actor.branch_id
+        if kiosk_branch_id is None:
+            raise BadRequestException("branch_id is required for kiosk check-in")
+        self._ensure_branch_accessible(actor, kiosk_branch_id)
+        if not KIOSK_RATE_LIMITER.allow(f"kiosk-check-in:{kiosk_branch_id}:{actor.id}"):
+            raise TooManyRequestsException("Too many kiosk check-in attempts, please retry later")
+
+        live_encoding = self._extract_encoding(image_base64=image_base64, image_bytes=image_bytes)
+        index = BRANCH_FACE_INDEX.get(kiosk_branch_id, lambda: self._load_branch_face_rows(kiosk_branch_id))
+        match = BRANCH_FACE_INDEX.identify(
+            index,
+            np.asarray(live_encoding, dtype=np.float32),
+            ambiguity_margin=settings.attendance_face_ambiguity_margin,
+        )
+        if match.user_id is None or match.distance is None:
+            raise UnauthorizedException("Face not recognized")
+        if match.distance >= settings.attendance_face_distance_threshold:
+            raise UnauthorizedException("Face not recognized")
+        if match.is_ambiguous:
+            raise UnauthorizedException("Face match is ambiguous, please retry")
+
+        target_user = self.user_repository.get_principal_by_id(match.user_id, KIOSK_USER_COLUMNS)
+        if target_user is None or target_user.branch_id != kiosk_branch_id:
+            BRANCH_FACE_INDEX.invalidate_branch(kiosk_branch_id)
+            raise UnauthorizedException("Face not recognized")
+        if not self._is_active_user(target_user):
+            raise ForbiddenException("Inactive users are not allowed to check in")
+        if not CHECK_IN_RATE_LIMITER.allow(f"attendance-check-in:{target_user.id}"):
+            raise TooManyRequestsException("Too many check-in attempts, please retry later")
+
+        now = datetime.now(timezone.utc)
+        self._ensure_not_checked_in(target_user.id, now.date())
+        confidence = self.face_verification_service.confidence_from_distance(match.distance)
+        user_name = self._display_name(target_user)
+        self._record_check_in(
+            target_user,
+            now=now,
+            confidence=confidence,
+            latitude=latitude,
+            longitude=longitude,
+            ip_address=ip_address,
+            device_info=device_info,
+        )
+        return KioskCheckInResponse(
+            message="Check-in successful",
+            user_id=match.user_id,
+            user_name=user_name,
+            confidence=round(confidence, 4),
+            location_verified=True,
+        )
+
+    def _ensure_not_checked_in(self, user_id: int, attendance_date: date) -> None:
+        try:
+            existing = self.attendance_repository.get_by_user_and_date(user_id, attendance_date)
+        except SQLAlchemyError as exc:
+            raise BadRequestException("Unable to read attendance data") from exc
+        if existing is not None:
+            raise ConflictException("Attendance already exists for this user on this date")
+
+    def _record_check_in(
+        self,
+        target_user: User,
+        *,
+        now: datetime,
+        confidence: float,
+        latitude: float,
+        longitude: float,
+        ip_address: str | None,
+        device_info: str | None,
+    ) -> Attendance:
         branch, geo_distance = self._validate_branch_geofence(
             target_user,
             latitude=latitude,
@@ -124,7 +316,7 @@ class AttendanceService:
         attendance = Attendance(
             user_id=target_user.id,
             branch_id=branch.id,
-            attendance_date=attendance_date,
+            attendance_date=now.date(),
             check_in=now,
             latitude=latitude,
             longitude=longitude,
@@ -140,6 +332,7 @@ class AttendanceService:
         )
         try:
             self.attendance_repository.create(attendance)
+            self._apply_aggregate_deltas(target_user, attendance, status_deltas={AttendanceStatus.PRESENT: 1})
             self.db.commit()
         except IntegrityError as exc:
             self.db.rollback()
@@ -147,12 +340,8 @@ class AttendanceService:
         except SQLAlchemyError as exc:
             self.db.rollback()
             raise BadRequestException("Unable to save check-in attendance") from exc
-
-        return AttendanceCheckInResponse(
-            message="Check-in successful",
-            confidence=round(confidence, 4),
-            location_verified=True,
-        )
+        self._invalidate_analytics(attendance.attendance_date)
+        return attendance
 
     def check_out(self, actor: User, *, user_id: int | None = None) -> AttendanceResponse:
         target_user = self._resolve_target_user(actor, user_id)
@@ -171,14 +360,27 @@ class AttendanceService:
             raise BadRequestException("Invalid check-out time: earlier than check-in")
 
         total_minutes = int((now - check_in_time).total_seconds() // 60)
+        previous_status, previous_minutes = attendance.status, attendance.total_minutes
         attendance.check_in = check_in_time
         attendance.check_out = now
         attendance.total_minutes = total_minutes
         attendance.status = self._status_from_minutes(total_minutes)
 
+        status_deltas: dict[AttendanceStatus, int] = {}
+        if attendance.status != previous_status:
+            status_deltas = {previous_status: -1, attendance.status: 1}
+
         try:
             self.attendance_repository.update(attendance)
+            self._apply_aggregate_deltas(
+                target_user,
+                attendance,
+                status_deltas=status_deltas,
+                minutes_delta=total_minutes - previous_minutes,
+                checked_out_delta=1,
+            )
             self.db.commit()
+            self._invalidate_analytics(attendance_date)
             return AttendanceResponse.model_validate(attendance)
         except IntegrityError as exc:
             self.db.rollback()
@@ -199,6 +401,8 @@ class AttendanceService:
         end_date: date | None = None,
         page: int = 1,
         size: int = 10,
+        cursor: str | None = None,
+        include_total: bool = False,
     ) -> AttendanceListResponse:
         normalized_status = self._normalize_status(status)
         scoped_business_id, scoped_user_id, scoped_branch_id = self._resolve_list_scope(
@@ -206,6 +410,20 @@ class AttendanceService:
             requested_user_id=user_id,
             requested_branch_id=branch_id,
         )
+        if cursor is not None:
+            return self._list_attendance_after_cursor(
+                business_id=scoped_business_id,
+                user_id=scoped_user_id,
+                branch_id=scoped_branch_id,
+                status=normalized_status,
+                search=search,
+                start_date=start_date,
+                end_date=end_date,
+                size=size,
+                cursor=cursor,
+                include_total=include_total,
+            )
+
         try:
             items, total = self.attendance_repository.list_paginated(
                 business_id=scoped_business_id,
@@ -221,14 +439,116 @@ class AttendanceService:
         except SQLAlchemyError as exc:
             raise BadRequestException("Unable to read attendance list") from exc
         total_pages = (total + size - 1) // size if total > 0 else 0
+        has_more = bool(items) and page * size < total
         return AttendanceListResponse(
             items=[AttendanceResponse.model_validate(item) for item in items],
             page=page,
             size=size,
             total=total,
             total_pages=total_pages,
+            next_cursor=self._attendance_cursor(items[-1]) if has_more else None,
+        )
+
+    def _list_attendance_after_cursor(
+        self,
+        *,
+        business_id: int | None,
+        user_id: int | None,
+        branch_id: int | None,
+        status: str | None,
+        search: str | None,
+        start_date: date | None,
+        end_date: date | None,
+        size: int,
+        cursor: str,
+        include_total: bool,
+    ) -> AttendanceListResponse:
+        # An empty cursor starts from the newest row.
+        after = self._decode_attendance_cursor(cursor) if cursor else None
+        try:
+            items, has_more, total = self.attendance_repository.list_keyset(
+                business_id=business_id,
+                user_id=user_id,
+                branch_id=branch_id,
+                status=status,
+                start_date=start_date,
+                end_date=end_date,
+                search=search,
+                after=after,
+                size=size,
+                with_total=include_total,
+            )
+        except SQLAlchemyError as exc:
+            raise BadRequestException("Unable to read attendance list") from exc
+        return AttendanceListResponse(
+            items=[AttendanceResponse.model_validate(item) for item in items],
+            page=None,
+            size=size,
+            total=total,
+            total_pages=None if total is None else (total + size - 1) // size,
+            next_cursor=self._attendance_cursor(items[-1]) if has_more else None,
+        )
+
+    @staticmethod
+    def _attendance_cursor(item: Attendance) -> str:
+        return encode_cursor({"date": item.attendance_date.isoformat(), "id": item.id})
+
+    @staticmethod
+    def _decode_attendance_cursor(cursor: str) -> tuple[date, int]:
+        values = decode_cursor(cursor, keys=("date", "id"))
+        try:
+            return date.fromisoformat(values["date"]), int(values["id"])
+        except (TypeError, ValueError) as exc:
+            raise BadRequestException("Invalid cursor") from exc
+
+    def list_monthly_summary(
+        self,
+        actor: User,
+        *,
+        month: str,
+        user_id: int | None = None,
+        branch_id: int | None = None,
+        size: int = 100,
+        cursor: str | None = None,
+    ) -> AttendanceMonthlySummaryListResponse:
+        month_start = self._parse_month(month)
+        scoped_business_id, scoped_user_id, scoped_branch_id = self._resolve_list_scope(
+            actor=actor,
+            requested_user_id=user_id,
+            requested_branch_id=branch_id,
+        )
+        after_user_id = None
+        if cursor:
+            values = decode_cursor(cursor, keys=("user_id",))
+            try:
+                after_user_id = int(values["user_id"])
+            except (TypeError, ValueError) as exc:
+                raise BadRequestException("Invalid cursor") from exc
+        try:
+            items, has_more = self.attendance_summary_repository.list_for_month(
+                month_start=month_start,
+                business_id=scoped_business_id,
+                user_id=scoped_user_id,
+                branch_id=scoped_branch_id,
+                after_user_id=after_user_id,
+                size=size,
+            )
+        except SQLAlchemyError as exc:
+            raise BadRequestException("Unable to read attendance summary") from exc
+        return AttendanceMonthlySummaryListResponse(
+            month=month_start.strftime("%Y-%m"),
+            items=[AttendanceMonthlySummaryResponse.model_validate(item) for item in items],
+            size=size,
+            next_cursor=encode_cursor({"user_id": items[-1].user_id}) if has_more else None,
         )
 
+    @staticmethod
+    def _parse_month(month: str) -> date:
+        try:
+            return datetime.strptime(month.strip(), "%Y-%m").date()
+        except ValueError as exc:
+            raise BadRequestException("month must be formatted as YYYY-MM") from exc
+
     def mark_auto_absence(
         self,
         actor: User,
@@ -236,44 +556,175 @@ class AttendanceService:
         attendance_date: date,
         business_id: int | None = None,
     ) -> AutoAbsenceResponse:
-        if attendance_date.weekday() >= 5:
-            return AutoAbsenceResponse(attendance_date=attendance_date, created_count=0, skipped_existing_count=0)
-
         scoped_business_id = self._resolve_business_scope(actor, business_id)
-        user_ids = self._list_employee_user_ids(scoped_business_id)
-        if not user_ids:
-            return AutoAbsenceResponse(attendance_date=attendance_date, created_count=0, skipped_existing_count=0)
-
-        existing_user_ids = self.attendance_repository.list_existing_user_ids_for_date(user_ids, attendance_date)
-        missing_user_ids = [item for item in user_ids if item not in existing_user_ids]
-
-        if missing_user_ids:
-            for target_user_id in missing_user_ids:
-                user = self.user_repository.get_by_id(target_user_id)
-                self.db.add(
-                    Attendance(
-                        user_id=target_user_id,
-                        branch_id=user.branch_id if user else None,
-                        attendance_date=attendance_date,
-                        total_minutes=0,
-                        status=AttendanceStatus.ABSENT,
-                    )
-                )
-            try:
-                self.db.commit()
-            except IntegrityError as exc:
-                self.db.rollback()
-                raise ConflictException("Attendance already exists for one or more users on this date") from exc
-            except SQLAlchemyError as exc:
-                self.db.rollback()
-                raise BadRequestException("Unable to mark auto absence") from exc
+        return self.close_out_day(business_id=scoped_business_id, attendance_date=attendance_date)
+
+    def close_out_day(self, *, business_id: int | None, attendance_date: date) -> AutoAbsenceResponse:
+        non_working_branch_ids, unassigned_non_working = self._non_working_branches(business_id, attendance_date)
+        counts = self.attendance_repository.close_out_counts(
+            business_id=business_id,
+            attendance_date=attendance_date,
+            excluded_branch_ids=non_working_branch_ids,
+            exclude_unassigned=unassigned_non_working,
+        )
+        if counts.employee_count == 0:
+            return AutoAbsenceResponse(
+                attendance_date=attendance_date,
+                created_count=0,
+                skipped_existing_count=0,
+                skipped_leave_count=0,
+                skipped_non_working_count=0,
+            )
+
+        missing_employees = self.attendance_repository.missing_employees_query(
+            business_id=business_id,
+            attendance_date=attendance_date,
+            excluded_branch_ids=non_working_branch_ids,
+            exclude_unassigned=unassigned_non_working,
+        )
+        try:
+            # Counted before the insert, while the same predicate still selects exactly the new rows.
+            self.attendance_summary_repository.add_absences(
+                missing_employees.with_only_columns(User.id),
+                month_start=attendance_date.replace(day=1),
+            )
+            created_count = self.attendance_repository.insert_absences(
+                missing_employees,
+                attendance_date=attendance_date,
+            )
+            # A close-out touches every branch of the business, so re-aggregating the day is cheaper
+            # than one delta per branch.
+            self.attendance_rollup_repository.rebuild_range(
+                start_date=attendance_date,
+                end_date=attendance_date,
+                business_id=business_id,
+            )
+            self.db.commit()
+        except IntegrityError as exc:
+            self.db.rollback()
+            raise ConflictException("Attendance already exists for one or more users on this date") from exc
+        except SQLAlchemyError as exc:
+            self.db.rollback()
+            raise BadRequestException("Unable to mark auto absence") from exc
+        self._invalidate_analytics(attendance_date)
 
         return AutoAbsenceResponse(
             attendance_date=attendance_date,
-            created_count=len(missing_user_ids),
-            skipped_existing_count=len(existing_user_ids),
+            created_count=created_count,
+            skipped_existing_count=int(counts.existing_count),
+            skipped_leave_count=int(counts.on_leave_count),
+            skipped_non_working_count=int(counts.non_working_count),
+        )
+
+    def attendance_analytics(
+        self,
+        actor: User,
+        *,
+        start_date: date,
+        end_date: date,
+        branch_id: int | None = None,
+    ) -> AttendanceAnalyticsResponse:
+        if end_date < start_date:
+            raise BadRequestException("end_date must be greater than or equal to start_date")
+        if (end_date - start_date).days >= settings.attendance_analytics_max_days:
+            raise BadRequestException(
+                f"Date range cannot exceed {settings.attendance_analytics_max_days} days"
+            )
+        scoped_business_id, scoped_user_id, scoped_branch_id = self._resolve_list_scope(
+            actor=actor,
+            requested_user_id=None,
+            requested_branch_id=branch_id,
+        )
+        if scoped_user_id is not None:
+            raise ForbiddenException("You do not have permission to view attendance analytics")
+
+        cache_key = (scoped_business_id, scoped_branch_id, start_date, end_date)
+        cached = ATTENDANCE_ANALYTICS_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+        try:
+            rollups = self.attendance_rollup_repository.list_range(
+                business_id=scoped_business_id,
+                branch_id=scoped_branch_id,
+                start_date=start_date,
+                end_date=end_date,
+            )
+        except SQLAlchemyError as exc:
+            raise BadRequestException("Unable to read attendance analytics") from exc
+        response = AttendanceAnalyticsResponse(
+            start_date=start_date,
+            end_date=end_date,
+            items=[
+                AttendanceDailyRollupResponse(
+                    business_id=rollup.business_id,
+                    branch_id=rollup.branch_id,
+                    attendance_date=rollup.attendance_date,
+                    present_count=rollup.present_count,
+                    absent_count=rollup.absent_count,
+                    half_day_count=rollup.half_day_count,
+                    overtime_count=rollup.overtime_count,
+                    leave_count=rollup.leave_count,
+                    holiday_count=rollup.holiday_count,
+                    checked_out_count=rollup.checked_out_count,
+                    total_minutes=rollup.total_minutes,
+                    average_minutes=(
+                        round(rollup.total_minutes / rollup.checked_out_count, 2)
+                        if rollup.checked_out_count
+                        else None
+                    ),
+                )
+                for rollup in rollups
+            ],
+        )
+        ATTENDANCE_ANALYTICS_CACHE.set(cache_key, response)
+        return response
+
+    def _apply_aggregate_deltas(
+        self,
+        target_user: User,
+        attendance: Attendance,
+        *,
+        status_deltas: dict[AttendanceStatus, int],
+        minutes_delta: int = 0,
+        checked_out_delta: int = 0,
+    ) -> None:
+        self.attendance_summary_repository.apply_delta(
+            user_id=target_user.id,
+            business_id=target_user.business_id,
+            month_start=attendance.attendance_date.replace(day=1),
+            status_deltas=status_deltas,
+            minutes_delta=minutes_delta,
+        )
+        self.attendance_rollup_repository.apply_delta(
+            business_id=target_user.business_id,
+            branch_id=attendance.branch_id,
+            attendance_date=attendance.attendance_date,
+            status_deltas=status_deltas,
+            minutes_delta=minutes_delta,
+            checked_out_delta=checked_out_delta,
         )
 
+    @staticmethod
+    def _invalidate_analytics(attendance_date: date) -> None:
+        ATTENDANCE_ANALYTICS_CACHE.discard_where(
+            lambda cached: cached.start_date <= attendance_date <= cached.end_date
+        )
+
+    def _non_working_branches(self, business_id: int | None, attendance_date: date) -> tuple[set[int], bool]:
+        weekend_policy_service = WeekendPolicyService(self.db)
+        branch_ids = self.attendance_repository.list_employee_branch_ids(business_id)
+        non_working_branch_ids = {
+            branch_id
+            for branch_id in branch_ids
+            if branch_id is not None
+            and weekend_policy_service.is_non_working_day(branch_id=branch_id, target_date=attendance_date)
+        }
+        unassigned_non_working = None in branch_ids and weekend_policy_service.is_non_working_day(
+            branch_id=None,
+            target_date=attendance_date,
+        )
+        return non_working_branch_ids, unassigned_non_working
+
     def export_attendance_excel(
         self,
         actor: User,
@@ -284,11 +735,35 @@ class AttendanceService:
         search: str | None = None,
         start_date: date | None = None,
         end_date: date | None = None,
-    ) -> tuple[bytes, str]:
-        from openpyxl import Workbook
+    ) -> tuple[Iterator[bytes], str]:
+        filters = self.resolve_export_filters(
+            actor,
+            user_id=user_id,
+            branch_id=branch_id,
+            status=status,
+            search=search,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        # The finished file spills from memory to disk once it grows past the limit.
+        output = SpooledTemporaryFile(max_size=settings.export_spool_max_bytes)
+        self.render_export("excel", filters, output)
+        output.seek(0)
+        return self._iter_file_chunks(output), self.export_filename("excel")
 
-        rows = self._list_export_rows(
-            actor=actor,
+    def export_attendance_pdf(
+        self,
+        actor: User,
+        *,
+        user_id: int | None = None,
+        branch_id: int | None = None,
+        status: str | None = None,
+        search: str | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> tuple[bytes, str]:
+        filters = self.resolve_export_filters(
+            actor,
             user_id=user_id,
             branch_id=branch_id,
             status=status,
@@ -296,10 +771,74 @@ class AttendanceService:
             start_date=start_date,
             end_date=end_date,
         )
+        output = io.BytesIO()
+        self.render_export("pdf", filters, output)
+        return output.getvalue(), self.export_filename("pdf")
+
+    def resolve_export_filters(
+        self,
+        actor: User,
+        *,
+        user_id: int | None = None,
+        branch_id: int | None = None,
+        status: str | None = None,
+        search: str | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> ExportFilters:
+        normalized_status = self._normalize_status(status)
+        scoped_business_id, scoped_user_id, scoped_branch_id = self._resolve_export_scope(
+            actor=actor,
+            requested_user_id=user_id,
+            requested_branch_id=branch_id,
+        )
+        return ExportFilters(
+            business_id=scoped_business_id,
+            user_id=scoped_user_id,
+            branch_id=scoped_branch_id,
+            status=normalized_status,
+            start_date=start_date,
+            end_date=end_date,
+            search=search.strip() if search and search.strip() else None,
+        )
+
+    def render_export(
+        self,
+        export_format: str,
+        filters: ExportFilters,
+        output: IO[bytes],
+        *,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> int:
+        """Write the export for already scoped ``filters`` to ``output`` and return the row count."""
+        try:
+            rows = self.attendance_repository.iter_export_rows(
+                **filters.as_kwargs(),
+                chunk_size=settings.export_fetch_chunk_size,
+            )
+            if export_format == "pdf":
+                return self._write_pdf(rows, output, on_progress=on_progress)
+            return self._write_excel(rows, output, on_progress=on_progress)
+        except SQLAlchemyError as exc:
+            raise BadRequestException("Unable to read attendance export data") from exc
+
+    @staticmethod
+    def export_filename(export_format: str) -> str:
+        extension = "pdf" if export_format == "pdf" else "xlsx"
+        return f"attendance_export_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.{extension}"
 
-        workbook = Workbook()
-        sheet = workbook.active
-        sheet.title = "Attendance"
+    def _write_excel(
+        self,
+        rows: Iterator[Row],
+        output: IO[bytes],
+        *,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> int:
+        from openpyxl import Workbook
+
+        # Write-only mode serialises each row as it is appended instead of keeping cell objects.
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Attendance")
         sheet.append(
             [
                 "Attendance ID",
@@ -320,51 +859,82 @@ class AttendanceService:
                 "Updated At",
             ]
         )
-
-        for attendance, target_user in rows:
+        row_count = 0
+        for row in rows:
             sheet.append(
                 [
-                    attendance.id,
-                    attendance.user_id,
-                    target_user.username,
-                    self._display_name(target_user),
-                    target_user.email,
-                    target_user.business_id,
-                    attendance.branch_id,
-                    attendance.attendance_date.isoformat(),
-                    self._fmt_datetime(attendance.check_in),
-                    self._fmt_datetime(attendance.check_out),
-                    attendance.total_minutes,
-                    attendance.status.value,
-                    attendance.ip_address,
-                    attendance.device_info,
-                    self._fmt_datetime(attendance.created_at),
-                    self._fmt_datetime(attendance.updated_at),
+                    row.id,
+                    row.user_id,
+                    row.username,
+                    self._display_name(row),
+                    row.email,
+                    row.business_id,
+                    row.branch_id,
+                    row.attendance_date.isoformat(),
+                    self._fmt_datetime(row.check_in),
+                    self._fmt_datetime(row.check_out),
+                    row.total_minutes,
+                    row.status.value,
+                    row.ip_address,
+                    row.device_info,
+                    self._fmt_datetime(row.created_at),
+                    self._fmt_datetime(row.updated_at),
                 ]
             )
-
-        output = io.BytesIO()
+            row_count += 1
+            if on_progress is not None:
+                on_progress(row_count)
         workbook.save(output)
-        filename = f"attendance_export_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.xlsx"
-        return output.getvalue(), filename
+        return row_count
 
-    def export_attendance_pdf(
+    def _write_pdf(
+        self,
+        rows: Iterator[Row],
+        output: IO[bytes],
+        *,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> int:
+        row_count = 0
+
+        def table_rows() -> Iterator[list[str]]:
+            nonlocal row_count
+            for row in rows:
+                row_count += 1
+                if on_progress is not None:
+                    on_progress(row_count)
+                yield [
+                    str(row.id),
+                    str(row.user_id),
+                    self._truncate(self._display_name(row), PDF_NAME_MAX_CHARS),
+                    "" if row.branch_id is None else str(row.branch_id),
+                    row.attendance_date.isoformat(),
+                    self._fmt_datetime(row.check_in),
+                    self._fmt_datetime(row.check_out),
+                    str(row.total_minutes),
+                    row.status.value,
+                ]
+
+        render_table_pdf(
+            output,
+            header=("ID", "User", "Name", "Branch", "Date", "In", "Out", "Minutes", "Status"),
+            rows=table_rows(),
+            col_widths=PDF_COLUMN_WIDTHS,
+        )
+        return row_count
+
+    def stream_attendance_feed(
         self,
         actor: User,
         *,
+        feed_format: str,
         user_id: int | None = None,
         branch_id: int | None = None,
         status: str | None = None,
         search: str | None = None,
         start_date: date | None = None,
         end_date: date | None = None,
-    ) -> tuple[bytes, str]:
-        from reportlab.lib import colors
-        from reportlab.lib.pagesizes import landscape, letter
-        from reportlab.lib.units import mm
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
-
-        rows = self._list_export_rows(
+    ) -> tuple[Iterator[bytes], str]:
+        rows = self._iter_export_rows(
             actor=actor,
             user_id=user_id,
             branch_id=branch_id,
@@ -373,62 +943,9 @@ class AttendanceService:
             start_date=start_date,
             end_date=end_date,
         )
-
-        table_data = [
-            [
-                "ID",
-                "User",
-                "Name",
-                "Branch",
-                "Date",
-                "In",
-                "Out",
-                "Minutes",
-                "Status",
-            ]
-        ]
-        for attendance, target_user in rows:
-            table_data.append(
-                [
-                    str(attendance.id),
-                    str(attendance.user_id),
-                    self._display_name(target_user),
-                    "" if attendance.branch_id is None else str(attendance.branch_id),
-                    attendance.attendance_date.isoformat(),
-                    self._fmt_datetime(attendance.check_in),
-                    self._fmt_datetime(attendance.check_out),
-                    str(attendance.total_minutes),
-                    attendance.status.value,
-                ]
-            )
-
-        output = io.BytesIO()
-        doc = SimpleDocTemplate(
-            output,
-            pagesize=landscape(letter),
-            leftMargin=10 * mm,
-            rightMargin=10 * mm,
-            topMargin=8 * mm,
-            bottomMargin=8 * mm,
-        )
-        table = Table(table_data, repeatRows=1)
-        table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#E5E7EB")),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, -1), 8),
-                    ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                ]
-            )
-        )
-        doc.build([table])
-
-        filename = f"attendance_export_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.pdf"
-        return output.getvalue(), filename
+        if feed_format == "csv":
+            return self._buffer_feed(self._csv_feed_lines(rows)), "text/csv"
+        return self._buffer_feed(self._ndjson_feed_lines(rows)), "application/x-ndjson"
 
     def _validate_branch_geofence(self, target_user: User, *, latitude: float, longitude: float):
         if target_user.branch_id is None:
@@ -473,13 +990,6 @@ class AttendanceService:
             raise ForbiddenException("Cross-business access is forbidden")
         return actor.business_id
 
-    def _list_employee_user_ids(self, business_id: int | None) -> list[int]:
-        query = self.db.query(User.id).filter(User.role == RoleEnum.BUSINESS_EMPLOYEE)
-        if business_id is not None:
-            query = query.filter(User.business_id == business_id)
-        rows = query.all()
-        return [int(item[0]) for item in rows]
-
     def _resolve_list_scope(
         self,
         *,
@@ -563,12 +1073,7 @@ class AttendanceService:
         return scoped_business_id, requested_user_id, actor.branch_id
 
     def _has_permission(self, actor: User, permission_name: str) -> bool:
-        if actor.role_id is None:
-            return False
-        return self.role_permission_repository.has_permission_for_role(
-            role_id=actor.role_id,
-            permission_name=permission_name,
-        )
+        return role_has_permission(self.db, actor.role_id, permission_name)
 
     def _ensure_user_accessible(self, actor: User, user_id: int) -> None:
         target_user = self.user_repository.get_by_id(user_id)
@@ -582,7 +1087,7 @@ class AttendanceService:
             raise NotFoundException("Branch not found")
         ensure_same_business_or_master(actor, branch.business_id)
 
-    def _list_export_rows(
+    def _iter_export_rows(
         self,
         *,
         actor: User,
@@ -592,26 +1097,95 @@ class AttendanceService:
         search: str | None,
         start_date: date | None,
         end_date: date | None,
-    ) -> list[tuple[Attendance, User]]:
-        normalized_status = self._normalize_status(status)
-        scoped_business_id, scoped_user_id, scoped_branch_id = self._resolve_export_scope(
-            actor=actor,
-            requested_user_id=user_id,
-            requested_branch_id=branch_id,
+    ) -> Iterator[Row]:
+        filters = self.resolve_export_filters(
+            actor,
+            user_id=user_id,
+            branch_id=branch_id,
+            status=status,
+            search=search,
+            start_date=start_date,
+            end_date=end_date,
         )
         try:
-            return self.attendance_repository.list_for_export(
-                business_id=scoped_business_id,
-                user_id=scoped_user_id,
-                branch_id=scoped_branch_id,
-                status=normalized_status,
-                start_date=start_date,
-                end_date=end_date,
-                search=search,
+            return self.attendance_repository.iter_export_rows(
+                **filters.as_kwargs(),
+                chunk_size=settings.export_fetch_chunk_size,
             )
         except SQLAlchemyError as exc:
             raise BadRequestException("Unable to read attendance export data") from exc
 
+    @staticmethod
+    def _iter_file_chunks(file: IO[bytes]) -> Iterator[bytes]:
+        try:
+            while chunk := file.read(EXPORT_STREAM_CHUNK_SIZE):
+                yield chunk
+        finally:
+            file.close()
+
+    def _feed_record(self, row: Row) -> dict[str, object]:
+        return {
+            "id": row.id,
+            "user_id": row.user_id,
+            "username": row.username,
+            "name": self._display_name(row),
+            "email": row.email,
+            "business_id": row.business_id,
+            "branch_id": row.branch_id,
+            "attendance_date": row.attendance_date.isoformat(),
+            "check_in": self._iso_datetime(row.check_in),
+            "check_out": self._iso_datetime(row.check_out),
+            "total_minutes": row.total_minutes,
+            "status": row.status.value,
+            "ip_address": row.ip_address,
+            "device_info": row.device_info,
+            "created_at": self._iso_datetime(row.created_at),
+            "updated_at": self._iso_datetime(row.updated_at),
+        }
+
+    def _ndjson_feed_lines(self, rows: Iterator[Row]) -> Iterator[str]:
+        for row in rows:
+            yield json.dumps(self._feed_record(row), separators=(",", ":")) + "\n"
+
+    def _csv_feed_lines(self, rows: Iterator[Row]) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(FEED_COLUMNS)
+        for row in rows:
+            record = self._feed_record(row)
+            writer.writerow(["" if record[column] is None else record[column] for column in FEED_COLUMNS])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    def _buffer_feed(lines: Iterator[str]) -> Iterator[bytes]:
+        # The response pulls the next chunk only after the previous one was sent, so a slow client
+        # holds the cursor back instead of rows piling up in memory.
+        pending: list[str] = []
+        last_flush = monotonic()
+        for line in lines:
+            pending.append(line)
+            if (
+                len(pending) >= settings.attendance_feed_flush_rows
+                or monotonic() - last_flush >= settings.attendance_feed_flush_seconds
+            ):
+                yield "".join(pending).encode("utf-8")
+                pending.clear()
+                last_flush = monotonic()
+        if pending:
+            yield "".join(pending).encode("utf-8")
+
+    @staticmethod
+    def _iso_datetime(value: datetime | None) -> str | None:
+        if value is None:
+            return None
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).isoformat()
+
     @staticmethod
     def _display_name(target_user: User) -> str:
         if target_user.name and target_user.name.strip():
@@ -619,6 +1193,10 @@ class AttendanceService:
         parts = [target_user.first_name, target_user.middle_name, target_user.last_name]
         return " ".join(part.strip() for part in parts if part and part.strip())
 
+    @staticmethod
+    def _truncate(value: str, max_chars: int) -> str:
+        return value if len(value) <= max_chars else value[: max_chars - 1] + "\u2026"
+
     @staticmethod
     def _fmt_datetime(value: datetime | None) -> str:
         if value is None:
@@ -656,12 +1234,28 @@ class AttendanceService:
         c = 2 * asin(sqrt(a))
         return earth_radius_m * c
 
-    def _extract_encoding(self, *, image_base64: str | None, image_bytes: bytes | None) -> list[float]:
-        if image_bytes is not None:
-            return self.face_verification_service.extract_face_encoding_from_bytes(image_bytes)
-        if image_base64 is not None:
-            return self.face_verification_service.extract_face_encoding(image_base64)
-        raise BadRequestException("Image is required")
+    def _load_branch_face_rows(self, branch_id: int) -> list[tuple[int, np.ndarray]]:
+        rows: list[tuple[int, np.ndarray]] = []
+        for user_id, embedding, legacy_encoding in self.user_repository.list_face_embeddings_for_branch(branch_id):
+            try:
+                encoding = self.face_verification_service.deserialize_encoding(embedding or legacy_encoding)
+            except BadRequestException:
+                continue
+            rows.append((user_id, encoding))
+        return rows
+
+    def _stored_face_encoding(self, user: User) -> np.ndarray | None:
+        if user.face_embedding:
+            return self.face_verification_service.deserialize_encoding(user.face_embedding)
+        if user.face_encoding:
+            return self.face_verification_service.deserialize_encoding(user.face_encoding)
+        return None
+
+    @staticmethod
+    def _extract_encoding(*, image_base64: str | None, image_bytes: bytes | None) -> list[float]:
+        if image_bytes is None and image_base64 is None:
+            raise BadRequestException("Image is required")
+        return FACE_WORKER_POOL.extract_encoding(image_base64=image_base64, image_bytes=image_bytes)
 
     @staticmethod
     def _normalize_status(status: str | None) -> str | None:
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import calendar
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import BadRequestException
+from app.repository.attendance_rollup_repository import AttendanceRollupRepository
+from app.repository.attendance_summary_repository import AttendanceSummaryRepository
+
+
+@dataclass(frozen=True)
+class SummaryRebuildResult:
+    month_start: date
+    row_count: int
+
+
+class AttendanceSummaryService:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+        self.attendance_summary_repository = AttendanceSummaryRepository(db)
+        self.attendance_rollup_repository = AttendanceRollupRepository(db)
+
+    def rebuild(
+        self,
+        *,
+        start_month: date,
+        end_month: date,
+        business_id: int | None = None,
+    ) -> list[SummaryRebuildResult]:
+        if end_month < start_month:
+            raise BadRequestException("end month must be on or after start month")
+        results: list[SummaryRebuildResult] = []
+        # One transaction per month keeps each rebuild short and lets a failed range resume.
+        for month_start in self._months(start_month, end_month):
+            month_end = month_start.replace(day=calendar.monthrange(month_start.year, month_start.month)[1])
+            try:
+                row_count = self.attendance_summary_repository.rebuild_month(
+                    month_start=month_start,
+                    month_end=month_end,
+                    business_id=business_id,
+                )
+                self.attendance_rollup_repository.rebuild_range(
+                    start_date=month_start,
+                    end_date=month_end,
+                    business_id=business_id,
+                )
+                self.db.commit()
+            except SQLAlchemyError as exc:
+                self.db.rollback()
+                raise BadRequestException(f"Unable to rebuild attendance summary for {month_start:%Y-%m}") from exc
+            results.append(SummaryRebuildResult(month_start=month_start, row_count=row_count))
+        return results
+
+    @staticmethod
+    def _months(start_month: date, end_month: date) -> Iterator[date]:
+        month_start = start_month.replace(day=1)
+        while month_start <= end_month:
+            yield month_start
+            if month_start.month == 12:
+                month_start = month_start.replace(year=month_start.year + 1, month=1)
+            else:
+                month_start = month_start.replace(month=month_start.month + 1)
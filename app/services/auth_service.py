@@ -2,7 +2,9 @@ from datetime import datetime, timezone
 
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.exceptions import UnauthorizedException
+from app.core.revocation import REVOKED_TOKENS
 from app.core.security import create_access_token, decode_access_token, verify_password
 from app.repository.revoked_token_repository import RevokedTokenRepository
 from app.repository.user_repository import UserRepository
@@ -43,5 +45,17 @@ class AuthService:
                 raise UnauthorizedException("Invalid token expiry")
             self.revoked_token_repository.create(jti=jti, expires_at=expires_at)
             self.db.commit()
+        REVOKED_TOKENS.add(jti)
 
         return LogoutResponse(detail="Logout successfully")
+
+    def purge_expired_revoked_tokens(self) -> int:
+        now = datetime.now(timezone.utc)
+        chunk_size = max(1, settings.revoked_token_purge_chunk_size)
+        purged = 0
+        while True:
+            deleted = self.revoked_token_repository.delete_expired_chunk(now, limit=chunk_size)
+            self.db.commit()
+            purged += deleted
+            if deleted < chunk_size:
+                return purged
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.face_verification_service import (
+    FACE_EMBEDDING_DIMENSIONS,
+    FACE_EMBEDDING_DTYPE,
+    FaceVerificationService,
+)
+
+
+@dataclass(frozen=True)
+class BranchFaceIndex:
+    user_ids: np.ndarray
+    encodings: np.ndarray
+    built_at: float
+
+    @classmethod
+    def empty(cls) -> BranchFaceIndex:
+        return cls(
+            user_ids=np.empty((0,), dtype=np.int64),
+            encodings=np.empty((0, FACE_EMBEDDING_DIMENSIONS), dtype=FACE_EMBEDDING_DTYPE),
+            built_at=monotonic(),
+        )
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple[int, np.ndarray]]) -> BranchFaceIndex:
+        items = list(rows)
+        if not items:
+            return cls.empty()
+        return cls(
+            user_ids=np.fromiter((user_id for user_id, _ in items), dtype=np.int64, count=len(items)),
+            encodings=np.vstack([encoding for _, encoding in items]).astype(FACE_EMBEDDING_DTYPE, copy=False),
+            built_at=monotonic(),
+        )
+
+    def __len__(self) -> int:
+        return int(self.user_ids.shape[0])
+
+    def with_user(self, user_id: int, encoding: np.ndarray) -> BranchFaceIndex:
+        base = self.without_user(user_id)
+        return BranchFaceIndex(
+            user_ids=np.append(base.user_ids, np.int64(user_id)),
+            encodings=np.vstack([base.encodings, np.asarray(encoding, dtype=FACE_EMBEDDING_DTYPE)]),
+            built_at=self.built_at,
+        )
+
+    def without_user(self, user_id: int) -> BranchFaceIndex:
+        keep = self.user_ids != user_id
+        if bool(keep.all()):
+            return self
+        return BranchFaceIndex(user_ids=self.user_ids[keep], encodings=self.encodings[keep], built_at=self.built_at)
+
+
+@dataclass(frozen=True)
+class FaceIdentification:
+    user_id: int | None
+    distance: float | None
+    runner_up_distance: float | None
+    is_ambiguous: bool
+
+
+class BranchFaceIndexRegistry:
+    """Per-branch matrices of enrolled encodings for 1:N kiosk identification.
+
+    Indexes are immutable snapshots: readers search without locking and writers swap in a new
+    snapshot. Writes from this process are applied incrementally; the TTL bounds how long changes
+    made by other workers can stay invisible.
+    """
+
+    def __init__(self, *, ttl_seconds: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = Lock()
+        self._indexes: dict[int, BranchFaceIndex] = {}
+
+    def get(self, branch_id: int, loader: Callable[[], Iterable[tuple[int, np.ndarray]]]) -> BranchFaceIndex:
+        index = self._indexes.get(branch_id)
+        if index is not None and monotonic() - index.built_at < self.ttl_seconds:
+            return index
+        fresh = BranchFaceIndex.from_rows(loader())
+        with self._lock:
+            self._indexes[branch_id] = fresh
+        return fresh
+
+    def upsert_user(self, branch_id: int, user_id: int, encoding: np.ndarray) -> None:
+        with self._lock:
+            index = self._indexes.get(branch_id)
+            if index is not None:
+                self._indexes[branch_id] = index.with_user(user_id, encoding)
+
+    def discard_user(self, branch_id: int | None, user_id: int) -> None:
+        if branch_id is None:
+            return
+        with self._lock:
+            index = self._indexes.get(branch_id)
+            if index is not None:
+                self._indexes[branch_id] = index.without_user(user_id)
+
+    def move_user(
+        self,
+        user_id: int,
+        *,
+        from_branch_id: int | None,
+        to_branch_id: int | None,
+        encoding: np.ndarray | None,
+    ) -> None:
+        self.discard_user(from_branch_id, user_id)
+        if to_branch_id is None:
+            return
+        if encoding is None:
+            self.discard_user(to_branch_id, user_id)
+        else:
+            self.upsert_user(to_branch_id, user_id, encoding)
+
+    def invalidate_branch(self, branch_id: int) -> None:
+        with self._lock:
+            self._indexes.pop(branch_id, None)
+
+    @staticmethod
+    def identify(index: BranchFaceIndex, live: np.ndarray, *, ambiguity_margin: float) -> FaceIdentification:
+        if len(index) == 0:
+            return FaceIdentification(user_id=None, distance=None, runner_up_distance=None, is_ambiguous=False)
+
+        distances = FaceVerificationService.face_distances(index.encodings, live)
+        if len(index) == 1:
+            return FaceIdentification(
+                user_id=int(index.user_ids[0]),
+                distance=float(distances[0]),
+                runner_up_distance=None,
+                is_ambiguous=False,
+            )
+
+        # Only the two nearest rows matter; argpartition avoids sorting thousands of distances.
+        nearest = np.argpartition(distances, 1)[:2]
+        best, runner_up = sorted(nearest.tolist(), key=lambda position: distances[position])
+        best_distance = float(distances[best])
+        runner_up_distance = float(distances[runner_up])
+        return FaceIdentification(
+            user_id=int(index.user_ids[best]),
+            distance=best_distance,
+            runner_up_distance=runner_up_distance,
+            is_ambiguous=runner_up_distance - best_distance < ambiguity_margin,
+        )
+
+
+BRANCH_FACE_INDEX = BranchFaceIndexRegistry(ttl_seconds=settings.face_index_ttl_seconds)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class ExportJobPool:
+    """Background threads that render export jobs outside the request that created them.
+
+    Rendering is dominated by database reads and file writes, so threads are enough. With
+    ``workers`` set to 0 jobs run inline, which is what tests and one-off scripts want.
+    """
+
+    def __init__(self, *, workers: int) -> None:
+        self.workers = workers
+        self._lock = Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._queued: dict[Future[None], tuple[object, ...]] = {}
+
+    def submit(self, fn: Callable[..., None], *args: object) -> Future[None] | None:
+        if self.workers <= 0:
+            fn(*args)
+            return None
+        future = self._get_executor().submit(fn, *args)
+        with self._lock:
+            self._queued[future] = args
+        future.add_done_callback(self._forget)
+        future.add_done_callback(self._log_failure)
+        return future
+
+    def shutdown(self) -> list[tuple[object, ...]]:
+        """Stop taking work and return the arguments of the jobs dropped from the queue."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            queued = dict(self._queued)
+        if executor is None:
+            return []
+        executor.shutdown(wait=False, cancel_futures=True)
+        return [args for future, args in queued.items() if future.cancelled()]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="export-job")
+            return self._executor
+
+    def _forget(self, future: Future[None]) -> None:
+        with self._lock:
+            self._queued.pop(future, None)
+
+    @staticmethod
+    def _log_failure(future: Future[None]) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("export job crashed", exc_info=future.exception())
+
+
+EXPORT_JOB_POOL = ExportJobPool(workers=settings.export_job_workers)
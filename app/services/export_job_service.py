@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Collection
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from hashlib import sha256
+from pathlib import Path
+from uuid import uuid4
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.exceptions import ConflictException, NotFoundException
+from app.models.export_job import ExportJob, ExportJobStatus
+from app.models.user import User
+from app.repository.attendance_repository import AttendanceRepository
+from app.repository.export_job_repository import ExportJobRepository
+from app.schemas.attendance import ExportJobResponse
+from app.services.attendance_service import AttendanceService, ExportFilters
+from app.services.export_job_pool import EXPORT_JOB_POOL
+
+
+logger = logging.getLogger(__name__)
+
+EXPORT_MEDIA_TYPES = {
+    "excel": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "pdf": "application/pdf",
+}
+EXPORT_EXTENSIONS = {"excel": "xlsx", "pdf": "pdf"}
+EXPORT_JOB_PURGE_CHUNK_SIZE = 500
+EXPORT_JOB_INTERRUPTED = "Export job was interrupted, please request it again"
+
+
+@dataclass(frozen=True)
+class ExportDownload:
+    path: Path
+    filename: str
+    media_type: str
+
+
+class ExportJobService:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+        self.export_job_repository = ExportJobRepository(db)
+        self.attendance_repository = AttendanceRepository(db)
+        self.attendance_service = AttendanceService(db)
+
+    def create_job(
+        self,
+        actor: User,
+        *,
+        export_format: str,
+        user_id: int | None = None,
+        branch_id: int | None = None,
+        status: str | None = None,
+        search: str | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> ExportJobResponse:
+        filters = self.attendance_service.resolve_export_filters(
+            actor,
+            user_id=user_id,
+            branch_id=branch_id,
+            status=status,
+            search=search,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        filters_json = filters.to_json()
+        # The filters are already scoped, so two actors with the same key see exactly the same rows.
+        cache_key = sha256(f"{export_format}:{filters_json}".encode("utf-8")).hexdigest()
+        total_rows, last_updated_at = self.attendance_repository.export_watermark(**filters.as_kwargs())
+        watermark = f"{total_rows}:{'-' if last_updated_at is None else self._as_utc(last_updated_at).isoformat()}"
+
+        reused = self._reuse_existing(actor, cache_key=cache_key, watermark=watermark)
+        if reused is not None:
+            return self._to_response(reused)
+
+        job = self.export_job_repository.create(
+            ExportJob(
+                public_id=uuid4().hex,
+                requested_by=actor.id,
+                export_format=export_format,
+                filters=filters_json,
+                cache_key=cache_key,
+                watermark=watermark,
+                status=ExportJobStatus.PENDING,
+                total_rows=total_rows,
+            )
+        )
+        self.db.commit()
+        EXPORT_JOB_POOL.submit(run_export_job, job.id)
+        self.db.refresh(job)
+        return self._to_response(job)
+
+    def get_job(self, actor: User, public_id: str) -> ExportJobResponse:
+        job = self._get_owned_job(actor, public_id)
+        if job.status == ExportJobStatus.RUNNING and self._is_stale(job):
+            # The node rendering it went away; report it instead of leaving the client polling forever.
+            # A worker that finished in the meantime wins: the update only touches still-active rows.
+            self.export_job_repository.finish(
+                job.id,
+                status=ExportJobStatus.FAILED,
+                now=datetime.now(timezone.utc),
+                error=EXPORT_JOB_INTERRUPTED,
+            )
+            self.db.commit()
+            self.db.refresh(job)
+        return self._to_response(job)
+
+    def download(self, actor: User, public_id: str) -> ExportDownload:
+        job = self._get_owned_job(actor, public_id)
+        if job.status != ExportJobStatus.COMPLETED or job.file_path is None:
+            raise ConflictException("Export is not ready yet")
+        file_path = Path(job.file_path)
+        if not file_path.is_file():
+            raise NotFoundException("Export file has expired, please request it again")
+        return ExportDownload(
+            path=file_path,
+            filename=job.filename or file_path.name,
+            media_type=EXPORT_MEDIA_TYPES[job.export_format],
+        )
+
+    def purge_expired(self) -> int:
+        """Delete finished jobs past their retention together with files no remaining job shares.
+
+        Retention never ends before the reuse window, so a file is not removed while it can still
+        be handed out to a new request.
+        """
+        retention = max(settings.export_job_retention_seconds, settings.export_job_result_ttl_seconds)
+        finished_before = datetime.now(timezone.utc) - timedelta(seconds=retention)
+        purged = 0
+        while True:
+            expired = self.export_job_repository.list_expired_chunk(
+                finished_before,
+                limit=EXPORT_JOB_PURGE_CHUNK_SIZE,
+            )
+            if not expired:
+                return purged
+            self.export_job_repository.delete_by_ids([job_id for job_id, _ in expired])
+            file_paths = {file_path for _, file_path in expired if file_path is not None}
+            orphaned = file_paths - self.export_job_repository.paths_in_use(file_paths)
+            self.db.commit()
+            for file_path in orphaned:
+                try:
+                    Path(file_path).unlink(missing_ok=True)
+                except OSError:
+                    logger.warning("could not delete export file %s", file_path, exc_info=True)
+            purged += len(expired)
+            if len(expired) < EXPORT_JOB_PURGE_CHUNK_SIZE:
+                return purged
+
+    def run(self, job_id: int, *, on_progress: Callable[[int], None] | None = None) -> None:
+        if not self.export_job_repository.claim(job_id, now=datetime.now(timezone.utc)):
+            self.db.rollback()
+            return
+        self.db.commit()
+        job = self.db.get(ExportJob, job_id)
+        if job is None:
+            return
+
+        export_dir = Path(settings.upload_root_dir).resolve() / "exports"
+        final_path = export_dir / f"{job.public_id}.{EXPORT_EXTENSIONS[job.export_format]}"
+        partial_path = final_path.with_name(f"{final_path.name}.part")
+        try:
+            export_dir.mkdir(parents=True, exist_ok=True)
+            with partial_path.open("wb") as output:
+                row_count = self.attendance_service.render_export(
+                    job.export_format,
+                    ExportFilters.from_json(job.filters),
+                    output,
+                    on_progress=on_progress,
+                )
+            partial_path.replace(final_path)
+        except Exception as exc:
+            self.db.rollback()
+            partial_path.unlink(missing_ok=True)
+            logger.exception("export job %s failed", job.public_id)
+            self.export_job_repository.finish(
+                job_id,
+                status=ExportJobStatus.FAILED,
+                now=datetime.now(timezone.utc),
+                error=str(exc) or exc.__class__.__name__,
+            )
+            self.db.commit()
+            return
+
+        completed = self.export_job_repository.finish(
+            job_id,
+            status=ExportJobStatus.COMPLETED,
+            now=datetime.now(timezone.utc),
+            row_count=row_count,
+            file_path=str(final_path),
+            filename=AttendanceService.export_filename(job.export_format),
+        )
+        self.db.commit()
+        if not completed:
+            # Already reported as failed to the requester; nothing will ever point at this file.
+            logger.warning("export job %s finished after it was marked failed", job.public_id)
+            final_path.unlink(missing_ok=True)
+
+    def fail_unstarted(self, job_ids: Collection[int]) -> int:
+        """Mark jobs dropped from this node's queue as failed so their requesters stop polling."""
+        failed = self.export_job_repository.fail_active(
+            job_ids,
+            now=datetime.now(timezone.utc),
+            error=EXPORT_JOB_INTERRUPTED,
+        )
+        self.db.commit()
+        return failed
+
+    def _reuse_existing(self, actor: User, *, cache_key: str, watermark: str) -> ExportJob | None:
+        now = datetime.now(timezone.utc)
+        candidates = self.export_job_repository.find_reusable(
+            cache_key=cache_key,
+            watermark=watermark,
+            completed_after=now - timedelta(seconds=settings.export_job_result_ttl_seconds),
+            active_after=now - timedelta(seconds=settings.export_job_stale_after_seconds),
+        )
+        for candidate in candidates:
+            if candidate.status != ExportJobStatus.COMPLETED:
+                # Another actor's in-flight job can not be handed out; their own can.
+                if candidate.requested_by == actor.id:
+                    return candidate
+                continue
+            if candidate.file_path is None or not Path(candidate.file_path).is_file():
+                continue
+            if candidate.requested_by == actor.id:
+                return candidate
+            job = self.export_job_repository.create(
+                ExportJob(
+                    public_id=uuid4().hex,
+                    requested_by=actor.id,
+                    export_format=candidate.export_format,
+                    filters=candidate.filters,
+                    cache_key=cache_key,
+                    watermark=watermark,
+                    status=ExportJobStatus.COMPLETED,
+                    row_count=candidate.row_count,
+                    total_rows=candidate.total_rows,
+                    file_path=candidate.file_path,
+                    filename=candidate.filename,
+                    started_at=now,
+                    finished_at=now,
+                )
+            )
+            self.db.commit()
+            return job
+        return None
+
+    def _get_owned_job(self, actor: User, public_id: str) -> ExportJob:
+        job = self.export_job_repository.get_by_public_id(public_id)
+        if job is None or job.requested_by != actor.id:
+            raise NotFoundException("Export job not found")
+        return job
+
+    @classmethod
+    def _is_stale(cls, job: ExportJob) -> bool:
+        # Measured from the last sign of life of the worker, not from creation: queue time does not count.
+        last_seen = job.heartbeat_at or job.started_at
+        if last_seen is None:
+            return False
+        return datetime.now(timezone.utc) - cls._as_utc(last_seen) > timedelta(
+            seconds=settings.export_job_stale_after_seconds
+        )
+
+    @staticmethod
+    def _to_response(job: ExportJob) -> ExportJobResponse:
+        if job.status == ExportJobStatus.COMPLETED:
+            progress = 1.0
+        elif job.total_rows:
+            progress = min(1.0, job.row_count / job.total_rows)
+        else:
+            progress = 0.0
+        return ExportJobResponse(
+            job_id=job.public_id,
+            format=job.export_format,
+            status=job.status,
+            row_count=job.row_count,
+            total_rows=job.total_rows,
+            progress=round(progress, 4),
+            download_url=(
+                f"/attendance/export/jobs/{job.public_id}/download"
+                if job.status == ExportJobStatus.COMPLETED
+                else None
+            ),
+            error=job.error,
+            created_at=job.created_at,
+            finished_at=job.finished_at,
+        )
+
+    @staticmethod
+    def _as_utc(value: datetime) -> datetime:
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
+
+def run_export_job(job_id: int) -> None:
+    """Worker entry point; progress is committed on its own session so the row cursor stays open."""
+    db = SessionLocal()
+    progress_db = SessionLocal()
+    every = max(1, settings.export_job_progress_every_rows)
+
+    def report(row_count: int) -> None:
+        if row_count % every:
+            return
+        ExportJobRepository(progress_db).set_progress(job_id, row_count, now=datetime.now(timezone.utc))
+        progress_db.commit()
+
+    try:
+        ExportJobService(db).run(job_id, on_progress=report)
+    finally:
+        progress_db.close()
+        db.close()
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from threading import BoundedSemaphore, Lock
+from time import perf_counter
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableException, TooManyRequestsException
+from app.services.face_verification_service import FaceVerificationService
+
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_worker() -> None:
+    # Importing face_recognition loads the dlib detector, landmark and encoder models; running one
+    # detection on a blank frame primes the HOG pipeline so the first real selfie is not penalised.
+    try:
+        import face_recognition  # type: ignore
+    except ModuleNotFoundError:
+        return
+    face_recognition.face_locations(np.zeros((64, 64, 3), dtype=np.uint8))
+
+
+def _noop() -> None:
+    return None
+
+
+def _extract_encoding_job(
+    image_base64: str | None,
+    image_bytes: bytes | None,
+) -> tuple[list[float], dict[str, float]]:
+    return FaceVerificationService().extract_face_encoding_timed(
+        image_base64=image_base64,
+        image_bytes=image_bytes,
+    )
+
+
+class FaceWorkerPool:
+    """Runs face encoding in dedicated processes so dlib never blocks the API workers.
+
+    At most ``processes + max_queue`` jobs are in flight; further submissions are rejected
+    immediately with 429 instead of piling up behind the check-in spike. A job whose caller
+    timed out keeps its slot until its worker actually finishes it.
+    """
+
+    def __init__(self, *, processes: int, max_queue: int, timeout_seconds: float) -> None:
+        self.processes = processes
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        self._slots = BoundedSemaphore(max(1, processes) + max(0, max_queue))
+        self._lock = Lock()
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.processes > 0
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        executor = self._get_executor()
+        # Force every worker to spawn (and run the warm-up initializer) before traffic arrives.
+        for future in [executor.submit(_noop) for _ in range(self.processes)]:
+            future.result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def extract_encoding(
+        self,
+        *,
+        image_base64: str | None = None,
+        image_bytes: bytes | None = None,
+    ) -> list[float]:
+        if not self._slots.acquire(blocking=False):
+            raise TooManyRequestsException("Face verification is busy, please retry shortly")
+        submitted = perf_counter()
+        if self.enabled:
+            encoding, timings = self._run_in_pool(image_base64=image_base64, image_bytes=image_bytes)
+        else:
+            try:
+                encoding, timings = _extract_encoding_job(image_base64, image_bytes)
+            finally:
+                self._slots.release()
+
+        total_ms = (perf_counter() - submitted) * 1000
+        queue_ms = max(0.0, total_ms - sum(timings.values()))
+        logger.info(
+            "face encoding queue=%.1fms decode=%.1fms locate=%.1fms encode=%.1fms total=%.1fms",
+            queue_ms,
+            timings.get("decode_ms", 0.0),
+            timings.get("locate_ms", 0.0),
+            timings.get("encode_ms", 0.0),
+            total_ms,
+        )
+        return encoding
+
+    def _run_in_pool(
+        self,
+        *,
+        image_base64: str | None,
+        image_bytes: bytes | None,
+    ) -> tuple[list[float], dict[str, float]]:
+        try:
+            future = self._get_executor().submit(_extract_encoding_job, image_base64, image_bytes)
+        except BrokenProcessPool:
+            self._slots.release()
+            self._reset_executor()
+            raise ServiceUnavailableException("Face verification is temporarily unavailable")
+        except BaseException:
+            self._slots.release()
+            raise
+        # cancel() can not stop a job already running in a worker, so the slot is only freed once the
+        # future settles (finished, failed, cancelled while queued, or dropped with a broken pool).
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout_seconds)
+        except FutureTimeoutError as exc:
+            future.cancel()
+            raise ServiceUnavailableException("Face verification timed out, please retry") from exc
+        except BrokenProcessPool as exc:
+            self._reset_executor()
+            raise ServiceUnavailableException("Face verification is temporarily unavailable") from exc
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker,
+                )
+            return self._executor
+
+    def _reset_executor(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+FACE_WORKER_POOL = FaceWorkerPool(
+    processes=settings.face_worker_processes,
+    max_queue=settings.face_worker_max_queue,
+    timeout_seconds=settings.face_worker_timeout_seconds,
+)
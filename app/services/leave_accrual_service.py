@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.repository.employee_leave_balance_repository import EmployeeLeaveBalanceRepository, RolloverCounts
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROLLOVER_CHUNK_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class LeaveRolloverResult:
+    leave_year: int
+    chunks: int
+    rolled_over: int
+    created: int
+
+
+class LeaveAccrualService:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+        self.balance_repository = EmployeeLeaveBalanceRepository(db)
+
+    def roll_over(
+        self,
+        *,
+        leave_year: int,
+        business_id: int | None = None,
+        chunk_size: int = DEFAULT_ROLLOVER_CHUNK_SIZE,
+    ) -> LeaveRolloverResult:
+        """Allocate ``leave_year`` balances for every employee with an employment type.
+
+        Each chunk of users is one transaction, so an interrupted run resumes by running again:
+        balances already in ``leave_year`` are skipped.
+        """
+        chunks = rolled_over = created = 0
+        after_user_id = 0
+        while True:
+            bounds = self.balance_repository.next_rollover_chunk(
+                after_user_id=after_user_id,
+                limit=chunk_size,
+                business_id=business_id,
+            )
+            if bounds is None:
+                break
+            first_user_id, last_user_id = bounds
+            counts = self._roll_over_chunk(first_user_id, last_user_id, leave_year, business_id)
+            chunks += 1
+            rolled_over += counts.rolled_over
+            created += counts.created
+            after_user_id = last_user_id
+            logger.info(
+                "leave rollover year=%d users=%d..%d rolled_over=%d created=%d",
+                leave_year,
+                first_user_id,
+                last_user_id,
+                counts.rolled_over,
+                counts.created,
+            )
+        return LeaveRolloverResult(leave_year=leave_year, chunks=chunks, rolled_over=rolled_over, created=created)
+
+    def _roll_over_chunk(
+        self,
+        first_user_id: int,
+        last_user_id: int,
+        leave_year: int,
+        business_id: int | None,
+    ) -> RolloverCounts:
+        try:
+            try:
+                return self._apply_chunk(first_user_id, last_user_id, leave_year, business_id)
+            except IntegrityError:
+                # A leave request created one of the balances meanwhile; the retry rolls it over instead.
+                self.db.rollback()
+                return self._apply_chunk(first_user_id, last_user_id, leave_year, business_id)
+        except SQLAlchemyError:
+            self.db.rollback()
+            logger.exception(
+                "leave rollover failed year=%d users=%d..%d; earlier chunks are committed, re-run to resume",
+                leave_year,
+                first_user_id,
+                last_user_id,
+            )
+            raise
+
+    def _apply_chunk(
+        self,
+        first_user_id: int,
+        last_user_id: int,
+        leave_year: int,
+        business_id: int | None,
+    ) -> RolloverCounts:
+        counts = self.balance_repository.roll_over_chunk(
+            first_user_id=first_user_id,
+            last_user_id=last_user_id,
+            leave_year=leave_year,
+            business_id=business_id,
+        )
+        self.db.commit()
+        return counts
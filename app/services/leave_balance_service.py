@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import BadRequestException, ForbiddenException
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.role import RoleEnum
+from app.models.user import User
+from app.repository.employee_leave_balance_repository import EmployeeLeaveBalanceRepository
+from app.schemas.leave_balance import (
+    LeaveBalanceCell,
+    LeaveBalanceGridItem,
+    LeaveBalanceGridResponse,
+    LeaveBalanceMaterializeRequest,
+    LeaveBalanceMaterializeResponse,
+)
+
+
+class LeaveBalanceService:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+        self.balance_repository = EmployeeLeaveBalanceRepository(db)
+
+    def list_grid(
+        self,
+        actor: User,
+        *,
+        business_id: int | None = None,
+        branch_id: int | None = None,
+        leave_type_id: int | None = None,
+        size: int = 100,
+        cursor: str | None = None,
+    ) -> LeaveBalanceGridResponse:
+        """Every employee's balance per leave type, read-only.
+
+        Balances nobody has initialized yet are reported from the leave master (nothing used,
+        ``materialized`` false) instead of being inserted on read.
+        """
+        scoped_business_id = self._resolve_business_scope(actor, business_id)
+        after_user_id = None
+        if cursor:
+            values = decode_cursor(cursor, keys=("user_id",))
+            try:
+                after_user_id = int(values["user_id"])
+            except (TypeError, ValueError) as exc:
+                raise BadRequestException("Invalid cursor") from exc
+
+        rows, has_more = self.balance_repository.list_grid(
+            business_id=scoped_business_id,
+            branch_id=branch_id,
+            leave_type_id=leave_type_id,
+            after_user_id=after_user_id,
+            size=size,
+        )
+        items: dict[int, LeaveBalanceGridItem] = {}
+        for row in rows:
+            item = items.get(row.user_id)
+            if item is None:
+                item = items[row.user_id] = LeaveBalanceGridItem(
+                    user_id=row.user_id,
+                    user_name=row.user_name,
+                    branch_id=row.branch_id,
+                    balances=[],
+                )
+            materialized = row.balance_id is not None
+            item.balances.append(
+                LeaveBalanceCell(
+                    leave_type_id=row.leave_type_id,
+                    leave_type_name=row.leave_type_name,
+                    allocated_days=row.allocated_days if materialized else row.total_leave_days,
+                    used_days=row.used_days if materialized else 0,
+                    remaining_days=row.remaining_days if materialized else row.total_leave_days,
+                    leave_year=row.leave_year,
+                    materialized=materialized,
+                )
+            )
+        grid = list(items.values())
+        return LeaveBalanceGridResponse(
+            items=grid,
+            size=size,
+            next_cursor=encode_cursor({"user_id": grid[-1].user_id}) if has_more else None,
+        )
+
+    def materialize(self, actor: User, payload: LeaveBalanceMaterializeRequest) -> LeaveBalanceMaterializeResponse:
+        scoped_business_id = self._resolve_business_scope(actor, payload.business_id)
+        leave_year = datetime.now(timezone.utc).year
+        try:
+            created = self.balance_repository.materialize_missing(
+                business_id=scoped_business_id,
+                branch_id=payload.branch_id,
+                leave_year=leave_year,
+            )
+        except IntegrityError:
+            # A leave request initialized one of them meanwhile; the retry skips it.
+            self.db.rollback()
+            created = self.balance_repository.materialize_missing(
+                business_id=scoped_business_id,
+                branch_id=payload.branch_id,
+                leave_year=leave_year,
+            )
+        self.db.commit()
+        return LeaveBalanceMaterializeResponse(created=created)
+
+    @staticmethod
+    def _resolve_business_scope(actor: User, business_id: int | None) -> int | None:
+        if actor.role == RoleEnum.MASTER_ADMIN:
+            return business_id
+        if actor.business_id is None:
+            raise ForbiddenException("User is not assigned to a business")
+        if business_id is not None and business_id != actor.business_id:
+            raise ForbiddenException("Cannot view leave balances of another business")
+        return actor.business_id
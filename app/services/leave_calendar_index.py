@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import heapq
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+
+@dataclass(frozen=True)
+class LeaveInterval:
+    leave_request_id: int
+    user_id: int
+    start_date: date
+    end_date: date
+
+
+@dataclass(frozen=True)
+class LeaveSegment:
+    """Maximal run of days on which exactly the same requests are active."""
+
+    start_date: date
+    end_date: date
+    active: tuple[LeaveInterval, ...]
+
+
+def sweep_leave_segments(intervals: Iterable[LeaveInterval], start_date: date, end_date: date) -> list[LeaveSegment]:
+    """Sweep ``start_date``..``end_date`` once, jumping between interval boundaries.
+
+    Intervals are sorted by start and the active ones kept in a heap keyed by end, so the cost is
+    O(n log n) in the number of requests plus the number of segments, independent of the range.
+    """
+    pending = sorted(
+        (interval for interval in intervals if interval.start_date <= end_date and interval.end_date >= start_date),
+        key=lambda interval: (interval.start_date, interval.leave_request_id),
+    )
+    segments: list[LeaveSegment] = []
+    ending: list[tuple[date, int, LeaveInterval]] = []
+    active: dict[int, LeaveInterval] = {}
+    next_index = 0
+    day = start_date
+    while day <= end_date:
+        while next_index < len(pending) and pending[next_index].start_date <= day:
+            interval = pending[next_index]
+            active[interval.leave_request_id] = interval
+            heapq.heappush(ending, (interval.end_date, interval.leave_request_id, interval))
+            next_index += 1
+        while ending and ending[0][0] < day:
+            _, leave_request_id, _ = heapq.heappop(ending)
+            active.pop(leave_request_id, None)
+
+        # The set only changes the day after an active request ends or when the next one starts.
+        boundary = end_date
+        if ending:
+            boundary = min(boundary, ending[0][0])
+        if next_index < len(pending):
+            boundary = min(boundary, pending[next_index].start_date - timedelta(days=1))
+        if active:
+            segments.append(
+                LeaveSegment(
+                    start_date=day,
+                    end_date=boundary,
+                    active=tuple(sorted(active.values(), key=lambda interval: interval.leave_request_id)),
+                )
+            )
+        day = boundary + timedelta(days=1)
+    return segments
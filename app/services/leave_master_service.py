@@ -48,6 +48,7 @@ class LeaveMasterService:
                 leave_type_id=item.leave_type_id,
                 total_leave_days=item.total_leave_days,
                 proof_required=resolved_leave_types[item.leave_type_id].proof_required,
+                carry_forward_max_days=item.carry_forward_max_days or 0,
             )
             created_ids.append(leave_master.id)
 
@@ -89,6 +90,7 @@ class LeaveMasterService:
         updated = self.leave_master_repository.update_total_days(
             leave_master,
             total_leave_days=payload.total_leave_days,
+            carry_forward_max_days=payload.carry_forward_max_days,
         )
         self.db.commit()
         self.db.refresh(updated)
@@ -134,6 +136,7 @@ class LeaveMasterService:
                 existing_mappings[item.leave_type_id],
                 total_leave_days=item.total_leave_days,
                 proof_required=resolved_leave_types[item.leave_type_id].proof_required,
+                carry_forward_max_days=item.carry_forward_max_days,
             )
 
         self.db.commit()
@@ -205,6 +208,7 @@ class LeaveMasterService:
             leave_type_name=item.leave_type.name,
             proof_required=item.proof_required,
             total_leave_days=item.total_leave_days,
+            carry_forward_max_days=item.carry_forward_max_days,
             created_at=item.created_at,
             updated_at=item.updated_at,
         )
@@ -232,6 +236,7 @@ class LeaveMasterService:
                     leave_type_name=item.leave_type.name,
                     proof_required=item.proof_required,
                     total_leave_days=item.total_leave_days,
+                    carry_forward_max_days=item.carry_forward_max_days,
                 )
             )
         return list(grouped.values())
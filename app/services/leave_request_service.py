@@ -1,18 +1,47 @@
-from datetime import datetime, timezone
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
 
 from sqlalchemy.orm import Session
 
-from app.core.exceptions import BadRequestException, ConflictException, ForbiddenException, NotFoundException
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.exceptions import AppException, BadRequestException, ConflictException, ForbiddenException, NotFoundException
+from app.core.role_permissions import role_has_permission
+from app.models.leave_ledger_entry import LeaveLedgerEntryType
 from app.models.leave_request import LeaveRequest, LeaveRequestStatus
 from app.models.role import RoleEnum
 from app.models.user import User
 from app.repository.employee_leave_balance_repository import EmployeeLeaveBalanceRepository
+from app.repository.leave_ledger_repository import LeaveLedgerRepository
 from app.repository.leave_master_repository import LeaveMasterRepository
 from app.repository.leave_request_repository import LeaveRequestRepository
 from app.repository.leave_type_repository import LeaveTypeRepository
-from app.repository.role_permission_repository import RolePermissionRepository
 from app.repository.user_repository import UserRepository
-from app.schemas.leave_request import LeaveRequestApplyRequest, LeaveRequestRejectRequest, LeaveRequestResponse
+from app.schemas.leave_request import (
+    LeaveRequestApplyRequest,
+    LeaveRequestBulkDecisionRequest,
+    LeaveRequestBulkDecisionResponse,
+    LeaveRequestDecisionOutcome,
+    LeaveRequestRejectRequest,
+    LeaveRequestResponse,
+    TeamLeaveAbsentee,
+    TeamLeaveCalendarDay,
+    TeamLeaveCalendarResponse,
+    TeamLeaveConflict,
+)
+from app.services.leave_calendar_index import LeaveInterval, sweep_leave_segments
+from app.services.weekend_policy_service import WeekendPolicyService
+
+
+TEAM_LEAVE_CALENDAR_CACHE: TTLCache[tuple, TeamLeaveCalendarResponse] = TTLCache(
+    max_entries=settings.team_leave_calendar_cache_max_entries,
+    ttl_seconds=settings.team_leave_calendar_cache_ttl_seconds,
+)
+
+
+def invalidate_team_leave_calendars() -> None:
+    """Drop this process's cached team calendars, e.g. after a user moves to another team."""
+    TEAM_LEAVE_CALENDAR_CACHE.clear()
 
 
 class LeaveRequestService:
@@ -22,8 +51,8 @@ class LeaveRequestService:
         self.leave_master_repository = LeaveMasterRepository(db)
         self.leave_request_repository = LeaveRequestRepository(db)
         self.balance_repository = EmployeeLeaveBalanceRepository(db)
+        self.ledger_repository = LeaveLedgerRepository(db)
         self.user_repository = UserRepository(db)
-        self.role_permission_repository = RolePermissionRepository(db)
 
     def apply_leave(self, current_user: User, payload: LeaveRequestApplyRequest) -> LeaveRequestResponse:
         leave_type = self.leave_type_repository.get_by_id(payload.leave_type_id)
@@ -32,7 +61,12 @@ class LeaveRequestService:
         if payload.end_date < payload.start_date:
             raise BadRequestException("end_date must be greater than or equal to start_date")
 
-        total_days = (payload.end_date - payload.start_date).days + 1
+        # Weekend days of the employee's branch are not charged against the balance.
+        total_days = WeekendPolicyService(self.db).working_days(
+            branch_id=current_user.branch_id,
+            start_date=payload.start_date,
+            end_date=payload.end_date,
+        )
         if total_days <= 0:
             raise BadRequestException("total leave days must be greater than zero")
 
@@ -61,6 +95,7 @@ class LeaveRequestService:
             proof_file_path=payload.proof_file_path.strip() if payload.proof_file_path else None,
         )
         self.db.commit()
+        self._invalidate_team_calendars(payload.start_date, payload.end_date)
         loaded = self.leave_request_repository.get_by_id(item.id)
         if loaded is None:
             raise NotFoundException("Leave request not found")
@@ -85,6 +120,92 @@ class LeaveRequestService:
         )
         return [self._to_response(item) for item in items]
 
+    def team_calendar(
+        self,
+        current_user: User,
+        *,
+        start_date: date,
+        end_date: date,
+        min_overlap: int = 2,
+    ) -> TeamLeaveCalendarResponse:
+        """Who is away on each day of the range, and the runs of days where several are away at once.
+
+        The team's pending and approved requests are loaded with one query and swept once, so the
+        cost follows the number of requests rather than days times requests.
+        """
+        if end_date < start_date:
+            raise BadRequestException("end_date must be greater than or equal to start_date")
+        if (end_date - start_date).days >= settings.team_leave_calendar_max_days:
+            raise BadRequestException(f"Date range cannot exceed {settings.team_leave_calendar_max_days} days")
+        include_admin_scope = self._can_admin_override(current_user)
+        scope = ("business", current_user.business_id) if include_admin_scope else ("manager", current_user.id)
+        cache_key = (*scope, start_date, end_date, min_overlap)
+        cached = TEAM_LEAVE_CALENDAR_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+        rows = self.leave_request_repository.list_team_intervals(
+            manager_id=current_user.id,
+            manager_business_id=current_user.business_id,
+            include_admin_scope=include_admin_scope,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        absentees = {
+            row.id: TeamLeaveAbsentee(
+                leave_request_id=row.id,
+                user_id=row.user_id,
+                user_name=row.user_name,
+                leave_type_id=row.leave_type_id,
+                leave_type_name=row.leave_type_name,
+                status=row.status,
+            )
+            for row in rows
+        }
+        intervals = [
+            LeaveInterval(
+                leave_request_id=row.id,
+                user_id=row.user_id,
+                start_date=row.start_date,
+                end_date=row.end_date,
+            )
+            for row in rows
+        ]
+
+        days: list[TeamLeaveCalendarDay] = []
+        conflicts: list[TeamLeaveConflict] = []
+        day = start_date
+        for segment in sweep_leave_segments(intervals, start_date, end_date):
+            # Segments are ordered and disjoint; the days between them have nobody away.
+            while day < segment.start_date:
+                days.append(TeamLeaveCalendarDay(date=day, absentees=[]))
+                day += timedelta(days=1)
+            day_absentees = [absentees[interval.leave_request_id] for interval in segment.active]
+            while day <= segment.end_date:
+                days.append(TeamLeaveCalendarDay(date=day, absentees=day_absentees))
+                day += timedelta(days=1)
+            user_ids = sorted({interval.user_id for interval in segment.active})
+            if len(user_ids) >= min_overlap:
+                conflicts.append(
+                    TeamLeaveConflict(
+                        start_date=segment.start_date,
+                        end_date=segment.end_date,
+                        user_ids=user_ids,
+                        leave_request_ids=[interval.leave_request_id for interval in segment.active],
+                    )
+                )
+        while day <= end_date:
+            days.append(TeamLeaveCalendarDay(date=day, absentees=[]))
+            day += timedelta(days=1)
+        response = TeamLeaveCalendarResponse(
+            start_date=start_date,
+            end_date=end_date,
+            days=days,
+            conflicts=conflicts,
+        )
+        TEAM_LEAVE_CALENDAR_CACHE.set(cache_key, response)
+        return response
+
     def approve_request(self, current_user: User, leave_request_id: int) -> LeaveRequestResponse:
         item = self.leave_request_repository.get_by_id(leave_request_id)
         if item is None:
@@ -99,20 +220,34 @@ class LeaveRequestService:
         if not self._can_approve(current_user=current_user, employee=item.user):
             raise ForbiddenException("Only direct reporting manager or admin can approve this leave")
 
-        balance = self._get_or_initialize_balance(user=item.user, leave_type_id=item.leave_type_id)
-        if balance.remaining_days < item.total_days:
+        self._get_or_initialize_balance(user=item.user, leave_type_id=item.leave_type_id)
+        # Both writes are conditional, so concurrent approvals can neither decide a request twice
+        # nor overdraw the balance; the row counts decide instead of values read earlier.
+        if not self.leave_request_repository.decide(
+            item.id,
+            status=LeaveRequestStatus.APPROVED,
+            decided_by=current_user.id,
+            decided_at=datetime.now(timezone.utc),
+        ):
+            self.db.rollback()
+            raise ConflictException("Leave request has already been decided")
+        if not self.balance_repository.deduct(
+            user_id=item.user_id,
+            leave_type_id=item.leave_type_id,
+            days=item.total_days,
+        ):
+            self.db.rollback()
             raise BadRequestException("Insufficient leave balance")
-
-        balance.used_days += item.total_days
-        balance.remaining_days -= item.total_days
-        self.balance_repository.update(balance)
-
-        item.status = LeaveRequestStatus.APPROVED
-        item.approved_by = current_user.id
-        item.approved_at = datetime.now(timezone.utc)
-        item.rejection_reason = None
-        self.leave_request_repository.update(item)
+        self.ledger_repository.append(
+            user_id=item.user_id,
+            leave_type_id=item.leave_type_id,
+            entry_type=LeaveLedgerEntryType.DEBIT,
+            days=-item.total_days,
+            leave_request_id=item.id,
+            created_by=current_user.id,
+        )
         self.db.commit()
+        self._invalidate_team_calendars(item.start_date, item.end_date)
 
         loaded = self.leave_request_repository.get_by_id(item.id)
         if loaded is None:
@@ -137,18 +272,147 @@ class LeaveRequestService:
         if not self._can_approve(current_user=current_user, employee=item.user):
             raise ForbiddenException("Only direct reporting manager or admin can reject this leave")
 
-        item.status = LeaveRequestStatus.REJECTED
-        item.approved_by = current_user.id
-        item.approved_at = datetime.now(timezone.utc)
-        item.rejection_reason = payload.rejection_reason.strip()
-        self.leave_request_repository.update(item)
+        if not self.leave_request_repository.decide(
+            item.id,
+            status=LeaveRequestStatus.REJECTED,
+            decided_by=current_user.id,
+            decided_at=datetime.now(timezone.utc),
+            rejection_reason=payload.rejection_reason.strip(),
+        ):
+            self.db.rollback()
+            raise ConflictException("Leave request has already been decided")
         self.db.commit()
+        self._invalidate_team_calendars(item.start_date, item.end_date)
 
         loaded = self.leave_request_repository.get_by_id(item.id)
         if loaded is None:
             raise NotFoundException("Leave request not found")
         return self._to_response(loaded)
 
+    def bulk_decide(
+        self,
+        current_user: User,
+        payload: LeaveRequestBulkDecisionRequest,
+    ) -> LeaveRequestBulkDecisionResponse:
+        """Approve or reject many requests in one transaction and report an outcome per request.
+
+        Requests are locked and validated in one pass, approvals deduct balances with one
+        conditional UPDATE per (user, leave type), and everything is committed once.
+        """
+        rejection_reason = (payload.rejection_reason or "").strip()
+        if payload.action == "REJECT" and not rejection_reason:
+            raise BadRequestException("rejection_reason is required when rejecting")
+        requested_ids = list(dict.fromkeys(payload.leave_request_ids))
+        items = {item.id: item for item in self.leave_request_repository.lock_for_decision(requested_ids)}
+        statuses = {leave_request_id: item.status for leave_request_id, item in items.items()}
+        admin_override = self._can_admin_override(current_user)
+        failures: dict[int, str] = {}
+        eligible: list[LeaveRequest] = []
+        for leave_request_id in requested_ids:
+            item = items.get(leave_request_id)
+            if item is None or item.user is None:
+                failures[leave_request_id] = "Leave request not found"
+            elif item.status != LeaveRequestStatus.PENDING:
+                failures[leave_request_id] = "Only pending leave requests can be decided"
+            elif item.user_id == current_user.id:
+                failures[leave_request_id] = "You cannot decide your own leave request"
+            elif not admin_override and item.user.reporting_manager_id != current_user.id:
+                failures[leave_request_id] = "Only direct reporting manager or admin can decide this leave"
+            else:
+                eligible.append(item)
+
+        decided_at = datetime.now(timezone.utc)
+        if payload.action == "APPROVE":
+            decided = self._approve_batch(current_user, eligible, failures)
+            target_status = LeaveRequestStatus.APPROVED
+        else:
+            decided = [item.id for item in eligible]
+            target_status = LeaveRequestStatus.REJECTED
+
+        if self.leave_request_repository.decide_many(
+            decided,
+            status=target_status,
+            decided_by=current_user.id,
+            decided_at=decided_at,
+            rejection_reason=rejection_reason if target_status == LeaveRequestStatus.REJECTED else None,
+        ) != len(decided):
+            self.db.rollback()
+            raise ConflictException("Some leave requests were decided concurrently, please retry")
+        decided_ranges = [
+            (items[leave_request_id].start_date, items[leave_request_id].end_date) for leave_request_id in decided
+        ]
+        self.db.commit()
+        for start_date, end_date in decided_ranges:
+            self._invalidate_team_calendars(start_date, end_date)
+
+        decided_ids = set(decided)
+        results = [
+            LeaveRequestDecisionOutcome(leave_request_id=leave_request_id, succeeded=True, status=target_status)
+            if leave_request_id in decided_ids
+            else LeaveRequestDecisionOutcome(
+                leave_request_id=leave_request_id,
+                succeeded=False,
+                status=statuses.get(leave_request_id),
+                detail=failures.get(leave_request_id),
+            )
+            for leave_request_id in requested_ids
+        ]
+        return LeaveRequestBulkDecisionResponse(
+            succeeded_count=len(decided_ids),
+            failed_count=len(requested_ids) - len(decided_ids),
+            results=results,
+        )
+
+    def _approve_batch(
+        self,
+        current_user: User,
+        items: list[LeaveRequest],
+        failures: dict[int, str],
+    ) -> list[int]:
+        groups: dict[tuple[int, int], list[LeaveRequest]] = defaultdict(list)
+        for item in items:
+            groups[(item.user_id, item.leave_type_id)].append(item)
+        balances = self.balance_repository.list_for_pairs(set(groups))
+
+        approved: list[LeaveRequest] = []
+        # A stable (user, leave type) order keeps concurrent batches from deadlocking on balance rows.
+        for key in sorted(groups):
+            group = groups[key]
+            if key not in balances:
+                try:
+                    self._get_or_initialize_balance(user=group[0].user, leave_type_id=key[1])
+                except AppException as exc:
+                    failures.update((item.id, exc.detail) for item in group)
+                    continue
+            if self.balance_repository.deduct(
+                user_id=key[0],
+                leave_type_id=key[1],
+                days=sum(item.total_days for item in group),
+            ):
+                approved.extend(group)
+                continue
+            # Not enough for the whole group: approve the oldest requests that still fit.
+            for item in sorted(group, key=lambda item: (item.applied_at, item.id)):
+                if self.balance_repository.deduct(user_id=key[0], leave_type_id=key[1], days=item.total_days):
+                    approved.append(item)
+                else:
+                    failures[item.id] = "Insufficient leave balance"
+
+        self.ledger_repository.append_many(
+            [
+                {
+                    "user_id": item.user_id,
+                    "leave_type_id": item.leave_type_id,
+                    "entry_type": LeaveLedgerEntryType.DEBIT,
+                    "days": -item.total_days,
+                    "leave_request_id": item.id,
+                    "created_by": current_user.id,
+                }
+                for item in approved
+            ]
+        )
+        return [item.id for item in approved]
+
     def _get_or_initialize_balance(self, *, user: User, leave_type_id: int):
         balance = self.balance_repository.get_by_user_and_leave_type(user_id=user.id, leave_type_id=leave_type_id)
         if balance is not None:
@@ -162,23 +426,32 @@ class LeaveRequestService:
         )
         if leave_master is None:
             raise NotFoundException("Leave policy not configured for this user employment type")
-        return self.balance_repository.create(
+        balance, created = self.balance_repository.create_if_missing(
             user_id=user.id,
             leave_type_id=leave_type_id,
             allocated_days=leave_master.total_leave_days,
-            used_days=0,
-            remaining_days=leave_master.total_leave_days,
+            leave_year=datetime.now(timezone.utc).year,
+        )
+        if created:
+            self.ledger_repository.append(
+                user_id=user.id,
+                leave_type_id=leave_type_id,
+                entry_type=LeaveLedgerEntryType.OPENING,
+                days=leave_master.total_leave_days,
+                note="Allocated from leave master",
+            )
+        return balance
+
+    @staticmethod
+    def _invalidate_team_calendars(start_date: date, end_date: date) -> None:
+        TEAM_LEAVE_CALENDAR_CACHE.discard_where(
+            lambda cached: cached.start_date <= end_date and cached.end_date >= start_date
         )
 
     def _can_admin_override(self, current_user: User) -> bool:
         if current_user.role in {RoleEnum.MASTER_ADMIN, RoleEnum.BUSINESS_OWNER, RoleEnum.BUSINESS_ADMIN}:
             return True
-        if current_user.role_id is None:
-            return False
-        return self.role_permission_repository.has_permission_for_role(
-            role_id=current_user.role_id,
-            permission_name="APPROVE_ANY_LEAVE",
-        )
+        return role_has_permission(self.db, current_user.role_id, "APPROVE_ANY_LEAVE")
 
     def _can_approve(self, *, current_user: User, employee: User) -> bool:
         if self._can_admin_override(current_user):
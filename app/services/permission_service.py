@@ -3,6 +3,7 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 
 from app.core.exceptions import ConflictException, NotFoundException
+from app.core.role_permissions import invalidate_role_permissions
 from app.models.permission import Permission
 from app.models.user import User
 from app.repository.permission_repository import PermissionRepository
@@ -89,12 +90,15 @@ class PermissionService:
         if existing is not None and existing.id != permission.id:
             raise ConflictException("Permission already exists in this group")
 
+        renamed = permission.permission_name != normalized_name
         permission.permission_name = normalized_name
         permission.group = normalized_group
         permission.description = payload.description.strip()
 
         updated = self.permission_repository.update(permission)
         self.db.commit()
+        if renamed:
+            invalidate_role_permissions()
         self.db.refresh(updated)
         return updated
 
@@ -106,3 +110,4 @@ class PermissionService:
 
         self.permission_repository.delete(permission)
         self.db.commit()
+        invalidate_role_permissions()
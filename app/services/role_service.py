@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
 
 from app.core.exceptions import ConflictException, NotFoundException
+from app.core.principal import invalidate_principals_for_role
+from app.core.role_permissions import invalidate_role_permissions
 from app.models.permission import Permission
 from app.models.role_entity import RoleEntity
 from app.models.user import User
@@ -68,6 +70,8 @@ class RoleService:
             raise NotFoundException("Role not found")
         self.role_repository.delete(role)
         self.db.commit()
+        invalidate_principals_for_role(role_id)
+        invalidate_role_permissions()
 
     def assign_permissions(
         self,
@@ -89,6 +93,7 @@ class RoleService:
         except Exception:
             self.db.rollback()
             raise
+        invalidate_role_permissions()
 
         mapped_permissions = self._to_permission_items(permissions)
         total = len(mapped_permissions)
@@ -159,6 +164,7 @@ class RoleService:
             raise NotFoundException("Permission is not assigned to this role")
 
         self.db.commit()
+        invalidate_role_permissions()
 
     def list_roles_with_permission_count(
         self,
@@ -15,7 +15,10 @@ from app.core.exceptions import (
     ForbiddenException,
     NotFoundException,
 )
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.principal import invalidate_principal
 from app.core.security import hash_password
+from app.models.leave_master import LeaveMaster
 from app.models.role import RoleEnum
 from app.models.user import User
 from app.models.user_bank_account import UserBankAccount
@@ -45,9 +48,15 @@ from app.schemas.user import (
     UserResponse,
     UserUpdateRequest,
 )
+from app.services.branch_face_index import BRANCH_FACE_INDEX
+from app.services.face_verification_service import FaceVerificationService
+from app.services.leave_request_service import invalidate_team_leave_calendars
 from app.services.file_service import FileService
 
 
+USER_LIST_SECTIONS = frozenset({"bank_account", "educations", "previous_companies", "documents", "leave_policies"})
+
+
 @dataclass
 class UserFilePayload:
     profile_image: UploadFile | None = None
@@ -84,7 +93,8 @@ class UserService:
 
     def list_users(self, current_user: User) -> list[UserResponse]:
         users = self.user_repository.list_for_actor(current_user)
-        return [self._build_user_response(item) for item in users]
+        leave_policies = self._leave_policies_by_employment_type(users)
+        return [self._build_user_response(item, leave_policies=leave_policies) for item in users]
 
     def get_user_hierarchy(self, current_user: User) -> list[UserHierarchyNodeResponse]:
         scoped_users = self.user_repository.list_hierarchy_scope_for_actor(current_user)
@@ -131,7 +141,25 @@ class UserService:
         first_name: str | None = None,
         mobile_number: str | None = None,
         branch_id: int | None = None,
+        cursor: str | None = None,
+        include: str | None = None,
+        include_total: bool = False,
     ) -> UserListResponse:
+        # Page mode keeps returning every section unless include narrows it; cursor mode is
+        # projection-only by default.
+        sections = self._parse_include(include)
+        if cursor is not None:
+            return self._list_users_after_cursor(
+                current_user,
+                size=size,
+                first_name=first_name,
+                mobile_number=mobile_number,
+                branch_id=branch_id,
+                cursor=cursor,
+                sections=sections if sections is not None else frozenset(),
+                include_total=include_total,
+            )
+
         items, total = self.user_repository.list_paginated_for_actor(
             current_user,
             page=page,
@@ -139,16 +167,77 @@ class UserService:
             first_name=first_name,
             mobile_number=mobile_number,
             branch_id=branch_id,
+            sections=sections,
         )
         total_pages = (total + size - 1) // size if total > 0 else 0
+        has_more = bool(items) and page * size < total
         return UserListResponse(
-            items=[self._build_user_response(item) for item in items],
+            items=self._build_user_list_items(items, sections),
             page=page,
             size=size,
             total=total,
             total_pages=total_pages,
+            next_cursor=encode_cursor({"id": items[-1].id}) if has_more else None,
         )
 
+    def _list_users_after_cursor(
+        self,
+        current_user: User,
+        *,
+        size: int,
+        first_name: str | None,
+        mobile_number: str | None,
+        branch_id: int | None,
+        cursor: str,
+        sections: frozenset[str],
+        include_total: bool,
+    ) -> UserListResponse:
+        after_id = self._decode_user_cursor(cursor) if cursor else None
+        items, has_more, total = self.user_repository.list_keyset_for_actor(
+            current_user,
+            after_id=after_id,
+            size=size,
+            first_name=first_name,
+            mobile_number=mobile_number,
+            branch_id=branch_id,
+            sections=sections,
+            with_total=include_total,
+        )
+        return UserListResponse(
+            items=self._build_user_list_items(items, sections),
+            page=None,
+            size=size,
+            total=total,
+            total_pages=None if total is None else (total + size - 1) // size,
+            next_cursor=encode_cursor({"id": items[-1].id}) if has_more else None,
+        )
+
+    def _build_user_list_items(self, users: list[User], sections: frozenset[str] | None) -> list[UserResponse]:
+        if sections is None:
+            sections = USER_LIST_SECTIONS
+        leave_policies = self._leave_policies_by_employment_type(users) if "leave_policies" in sections else {}
+        return [
+            self._build_user_response(item, sections=sections, leave_policies=leave_policies)
+            for item in users
+        ]
+
+    @staticmethod
+    def _parse_include(include: str | None) -> frozenset[str] | None:
+        if include is None:
+            return None
+        sections = frozenset(item.strip().lower() for item in include.split(",") if item.strip())
+        unknown = sorted(sections - USER_LIST_SECTIONS)
+        if unknown:
+            raise BadRequestException(f"Unknown include sections: {', '.join(unknown)}")
+        return sections
+
+    @staticmethod
+    def _decode_user_cursor(cursor: str) -> int:
+        values = decode_cursor(cursor, keys=("id",))
+        if not isinstance(values["id"], int):
+            raise BadRequestException("Invalid cursor")
+        return values["id"]
+
     def create_user(self, actor: User, payload: UserCreateRequest, files: UserFilePayload) -> UserResponse:
         target_business_id = self._resolve_actor_business_id(actor)
         self._ensure_business_exists(target_business_id)
@@ -266,6 +355,9 @@ class UserService:
             require_distinct_file_indexes=True,
         )
 
+        previous_branch_id = user.branch_id
+        previous_status = user.status
+        previous_team = (user.reporting_manager_id, user.business_id, user.name)
         created_file_paths: list[str] = []
         deleted_file_paths: list[str] = []
         try:
@@ -317,10 +409,15 @@ class UserService:
             )
 
             self.db.commit()
+            invalidate_principal(user_id)
             self.file_service.delete_many(deleted_file_paths)
             fresh_user = self.user_repository.get_by_id(user.id)
             if fresh_user is None:
                 raise NotFoundException("User not found after update")
+            if fresh_user.branch_id != previous_branch_id or fresh_user.status != previous_status:
+                self._sync_face_index(fresh_user, previous_branch_id=previous_branch_id)
+            if (fresh_user.reporting_manager_id, fresh_user.business_id, fresh_user.name) != previous_team:
+                invalidate_team_leave_calendars()
             return self._build_user_response(fresh_user)
         except Exception:
             self.db.rollback()
@@ -336,8 +433,12 @@ class UserService:
             raise ForbiddenException("Master admin user cannot be deleted")
 
         file_paths = [item.file_path for item in user.documents]
+        deleted_user_id, deleted_branch_id = user.id, user.branch_id
         self.user_repository.delete(user)
         self.db.commit()
+        invalidate_principal(deleted_user_id)
+        BRANCH_FACE_INDEX.discard_user(deleted_branch_id, deleted_user_id)
+        invalidate_team_leave_calendars()
         self.file_service.delete_many(file_paths)
 
     def get_document_preview(
@@ -782,7 +883,38 @@ class UserService:
         if existing_mobile is not None and existing_mobile.id != current_user.id:
             raise ConflictException("Mobile already exists")
 
-    def _build_user_response(self, user: User) -> UserResponse:
+    def _sync_face_index(self, user: User, *, previous_branch_id: int | None) -> None:
+        encoding = None
+        is_active = bool(user.status and user.status.strip().upper() == "ACTIVE")
+        stored = user.face_embedding or user.face_encoding
+        if is_active and stored:
+            try:
+                encoding = FaceVerificationService.deserialize_encoding(stored)
+            except BadRequestException:
+                encoding = None
+        BRANCH_FACE_INDEX.move_user(
+            user.id,
+            from_branch_id=previous_branch_id,
+            to_branch_id=user.branch_id,
+            encoding=encoding,
+        )
+
+    def _build_user_response(
+        self,
+        user: User,
+        *,
+        sections: frozenset[str] | None = None,
+        leave_policies: dict[int, list[UserLeavePolicyResponse]] | None = None,
+    ) -> UserResponse:
+        if sections is None:
+            sections = USER_LIST_SECTIONS
+        if "leave_policies" not in sections:
+            user_leave_policies: list[UserLeavePolicyResponse] = []
+        elif leave_policies is not None:
+            user_leave_policies = leave_policies.get(user.employment_type_id, []) if user.employment_type_id else []
+        else:
+            user_leave_policies = self._build_leave_policies_response(user.employment_type_id)
+
         return UserResponse(
             id=user.id,
             username=user.username,
@@ -810,36 +942,56 @@ class UserService:
             number=user.number,
             father_name=user.father_name,
             mother_name=user.mother_name,
-            bank_account=self._build_bank_account_response(user.bank_account),
-            educations=[self._build_education_response(item) for item in user.educations],
-            previous_companies=[self._build_company_response(item) for item in user.previous_companies],
-            documents=[
-                self._build_document_response(item)
-                for item in user.documents
-                if item.education_id is None and item.company_id is None
-            ],
-            leave_policies=self._build_leave_policies_response(user.employment_type_id),
+            bank_account=(
+                self._build_bank_account_response(user.bank_account) if "bank_account" in sections else None
+            ),
+            educations=(
+                [self._build_education_response(item) for item in user.educations]
+                if "educations" in sections
+                else []
+            ),
+            previous_companies=(
+                [self._build_company_response(item) for item in user.previous_companies]
+                if "previous_companies" in sections
+                else []
+            ),
+            documents=(
+                [
+                    self._build_document_response(item)
+                    for item in user.documents
+                    if item.education_id is None and item.company_id is None
+                ]
+                if "documents" in sections
+                else []
+            ),
+            leave_policies=user_leave_policies,
             created_at=user.created_at,
         )
 
+    def _leave_policies_by_employment_type(self, users: list[User]) -> dict[int, list[UserLeavePolicyResponse]]:
+        employment_type_ids = {item.employment_type_id for item in users if item.employment_type_id is not None}
+        grouped: dict[int, list[UserLeavePolicyResponse]] = {item: [] for item in employment_type_ids}
+        for item in self.leave_master_repository.list_by_employment_type_ids(employment_type_ids):
+            if item.leave_type is None:
+                continue
+            grouped[item.employment_type_id].append(self._to_leave_policy_response(item))
+        return grouped
+
     def _build_leave_policies_response(self, employment_type_id: int | None) -> list[UserLeavePolicyResponse]:
         if employment_type_id is None:
             return []
         leave_masters = self.leave_master_repository.list_by_employment_type_id(employment_type_id)
-        responses: list[UserLeavePolicyResponse] = []
-        for item in leave_masters:
-            if item.leave_type is None:
-                continue
-            responses.append(
-                UserLeavePolicyResponse(
-                    leave_master_id=item.id,
-                    leave_type_id=item.leave_type_id,
-                    leave_type_name=item.leave_type.name,
-                    proof_required=item.proof_required,
-                    total_leave_days=item.total_leave_days,
-                )
-            )
-        return responses
+        return [self._to_leave_policy_response(item) for item in leave_masters if item.leave_type is not None]
+
+    @staticmethod
+    def _to_leave_policy_response(item: LeaveMaster) -> UserLeavePolicyResponse:
+        return UserLeavePolicyResponse(
+            leave_master_id=item.id,
+            leave_type_id=item.leave_type_id,
+            leave_type_name=item.leave_type.name,
+            proof_required=item.proof_required,
+            total_leave_days=item.total_leave_days,
+        )
 
     def _build_education_response(self, education: UserEducation) -> UserEducationResponse:
         return UserEducationResponse(
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable, Collection, Iterable
+from datetime import date, timedelta
+from threading import Lock
+from time import monotonic
+
+from app.core.config import settings
+from app.models.weekend_policy import WeekendPolicy, WeekendSession
+
+
+class WeekendCalendar:
+    """Weekend resolution for one branch, compiled to one slot per day over its sessions' span.
+
+    ``session_ids`` and ``policy_ids`` hold the session and policy that govern each day (0 when
+    none) and ``weekend`` flags the days a policy rule marks as weekend, so a lookup is an index
+    and a range query is a slice. ``working_prefix[i]`` counts the working days before slot ``i``,
+    so the working days of any range come from two lookups.
+    """
+
+    __slots__ = ("base_ordinal", "session_ids", "policy_ids", "weekend", "working_prefix")
+
+    def __init__(
+        self,
+        base_ordinal: int,
+        session_ids: array,
+        policy_ids: array,
+        weekend: bytearray,
+        working_prefix: array,
+    ) -> None:
+        self.base_ordinal = base_ordinal
+        self.session_ids = session_ids
+        self.policy_ids = policy_ids
+        self.weekend = weekend
+        self.working_prefix = working_prefix
+
+    def resolve(self, target_date: date) -> tuple[bool, int | None, int | None]:
+        index = target_date.toordinal() - self.base_ordinal
+        if index < 0 or index >= len(self.weekend):
+            return False, None, None
+        return bool(self.weekend[index]), self.session_ids[index] or None, self.policy_ids[index] or None
+
+    def is_non_working(self, target_date: date) -> bool:
+        index = target_date.toordinal() - self.base_ordinal
+        if 0 <= index < len(self.weekend) and self.policy_ids[index]:
+            return bool(self.weekend[index])
+        # Days without a configured weekend policy keep the Saturday/Sunday default.
+        return target_date.weekday() >= 5
+
+    def weekend_dates(self, start_date: date, end_date: date) -> list[date]:
+        first = max(start_date.toordinal() - self.base_ordinal, 0)
+        last = min(end_date.toordinal() - self.base_ordinal, len(self.weekend) - 1)
+        if first > last:
+            return []
+        window = self.weekend[first : last + 1]
+        base = self.base_ordinal + first
+        return [date.fromordinal(base + offset) for offset, flag in enumerate(window) if flag]
+
+    def working_days(self, start_date: date, end_date: date) -> int:
+        """Number of days in ``start_date``..``end_date`` for which ``is_non_working`` is false, in O(1)."""
+        first = start_date.toordinal()
+        last = end_date.toordinal()
+        if first > last:
+            return 0
+        span_first = self.base_ordinal
+        span_last = self.base_ordinal + len(self.weekend) - 1
+        if last < span_first or first > span_last:
+            return _default_working_days(first, last)
+        count = 0
+        if first < span_first:
+            count += _default_working_days(first, span_first - 1)
+            first = span_first
+        if last > span_last:
+            count += _default_working_days(span_last + 1, last)
+            last = span_last
+        prefix = self.working_prefix
+        return count + prefix[last - self.base_ordinal + 1] - prefix[first - self.base_ordinal]
+
+    def segments(self, start_date: date, end_date: date) -> list[tuple[date, date, int | None, int | None]]:
+        """Maximal runs of days governed by the same session and policy, as (start, end, session, policy)."""
+        result: list[tuple[date, date, int | None, int | None]] = []
+        run_start = start_date
+        run_key = self._governing(start_date)
+        day = start_date + timedelta(days=1)
+        while day <= end_date:
+            key = self._governing(day)
+            if key != run_key:
+                result.append((run_start, day - timedelta(days=1), *run_key))
+                run_start, run_key = day, key
+            day += timedelta(days=1)
+        result.append((run_start, end_date, *run_key))
+        return result
+
+    def _governing(self, target_date: date) -> tuple[int | None, int | None]:
+        index = target_date.toordinal() - self.base_ordinal
+        if index < 0 or index >= len(self.weekend):
+            return None, None
+        return self.session_ids[index] or None, self.policy_ids[index] or None
+
+    def non_working_dates(self, start_date: date, end_date: date) -> list[date]:
+        result: list[date] = []
+        day = start_date
+        while day <= end_date:
+            if self.is_non_working(day):
+                result.append(day)
+            day += timedelta(days=1)
+        return result
+
+
+EMPTY_CALENDAR = WeekendCalendar(0, array("l"), array("l"), bytearray(), array("l", [0]))
+
+
+def _default_working_days(first_ordinal: int, last_ordinal: int) -> int:
+    """Monday-to-Friday days between two ordinals, inclusive; ordinal 1 is a Monday."""
+
+    def through(ordinal: int) -> int:
+        return (ordinal // 7) * 5 + min(ordinal % 7, 5)
+
+    return through(last_ordinal) - through(first_ordinal - 1)
+
+
+def compile_weekend_calendar(
+    branch_id: int | None,
+    sessions: Iterable[WeekendSession],
+    policies: Iterable[WeekendPolicy],
+) -> WeekendCalendar:
+    """Apply the same precedence as the per-date queries: branch-specific before global, then the
+    latest start (session) or effective date (policy), then the highest id.
+
+    ``sessions`` and ``policies`` may include rows of other branches; they are ignored here.
+    """
+    sessions = [session for session in sessions if session.branch_id is None or session.branch_id == branch_id]
+    policies = [policy for policy in policies if policy.branch_id is None or policy.branch_id == branch_id]
+    if not sessions:
+        return EMPTY_CALENDAR
+    base = min(session.start_date for session in sessions).toordinal()
+    size = max(session.end_date for session in sessions).toordinal() - base + 1
+    session_ids = array("l", [0]) * size
+    policy_ids = array("l", [0]) * size
+    weekend = bytearray(size)
+
+    # Fill lowest precedence first so higher-precedence sessions overwrite overlapping days.
+    for session in sorted(sessions, key=lambda item: _precedence(item.branch_id, branch_id, item.start_date, item.id)):
+        start = session.start_date.toordinal() - base
+        end = session.end_date.toordinal() - base
+        session_ids[start : end + 1] = array("l", [session.id]) * (end - start + 1)
+
+    session_ranges = {
+        session.id: (session.start_date.toordinal() - base, session.end_date.toordinal() - base)
+        for session in sessions
+    }
+    rule_sets: dict[int, tuple[frozenset[tuple[int, int]], frozenset[int]]] = {}
+    for policy in sorted(policies, key=lambda item: _precedence(item.branch_id, branch_id, item.effective_from, item.id)):
+        session_range = session_ranges.get(policy.session_id)
+        if session_range is None:
+            continue
+        start = max(policy.effective_from.toordinal() - base, session_range[0])
+        end = session_range[1] if policy.effective_to is None else min(
+            policy.effective_to.toordinal() - base, session_range[1]
+        )
+        for index in range(start, end + 1):
+            if session_ids[index] == policy.session_id:
+                policy_ids[index] = policy.id
+        rule_sets[policy.id] = (
+            frozenset((rule.day_of_week, rule.week_number) for rule in policy.rules if rule.week_number is not None),
+            frozenset(rule.day_of_week for rule in policy.rules if rule.week_number is None),
+        )
+
+    for index in range(size):
+        policy_id = policy_ids[index]
+        if not policy_id:
+            continue
+        day = date.fromordinal(base + index)
+        day_of_week = (day.weekday() + 1) % 7
+        week_index = ((day.day - 1) // 7) + 1
+        weekly, every_week = rule_sets[policy_id]
+        if day_of_week in every_week or (day_of_week, week_index) in weekly:
+            weekend[index] = 1
+
+    working_prefix = array("l", [0]) * (size + 1)
+    for index in range(size):
+        if policy_ids[index]:
+            working = not weekend[index]
+        else:
+            working = date.fromordinal(base + index).weekday() < 5
+        working_prefix[index + 1] = working_prefix[index] + working
+    return WeekendCalendar(base, session_ids, policy_ids, weekend, working_prefix)
+
+
+def _precedence(item_branch_id: int | None, branch_id: int | None, start: date, item_id: int) -> tuple[int, int, int]:
+    return (1 if branch_id is not None and item_branch_id == branch_id else 0, start.toordinal(), item_id)
+
+
+class WeekendCalendarCache:
+    """Per-process compiled calendars keyed by branch id (``None`` for the global calendar).
+
+    Any session or policy write bumps ``version`` and drops every calendar, since a global
+    session or policy can change all branches. The TTL bounds staleness from other workers.
+    """
+
+    def __init__(self, *, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = Lock()
+        self._version = 0
+        self._entries: dict[int | None, tuple[int, float, WeekendCalendar]] = {}
+
+    def get(self, branch_id: int | None, loader: Callable[[], WeekendCalendar]) -> WeekendCalendar:
+        version = self._version
+        entry = self._entries.get(branch_id)
+        if entry is not None and entry[0] == version and monotonic() < entry[1]:
+            return entry[2]
+
+        calendar = loader()
+        if self.ttl_seconds > 0:
+            with self._lock:
+                if self._version == version:
+                    self._entries[branch_id] = (version, monotonic() + self.ttl_seconds, calendar)
+        return calendar
+
+    def get_many(
+        self,
+        branch_ids: Collection[int | None],
+        loader: Callable[[list[int | None]], dict[int | None, WeekendCalendar]],
+    ) -> dict[int | None, WeekendCalendar]:
+        """Like ``get`` for several branches; every missing calendar comes from one ``loader`` call."""
+        version = self._version
+        now = monotonic()
+        calendars: dict[int | None, WeekendCalendar] = {}
+        missing: list[int | None] = []
+        for branch_id in branch_ids:
+            entry = self._entries.get(branch_id)
+            if entry is not None and entry[0] == version and now < entry[1]:
+                calendars[branch_id] = entry[2]
+            else:
+                missing.append(branch_id)
+        if not missing:
+            return calendars
+
+        loaded = loader(missing)
+        calendars.update(loaded)
+        if self.ttl_seconds > 0:
+            with self._lock:
+                if self._version == version:
+                    expires_at = monotonic() + self.ttl_seconds
+                    for branch_id, calendar in loaded.items():
+                        self._entries[branch_id] = (version, expires_at, calendar)
+        return calendars
+
+    def bump(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+
+WEEKEND_CALENDARS = WeekendCalendarCache(ttl_seconds=settings.weekend_calendar_ttl_seconds)
+
+
+def invalidate_weekend_calendars() -> None:
+    WEEKEND_CALENDARS.bump()
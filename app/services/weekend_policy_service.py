@@ -11,13 +11,27 @@ from app.schemas.weekend_policy import (
     SessionCreateRequest,
     SessionResponse,
     SessionUpdateRequest,
+    WeekendCalendarBatchRequest,
+    WeekendCalendarBatchResponse,
+    WeekendCalendarBranchResponse,
+    WeekendCalendarSegment,
     WeekendCheckResponse,
+    WeekendDatesResponse,
     WeekendPolicyCreateRequest,
     WeekendPolicyResponse,
     WeekendPolicyRuleRequest,
     WeekendPolicyRuleResponse,
     WeekendPolicyUpdateRequest,
 )
+from app.services.weekend_calendar import (
+    WEEKEND_CALENDARS,
+    WeekendCalendar,
+    compile_weekend_calendar,
+    invalidate_weekend_calendars,
+)
+
+
+MAX_WEEKEND_RANGE_DAYS = 3660
 
 
 class WeekendPolicyService:
@@ -63,6 +77,7 @@ class WeekendPolicyService:
         self.weekend_policy_repository.create_policy(policy)
         self.weekend_policy_repository.replace_rules(policy.id, normalized_rules)
         self.db.commit()
+        invalidate_weekend_calendars()
         loaded = self.weekend_policy_repository.get_policy_by_id(policy.id)
         if loaded is None:
             raise NotFoundException("Weekend policy not found")
@@ -83,6 +98,7 @@ class WeekendPolicyService:
         )
         self.weekend_policy_repository.create_session(session)
         self.db.commit()
+        invalidate_weekend_calendars()
         return self._to_session_response(session)
 
     def list_sessions(self, actor: User, *, branch_id: int | None = None) -> list[SessionResponse]:
@@ -116,6 +132,7 @@ class WeekendPolicyService:
             policy.effective_to = next_end_date
 
         self.db.commit()
+        invalidate_weekend_calendars()
         return self._to_session_response(session)
 
     def list_policies(self, actor: User, *, branch_id: int | None = None) -> list[WeekendPolicyResponse]:
@@ -183,6 +200,7 @@ class WeekendPolicyService:
             self.weekend_policy_repository.replace_rules(policy.id, normalized_rules)
 
         self.db.commit()
+        invalidate_weekend_calendars()
         loaded = self.weekend_policy_repository.get_policy_by_id(policy.id)
         if loaded is None:
             raise NotFoundException("Weekend policy not found")
@@ -202,12 +220,13 @@ class WeekendPolicyService:
         if policy.effective_to is None or policy.effective_to > closing_date:
             policy.effective_to = closing_date
         self.db.commit()
+        invalidate_weekend_calendars()
 
     def delete_session(self, actor: User, session_id: int) -> None:
         _ = actor
         session = self._ensure_session_exists(session_id)
         policies = self.weekend_policy_repository.list_policies_by_session(session.id)
-        if any(self.weekend_policy_repository.is_policy_used(policy.id) for policy in policies):
+        if self.weekend_policy_repository.is_any_policy_used([policy.id for policy in policies]):
             raise ConflictException("Cannot delete session because one or more weekend policies are already used")
 
         session.is_active = False
@@ -220,34 +239,103 @@ class WeekendPolicyService:
                 policy.effective_to = closing_date
 
         self.db.commit()
+        invalidate_weekend_calendars()
 
     def is_weekend(self, actor: User, *, branch_id: int | None, target_date: date) -> WeekendCheckResponse:
         _ = actor
         if branch_id is not None:
             self._ensure_branch_exists(branch_id)
+        return self.resolve_weekend(branch_id=branch_id, target_date=target_date)
 
-        session = self.weekend_policy_repository.get_active_session_for_date(
+    def weekend_dates(
+        self,
+        actor: User,
+        *,
+        branch_id: int | None,
+        start_date: date,
+        end_date: date,
+    ) -> WeekendDatesResponse:
+        _ = actor
+        self._validate_calendar_range(start_date, end_date)
+        if branch_id is not None:
+            self._ensure_branch_exists(branch_id)
+        return WeekendDatesResponse(
             branch_id=branch_id,
-            target_date=target_date,
+            start_date=start_date,
+            end_date=end_date,
+            dates=self.calendar(branch_id).weekend_dates(start_date, end_date),
         )
-        if session is None:
-            return WeekendCheckResponse(is_weekend=False, session_id=None, policy_id=None)
 
-        policy = self.weekend_policy_repository.get_active_policy_for_date(
-            session_id=session.id,
-            branch_id=branch_id,
-            target_date=target_date,
+    def calendar_batch(self, actor: User, payload: WeekendCalendarBatchRequest) -> WeekendCalendarBatchResponse:
+        """Non-working dates, working-day count and governing session/policy runs for several branches.
+
+        Days without a policy fall back to the Saturday/Sunday default, as in attendance close-out,
+        so ``non_working_dates`` are exactly the days excluded from ``working_day_count``.
+        """
+        _ = actor
+        self._validate_calendar_range(payload.start_date, payload.end_date)
+        branch_ids = list(dict.fromkeys(payload.branch_ids))
+        specific_ids = [branch_id for branch_id in branch_ids if branch_id is not None]
+        missing = set(specific_ids) - self.branch_repository.existing_ids(specific_ids)
+        if missing:
+            raise NotFoundException(f"Branch not found: {', '.join(str(branch_id) for branch_id in sorted(missing))}")
+
+        calendars = self.calendars(branch_ids)
+        branches = []
+        for branch_id in branch_ids:
+            calendar = calendars[branch_id]
+            non_working = calendar.non_working_dates(payload.start_date, payload.end_date)
+            branches.append(
+                WeekendCalendarBranchResponse(
+                    branch_id=branch_id,
+                    non_working_dates=non_working,
+                    working_day_count=calendar.working_days(payload.start_date, payload.end_date),
+                    segments=[
+                        WeekendCalendarSegment(
+                            start_date=segment_start,
+                            end_date=segment_end,
+                            session_id=session_id,
+                            policy_id=policy_id,
+                        )
+                        for segment_start, segment_end, session_id, policy_id in calendar.segments(
+                            payload.start_date, payload.end_date
+                        )
+                    ],
+                )
+            )
+        return WeekendCalendarBatchResponse(
+            start_date=payload.start_date,
+            end_date=payload.end_date,
+            branches=branches,
         )
-        if policy is None:
-            return WeekendCheckResponse(is_weekend=False, session_id=session.id, policy_id=None)
 
-        day_of_week = self._day_of_week(target_date)
-        week_index = self._week_index(target_date)
-        is_match = any(
-            rule.day_of_week == day_of_week and (rule.week_number is None or rule.week_number == week_index)
-            for rule in policy.rules
+    def is_non_working_day(self, *, branch_id: int | None, target_date: date) -> bool:
+        return self.calendar(branch_id).is_non_working(target_date)
+
+    def resolve_weekend(self, *, branch_id: int | None, target_date: date) -> WeekendCheckResponse:
+        is_weekend, session_id, policy_id = self.calendar(branch_id).resolve(target_date)
+        return WeekendCheckResponse(is_weekend=is_weekend, session_id=session_id, policy_id=policy_id)
+
+    def working_days(self, *, branch_id: int | None, start_date: date, end_date: date) -> int:
+        return self.calendar(branch_id).working_days(start_date, end_date)
+
+    def calendar(self, branch_id: int | None) -> WeekendCalendar:
+        return WEEKEND_CALENDARS.get(
+            branch_id,
+            lambda: compile_weekend_calendar(
+                branch_id,
+                *self.weekend_policy_repository.list_calendar_sources([branch_id]),
+            ),
         )
-        return WeekendCheckResponse(is_weekend=is_match, session_id=session.id, policy_id=policy.id)
+
+    def calendars(self, branch_ids: list[int | None]) -> dict[int | None, WeekendCalendar]:
+        """Calendars for ``branch_ids``; the uncached ones are compiled from a single load of sources."""
+
+        def load(missing: list[int | None]) -> dict[int | None, WeekendCalendar]:
+            sessions, policies = self.weekend_policy_repository.list_calendar_sources(missing)
+            return {branch_id: compile_weekend_calendar(branch_id, sessions, policies) for branch_id in missing}
+
+        return WEEKEND_CALENDARS.get_many(branch_ids, load)
 
     def _ensure_session_exists(self, session_id: int):
         session = self.weekend_policy_repository.get_session_by_id(session_id)
@@ -261,6 +349,13 @@ class WeekendPolicyService:
         if self.branch_repository.get_by_id(branch_id) is None:
             raise NotFoundException("Branch not found")
 
+    @staticmethod
+    def _validate_calendar_range(start_date: date, end_date: date) -> None:
+        if end_date < start_date:
+            raise BadRequestException("end_date cannot be before start_date")
+        if (end_date - start_date).days > MAX_WEEKEND_RANGE_DAYS:
+            raise BadRequestException(f"Date range cannot exceed {MAX_WEEKEND_RANGE_DAYS} days")
+
     @staticmethod
     def _validate_branch_matches_session(*, session_branch_id: int | None, branch_id: int | None) -> None:
         if session_branch_id is None and branch_id is not None:
@@ -319,14 +414,6 @@ class WeekendPolicyService:
             raise BadRequestException(f"{field_name} cannot be empty")
         return normalized
 
-    @staticmethod
-    def _day_of_week(target_date: date) -> int:
-        return (target_date.weekday() + 1) % 7
-
-    @staticmethod
-    def _week_index(target_date: date) -> int:
-        return ((target_date.day - 1) // 7) + 1
-
     @staticmethod
     def _to_response(policy: WeekendPolicy) -> WeekendPolicyResponse:
         if policy.session is None:
@@ -1,18 +1,113 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.controllers.auth_controller import router as auth_router
 from app.controllers.attendance_controller import router as attendance_router
+from app.controllers.leave_balance_controller import router as leave_balance_router
 from app.controllers.leave_request_controller import router as leave_request_router
 from app.controllers.master_controller import router as master_router
 from app.controllers.owner_controller import router as owner_router
 from app.controllers.user_controller import router as user_router
 from app.core.config import settings
+from app.core.database import SessionLocal, engine
 from app.core.exceptions import register_exception_handlers
+from app.core.schema_capabilities import SCHEMA_CAPABILITIES
+from app.services.auth_service import AuthService
+from app.services.export_job_pool import EXPORT_JOB_POOL
+from app.services.export_job_service import ExportJobService
+from app.services.face_worker_pool import FACE_WORKER_POOL
+
+
+logger = logging.getLogger(__name__)
+
+
+def _purge_revoked_tokens() -> int:
+    db = SessionLocal()
+    try:
+        return AuthService(db).purge_expired_revoked_tokens()
+    finally:
+        db.close()
+
+
+def _purge_export_jobs() -> int:
+    db = SessionLocal()
+    try:
+        return ExportJobService(db).purge_expired()
+    finally:
+        db.close()
+
+
+def _fail_unstarted_export_jobs(job_ids: list[int]) -> None:
+    db = SessionLocal()
+    try:
+        failed = ExportJobService(db).fail_unstarted(job_ids)
+    finally:
+        db.close()
+    if failed:
+        logger.info("marked %d queued export jobs as failed on shutdown", failed)
+
+
+async def _purge_periodically(interval_seconds: int, purge: Callable[[], int], label: str) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            purged = await run_in_threadpool(purge)
+        except Exception:
+            logger.exception("%s purge failed", label)
+            continue
+        if purged:
+            logger.info("purged %d %s", purged, label)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    await run_in_threadpool(FACE_WORKER_POOL.start)
+    try:
+        await run_in_threadpool(SCHEMA_CAPABILITIES.refresh, engine)
+    except Exception:
+        # Usage checks reflect lazily on first use if the database is not reachable yet.
+        logger.exception("schema capability reflection failed")
+    purge_tasks: list[asyncio.Task[None]] = []
+    if settings.revoked_token_purge_interval_seconds > 0:
+        purge_tasks.append(
+            asyncio.create_task(
+                _purge_periodically(
+                    settings.revoked_token_purge_interval_seconds,
+                    _purge_revoked_tokens,
+                    "expired revoked tokens",
+                )
+            )
+        )
+    if settings.export_job_purge_interval_seconds > 0:
+        purge_tasks.append(
+            asyncio.create_task(
+                _purge_periodically(settings.export_job_purge_interval_seconds, _purge_export_jobs, "expired export jobs")
+            )
+        )
+    try:
+        yield
+    finally:
+        for purge_task in purge_tasks:
+            purge_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await purge_task
+        dropped_export_jobs = [int(args[0]) for args in EXPORT_JOB_POOL.shutdown()]
+        if dropped_export_jobs:
+            try:
+                await run_in_threadpool(_fail_unstarted_export_jobs, dropped_export_jobs)
+            except Exception:
+                logger.exception("could not mark dropped export jobs as failed")
+        await run_in_threadpool(FACE_WORKER_POOL.shutdown)
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title=settings.app_name)
+    app = FastAPI(title=settings.app_name, lifespan=lifespan)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_allowed_origins,
@@ -24,6 +119,7 @@ def create_app() -> FastAPI:
 
     app.include_router(auth_router)
     app.include_router(attendance_router)
+    app.include_router(leave_balance_router)
     app.include_router(leave_request_router)
     app.include_router(master_router)
     app.include_router(owner_router)